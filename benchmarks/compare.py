@@ -0,0 +1,77 @@
+"""Compare two results of `benchmarks.run`, typically of two checkouts:
+
+    python3 -m benchmarks.compare base.json head.json
+
+A case is a regression when its throughput drops, or its peak memory grows, by more than the threshold. The exit
+status is 1 if there is any regression.
+"""
+import argparse
+import json
+import sys
+
+from typing import Dict, List, Optional, Tuple
+
+
+def get_key(result: Dict) -> Tuple[str, str, str, str]:
+    """Return what identifies a case of results.
+    """
+    return result['benchmark'], result['engine'], result['case'], result['size']
+
+
+def compare(base: Dict, head: Dict, threshold: float = 0.1) -> List[Dict]:
+    """Compare cases found in both results.
+
+    Args:
+        base: the result to compare against
+        head: the new result
+        threshold: the relative change treated as a regression
+
+    Returns:
+        for each case, its key, the ratios of head to base of throughput and peak memory, and whether it regressed
+    """
+    base_results = {get_key(result): result for result in base['results']}
+    res = []
+    for result in head['results']:
+        key = get_key(result)
+        if key not in base_results:
+            continue
+
+        speed = result['cells_per_second'] / base_results[key]['cells_per_second']
+        memory = result['peak_memory_bytes'] / max(base_results[key]['peak_memory_bytes'], 1)
+        res.append({
+            'key': key,
+            'speed': speed,
+            'memory': memory,
+            'is_regression': speed < 1 - threshold or memory > 1 + threshold,
+        })
+
+    return res
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two results of benchmarks.")
+    parser.add_argument('base', help="The result to compare against")
+    parser.add_argument('head', help="The new result")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="The relative change treated as a regression (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    with open(args.base) as fp:
+        base = json.load(fp)
+    with open(args.head) as fp:
+        head = json.load(fp)
+
+    comparisons = compare(base, head, args.threshold)
+    print("{:<8} {:<12} {:<12} {:<12} {:>8} {:>8}".format('', 'engine', 'case', 'size', 'speed', 'memory'))
+    for comparison in comparisons:
+        print("{:<8} {:<12} {:<12} {:<12} {:>7.2f}x {:>7.2f}x{}".format(
+            *comparison['key'], comparison['speed'], comparison['memory'],
+            '  REGRESSION' if comparison['is_regression'] else ''))
+
+    num_of_regressions = sum(comparison['is_regression'] for comparison in comparisons)
+    print("{} regressions in {} cases".format(num_of_regressions, len(comparisons)))
+    return 1 if num_of_regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
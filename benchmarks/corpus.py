@@ -0,0 +1,65 @@
+import io
+
+from typing import List, Tuple
+
+from src.life import Life
+from src.patterns import read_rle
+
+
+# board sizes as (width, height)
+SIZES = {
+    'small': (80, 40),
+    'medium': (400, 200),
+    'large': (2000, 1000),
+    'huge': (10000, 10000),
+}
+
+PATTERNS = {
+    'r-pentomino': "x = 3, y = 3\nb2o$2o$bo!\n",
+    'acorn': "x = 7, y = 3\nbo$3bo$2o2b3o!\n",
+    'gosper-gun': (
+        "x = 36, y = 9\n"
+        "24bo$22bobo$12b2o6b2o12b2o$11bo3bo4b2o12b2o$2o8bo5bo3b2o$2o8bo3bob2o4b\n"
+        "obo$10bo5bo7bo$11bo3bo$12b2o!\n"
+    ),
+}
+
+SOUP_DENSITIES = {'soup-0.1': 0.1, 'soup-0.25': 0.25, 'soup-0.4': 0.4}
+SOUP_SEED = 20200101
+
+CASES = sorted(PATTERNS) + sorted(SOUP_DENSITIES)
+
+
+def get_alive_indices(case: str, width: int, height: int) -> List[int]:
+    """Return flat indices of the initial alive cells of a case of the corpus.
+
+    Patterns are placed at the center of the board, and soups are seeded so that every run gets the same board.
+
+    Args:
+        case: a name in `CASES`
+        width: a width of the board
+        height: a height of the board
+
+    Returns:
+        flat indices (`row * width + column`) of alive cells
+    """
+    if case in SOUP_DENSITIES:
+        return Life.get_random_alive_indices(width, height, density=SOUP_DENSITIES[case], seed=SOUP_SEED)
+
+    pattern_height, pattern_width, alive_indices, _ = read_rle(io.StringIO(PATTERNS[case]))
+    top = (height - pattern_height) // 2
+    left = (width - pattern_width) // 2
+    return [(top + index // pattern_width) * width + left + index % pattern_width for index in alive_indices]
+
+
+def parse_size(size: str) -> Tuple[int, int]:
+    """Return the width and the height of a name in `SIZES` or of `WIDTHxHEIGHT`.
+    """
+    if size in SIZES:
+        return SIZES[size]
+
+    try:
+        width, height = (int(value) for value in size.lower().split('x'))
+    except ValueError:
+        raise ValueError("A size should be one of {} or WIDTHxHEIGHT ({})".format(sorted(SIZES), size))
+    return width, height
@@ -0,0 +1,74 @@
+"""Compare stepping many boards in an ensemble of `src.ensemble` with stepping one game per board.
+
+Run from the root of the repository:
+
+    python3 -m benchmarks.ensemble --boards 1000 --size small --generations 100 --output ensemble.json
+
+Both step the same random soups. Games are stepped by looping over `Life.proceed_generation` for every board, for
+`--life-generations` generations as it is much slower, and throughputs are reported in board-generations per second.
+"""
+import argparse
+import json
+import sys
+import time
+
+from typing import List, Optional
+
+from benchmarks.corpus import parse_size
+from benchmarks.run import get_environment
+from src.ensemble import Ensemble
+from src.life import Life
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare an ensemble with looping over games.")
+    parser.add_argument('--boards', type=int, default=1000, help="Number of boards (default: 1000)")
+    parser.add_argument('--size', default='small', help="Size of boards, a name of corpus sizes or WIDTHxHEIGHT")
+    parser.add_argument('--density', type=float, default=0.25, help="Density of the random soups (default: 0.25)")
+    parser.add_argument('--generations', type=int, default=100, help="Generations of the ensemble (default: 100)")
+    parser.add_argument('--life-generations', type=int, default=5,
+                        help="Generations of every game (default: 5)")
+    parser.add_argument('--engine', default=Life.DEFAULT_ENGINE, help="The engine of games")
+    parser.add_argument('--max-period', type=int, default=Ensemble.DEFAULT_MAX_PERIOD,
+                        help="Boards repeating with this period or less are retired (default: 2)")
+    parser.add_argument('--output', help="A file to write results to as JSON (default: stdout)")
+    args = parser.parse_args(argv)
+
+    width, height = parse_size(args.size)
+    ensemble = Ensemble.random(args.boards, width, height, density=args.density, seed=0, max_period=args.max_period)
+    games = [Life.from_array(ensemble.get_board(i), engine=args.engine) for i in range(args.boards)]
+
+    started_at = time.perf_counter()
+    ensemble.proceed_generations(args.generations)
+    ensemble_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _ in range(args.life_generations):
+        for game in games:
+            game.proceed_generation()
+    life_seconds = time.perf_counter() - started_at
+
+    ensemble_throughput = args.boards * args.generations / ensemble_seconds
+    life_throughput = args.boards * args.life_generations / life_seconds
+    report = {
+        'environment': get_environment(),
+        'arguments': vars(args),
+        'result': {
+            'ensemble_seconds': ensemble_seconds,
+            'ensemble_board_generations_per_second': ensemble_throughput,
+            'active_boards': ensemble.num_of_active_boards,
+            'life_seconds': life_seconds,
+            'life_board_generations_per_second': life_throughput,
+            'speedup': ensemble_throughput / life_throughput,
+        },
+    }
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""Benchmark engines, I/O and rendering against the corpus of `benchmarks.corpus`.
+
+Run from the root of the repository, and compare two results with `benchmarks.compare`:
+
+    python3 -m benchmarks.run --sizes small medium --output result.json
+
+Every result has the throughput in board cells per second (and in generations per second for `step`), and the peak
+memory allocated while a board is set up and processed once, as traced by `tracemalloc`.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.corpus import CASES, SIZES, SOUP_DENSITIES, SOUP_SEED, get_alive_indices, parse_size
+from src.engines import ENGINES, import_numpy
+from src.game_of_life import FileParser
+from src.life import Life
+from src.renderer import FullRenderer
+
+
+BENCHMARKS = ['step', 'parse', 'dump', 'random', 'render']
+
+
+def get_default_generations(width: int, height: int) -> int:
+    """Return the number of generations stepped on a board, fewer for larger boards.
+    """
+    return max(3, min(200, 8000000 // (width * height)))
+
+
+def measure_peak_memory(run: Callable[[], object]) -> int:
+    """Return the peak number of bytes allocated by `run`.
+    """
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def create_game(engine: str, width: int, height: int, alive_indices: List[int], detect_cycles: bool = True) -> Life:
+    """Create a game of any size, detecting cycles by default as the game of the command line does.
+
+    A board which repeats is then skipped over once its period is found, and `detect_cycles=False` computes every
+    generation instead.
+    """
+    game = Life(engine=engine)
+    game.MIN_GRID_WIDTH = 1
+    game.MIN_GRID_HEIGHT = 1
+    game.detect_cycles = detect_cycles
+    game.init_grid_from_indices(width, height, alive_indices)
+    return game
+
+
+def bench_step(engine: str, width: int, height: int, alive_indices: List[int], generations: int,
+               detect_cycles: bool = True) -> Dict:
+    """Measure `Life.proceed_generation`.
+    """
+    game = create_game(engine, width, height, alive_indices, detect_cycles)
+    try:
+        started_at = time.perf_counter()
+        for _ in range(generations):
+            game.proceed_generation()
+        seconds = time.perf_counter() - started_at
+    finally:
+        game.close()
+
+    def run_once():
+        cur_game = create_game(engine, width, height, alive_indices, detect_cycles)
+        cur_game.proceed_generation()
+        cur_game.close()
+
+    return {
+        'seconds': seconds,
+        'generations': generations,
+        'detect_cycles': detect_cycles,
+        'generations_per_second': generations / seconds,
+        'cells_per_second': width * height * generations / seconds,
+        'peak_memory_bytes': measure_peak_memory(run_once),
+    }
+
+
+def _repeat(run: Callable[[], object], min_seconds: float) -> float:
+    """Return seconds per call of `run`, which is called until `min_seconds` passes.
+    """
+    num_of_calls = 0
+    started_at = time.perf_counter()
+    while True:
+        run()
+        num_of_calls += 1
+        seconds = time.perf_counter() - started_at
+        if seconds >= min_seconds:
+            return seconds / num_of_calls
+
+
+def bench_call(run: Callable[[], object], width: int, height: int, min_seconds: float) -> Dict:
+    """Measure a call processing a whole board.
+    """
+    seconds = _repeat(run, min_seconds)
+    return {
+        'seconds': seconds,
+        'cells_per_second': width * height / seconds,
+        'peak_memory_bytes': measure_peak_memory(run),
+    }
+
+
+def run_case(benchmark: str, engine: str, case: str, size: str, generations: Optional[int],
+             min_seconds: float, directory: str, detect_cycles: bool = True) -> Dict:
+    """Run a benchmark on a case of the corpus.
+
+    Args:
+        benchmark: a name in `BENCHMARKS`
+        engine: the engine stepped by `step` (other benchmarks do not depend on the engine)
+        case: a name in `corpus.CASES` (only soups for `random`)
+        size: a name in `corpus.SIZES` or `WIDTHxHEIGHT`
+        generations: number of generations stepped by `step` (default: fewer for larger boards)
+        min_seconds: other benchmarks are repeated at least for this time
+        directory: a temporary directory for dumped files
+        detect_cycles: False to compute every generation stepped by `step` (see `Life.detect_cycles`)
+
+    Returns:
+        the result, with the keys of the case
+    """
+    width, height = parse_size(size)
+    alive_indices = get_alive_indices(case, width, height)
+    res = {'benchmark': benchmark, 'engine': engine, 'case': case, 'size': '{}x{}'.format(width, height),
+           'alive_cells': len(alive_indices)}
+
+    if benchmark == 'step':
+        res.update(bench_step(engine, width, height, alive_indices,
+                              generations or get_default_generations(width, height), detect_cycles))
+        return res
+
+    if benchmark == 'parse':
+        path = os.path.join(directory, 'board.txt')
+        FileParser(grid_width=width, grid_height=height, alive_indices=alive_indices).write_to_file(path)
+        with open(path) as fp:
+            content = fp.read()
+
+        def run():
+            FileParser().parse_from_stream(io.StringIO(content))
+
+    elif benchmark == 'dump':
+        parser = FileParser(grid_width=width, grid_height=height, alive_indices=alive_indices)
+
+        def run():
+            parser.write_to_file(os.path.join(directory, 'dump.txt'))
+
+    elif benchmark == 'random':
+        def run():
+            Life.get_random_init_states(width, height, density=SOUP_DENSITIES[case], seed=SOUP_SEED)
+
+    elif benchmark == 'render':
+        game = create_game(Life.DEFAULT_ENGINE, width, height, alive_indices)
+
+        def run():
+            FullRenderer(stream=io.StringIO()).render(game)
+
+    else:
+        raise ValueError("Unknown benchmark ({})".format(benchmark))
+
+    res.update(bench_call(run, width, height, min_seconds))
+    return res
+
+
+def get_environment() -> Dict:
+    """Return what the results depend on besides the code.
+    """
+    try:
+        numpy_version = import_numpy().__version__
+    except ImportError:
+        numpy_version = None
+
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'python': platform.python_version(),
+        'numpy': numpy_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'commit': commit,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    try:
+        import_numpy()
+        default_engines = [Life.DEFAULT_ENGINE, 'numpy', 'bitboard']
+    except ImportError:
+        default_engines = [Life.DEFAULT_ENGINE]
+
+    parser = argparse.ArgumentParser(description="Benchmark the game of life.")
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument('--engines', nargs='+', choices=[Life.DEFAULT_ENGINE] + sorted(ENGINES),
+                        default=default_engines, help="Engines stepped by the `step` benchmark")
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=CASES)
+    parser.add_argument('--sizes', nargs='+', default=['small', 'medium'],
+                        help="Sizes of boards, one of {} or WIDTHxHEIGHT".format(sorted(SIZES)))
+    parser.add_argument('--generations', type=int, help="Number of generations stepped by the `step` benchmark")
+    parser.add_argument('--min-seconds', type=float, default=0.2,
+                        help="Other benchmarks are repeated at least for this time")
+    parser.add_argument('--no-cycle-detection', action='store_true',
+                        help="Compute every generation stepped by `step`, instead of the default of the game")
+    parser.add_argument('--output', help="A file to write results to as JSON (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            for case in args.cases:
+                for benchmark in args.benchmarks:
+                    if benchmark == 'random' and case not in SOUP_DENSITIES:
+                        # only soups are random
+                        continue
+
+                    for engine in (args.engines if benchmark == 'step' else [Life.DEFAULT_ENGINE]):
+                        result = run_case(benchmark, engine, case, size, args.generations, args.min_seconds,
+                                          directory, detect_cycles=not args.no_cycle_detection)
+                        results.append(result)
+                        print("{benchmark} {engine} {case} {size}: {cells_per_second:.4g} cells/sec, "
+                              "{peak_memory_bytes} bytes".format(**result), file=sys.stderr)
+
+    report = {'environment': get_environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Load test the simulation server of `src.server` with many concurrent sessions.
+
+Run from the root of the repository. The server is started in another process, and sessions are spread over a
+number of client connections:
+
+    python3 -m benchmarks.server_load --sessions 1000 --clients 50 --output load.json
+
+Every session is created from a random soup, subscribed to (for `--subscribed` of them), and stepped `--steps` times
+while all other sessions are stepped too. The report has the throughput of steps and generations, latencies of
+requests, the number of delta events received, and the peak memory of the server.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Dict, List, Optional
+
+from benchmarks.corpus import parse_size
+from benchmarks.run import get_environment
+from src.life import Life
+from src.server import SimulationClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_board(width: int, height: int, density: float, seed: int) -> str:
+    """Return a random soup in the format of the input file.
+    """
+    alive_indices = Life.get_random_alive_indices(width, height, density=density, seed=seed)
+    lines = ["{} {}".format(height, width), str(len(alive_indices))]
+    lines.extend("{} {}".format(*divmod(index, width)) for index in alive_indices)
+    return '\n'.join(lines) + '\n'
+
+
+def get_percentiles(values: List[float]) -> Dict[str, float]:
+    """Return the median, the 95th and the 99th percentiles and the maximum of latencies, in milliseconds.
+    """
+    values = sorted(values)
+    if not values:
+        return {}
+
+    def get_percentile(percent: float) -> float:
+        return values[min(len(values) - 1, int(len(values) * percent / 100))] * 1000
+
+    return {'p50_ms': get_percentile(50), 'p95_ms': get_percentile(95), 'p99_ms': get_percentile(99),
+            'max_ms': values[-1] * 1000}
+
+
+def get_peak_rss(pid: int) -> Optional[int]:
+    """Return the peak resident memory of a process in bytes, None where `/proc` is not available.
+    """
+    try:
+        with open('/proc/{}/status'.format(pid)) as fp:
+            for line in fp:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+async def run_load(path: str, args) -> Dict:
+    """Create, subscribe to and step every session concurrently, and measure them.
+    """
+    width, height = parse_size(args.size)
+    clients = [await SimulationClient.connect(path) for _ in range(args.clients)]
+    num_of_subscribed = int(args.sessions * args.subscribed)
+
+    async def timed(latencies: List[float], client: SimulationClient, op: str, **kwargs) -> Dict:
+        started_at = time.perf_counter()
+        res = await client.request(op, **kwargs)
+        latencies.append(time.perf_counter() - started_at)
+        return res
+
+    boards = [get_board(width, height, args.density, seed) for seed in range(args.sessions)]
+    create_latencies = []    # type: List[float]
+    started_at = time.perf_counter()
+    responses = await asyncio.gather(*(
+        timed(create_latencies, clients[i % args.clients], 'create', board=board, engine=args.engine)
+        for i, board in enumerate(boards)))
+    create_seconds = time.perf_counter() - started_at
+    session_ids = [response['session'] for response in responses]
+
+    await asyncio.gather(*(clients[i % args.clients].request('subscribe', session=session_id)
+                           for i, session_id in enumerate(session_ids[:num_of_subscribed])))
+
+    step_latencies = []    # type: List[float]
+
+    async def run_session(i: int, session_id: int):
+        for _ in range(args.steps):
+            await timed(step_latencies, clients[i % args.clients], 'step', session=session_id,
+                        generations=args.generations)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(run_session(i, session_id) for i, session_id in enumerate(session_ids)))
+    step_seconds = time.perf_counter() - started_at
+
+    stats = await clients[0].request('stats')
+    num_of_events = sum(client.events.qsize() for client in clients)
+    for client in clients:
+        await client.close()
+
+    num_of_steps = len(step_latencies)
+    return {
+        'sessions': stats['sessions'],
+        'create_seconds': create_seconds,
+        'sessions_created_per_second': args.sessions / create_seconds,
+        'create_latency': get_percentiles(create_latencies),
+        'step_seconds': step_seconds,
+        'steps_per_second': num_of_steps / step_seconds,
+        'generations_per_second': num_of_steps * args.generations / step_seconds,
+        'step_latency': get_percentiles(step_latencies),
+        'delta_events': num_of_events,
+        'expected_delta_events': num_of_subscribed * args.steps,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test the simulation server.")
+    parser.add_argument('--sessions', type=int, default=1000, help="Number of concurrent sessions (default: 1000)")
+    parser.add_argument('--clients', type=int, default=50, help="Number of client connections (default: 50)")
+    parser.add_argument('--steps', type=int, default=20, help="Number of step requests per session (default: 20)")
+    parser.add_argument('--generations', type=int, default=1, help="Generations per step request (default: 1)")
+    parser.add_argument('--subscribed', type=float, default=1.0,
+                        help="The fraction of sessions subscribed to (default: 1.0)")
+    parser.add_argument('--size', default='small', help="Size of boards, a name of corpus sizes or WIDTHxHEIGHT")
+    parser.add_argument('--density', type=float, default=0.25, help="Density of the random soups (default: 0.25)")
+    parser.add_argument('--engine', default=Life.DEFAULT_ENGINE, help="The engine of sessions")
+    parser.add_argument('--workers', type=int, help="Threads stepping games in the server (default: number of CPUs)")
+    parser.add_argument('--output', help="A file to write results to as JSON (default: stdout)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'server.sock')
+        command = [sys.executable, os.path.join(ROOT, 'src', 'server.py'), '--socket', path,
+                   '--max-sessions', str(args.sessions)]
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+        server = subprocess.Popen(command, stdout=subprocess.PIPE, universal_newlines=True)
+        try:
+            # the server prints a line once it listens
+            server.stdout.readline()
+            loop = asyncio.new_event_loop()
+            try:
+                result = loop.run_until_complete(run_load(path, args))
+            finally:
+                loop.close()
+            result['server_peak_rss_bytes'] = get_peak_rss(server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+
+    report = {'environment': get_environment(), 'arguments': vars(args), 'result': result}
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+import logging
+import time
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .engines import Engine, get_engine_class
+    from .rules import Rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from engines import Engine, get_engine_class
+    from rules import Rule
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveEngine(Engine):
+    """An engine switching between a dense and a sparse engine as the population and the activity of the board change.
+
+    A dense engine (`bitboard`) takes the same time whatever the population is, and a sparse one takes time in
+    proportion to the population (`sparse`) or to the number of cells born and died (`incremental`), as weighted by
+    `SPARSE_WORK`. Steps are timed, and every `check_every` generations the population and the cells changed in the
+    last generation are counted to estimate what the other engine would take: the time per step of the dense engine,
+    and the time per unit of work of the sparse one, are learned while each of them runs (they start from defaults
+    measured on a single CPU). Changed cells are only counted when the sparse engine is weighted by them.
+
+    To avoid switching back and forth around the break-even point, the other engine should be estimated to be faster
+    by `switch_ratio`, and an engine switched to is kept for at least `min_generations` generations. Every switch is
+    logged with the time it took to move the board, and kept in `switches`. The dense engine needs numpy, which is
+    imported when it is first used; without numpy, the sparse engine is kept.
+
+    Attributes:
+        dense: name of the dense engine
+        sparse: name of the sparse engine
+        backend: the engine stepping the board
+        generation: the number of generations stepped by this engine
+        switches: a dict per switch with `generation`, `from`, `to`, `population`, `activity` (cells born and died in
+            the last generation, None if they are not counted) and `seconds`
+        stats: number of switches and of generations stepped by each engine
+    """
+    name = 'adaptive'
+    DENSE_SECONDS = 3e-5    # time per step of the dense engine ...
+    DENSE_SECONDS_PER_CELL = 5e-10    # ... plus this for every cell of the grid
+    SPARSE_SECONDS_PER_CELL = 3e-6    # time per step of the sparse engine for every unit of work
+    # units of work of a step of each sparse engine for every alive cell and for every cell born or died (engines not
+    # listed are weighted like `sparse`)
+    SPARSE_WORK = {'sparse': (1, 0), 'incremental': (0, 3)}
+    SMOOTHING = 0.25    # weight of the latest measurement in the learned times
+
+    dense = None
+    sparse = None
+    backend = None
+    generation = None
+    switches = None
+    check_every = None
+    min_generations = None
+    switch_ratio = None
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 alive_indices: Iterable[int],
+                 rule: Optional[Rule] = None,
+                 dense: str = 'bitboard',
+                 sparse: str = 'sparse',
+                 check_every: int = 8,
+                 min_generations: int = 32,
+                 switch_ratio: float = 0.5):
+        super().__init__(width, height, alive_indices, rule)
+        if check_every < 1 or min_generations < 0 or not 0 < switch_ratio <= 1:
+            raise ValueError("Invalid switching parameters (check_every: {}, min_generations: {}, "
+                             "switch_ratio: {})".format(check_every, min_generations, switch_ratio))
+
+        self.dense = dense
+        self.sparse = sparse
+        self.check_every = check_every
+        self.min_generations = min_generations
+        self.switch_ratio = switch_ratio
+        self.generation = 0
+        self.switches = []    # type: List[Dict]
+        self.stats = {'switches': 0, 'dense_generations': 0, 'sparse_generations': 0}
+
+        # learned seconds per step of the dense engine, and per unit of work of the sparse one
+        self._dense_seconds = self.DENSE_SECONDS + width * height * self.DENSE_SECONDS_PER_CELL
+        self._sparse_seconds_per_cell = self.SPARSE_SECONDS_PER_CELL
+        self._sparse_work = self.SPARSE_WORK.get(sparse, self.SPARSE_WORK['sparse'])
+        self._is_dense_available = True
+        self._switched_at = None    # the generation of the last switch
+        self._activity = None    # cells born and died in the last generation, None if they were not counted
+
+        alive_indices = list(alive_indices)
+        is_dense = self._get_sparse_seconds(len(alive_indices), None) > self._dense_seconds
+        self.backend = self._create_backend(dense if is_dense else sparse, alive_indices)
+        if self.backend is None:
+            self.backend = self._create_backend(sparse, alive_indices)
+        self._is_dense = self.backend.name == dense
+
+    def _create_backend(self, name: str, alive_indices: Iterable[int]) -> Optional[Engine]:
+        """Create an engine of the board, None if the dense engine cannot be imported.
+        """
+        try:
+            return get_engine_class(name)(self.width, self.height, alive_indices, rule=self.rule)
+        except ImportError:
+            if name != self.dense:
+                raise
+            logger.info("The dense engine {} is not available, the sparse engine is kept.".format(name))
+            self._is_dense_available = False
+            return None
+
+    def _get_sparse_work(self, population: int, activity: Optional[int]) -> Optional[int]:
+        """Return the units of work of a step of the sparse engine, None if it needs the activity which is unknown.
+        """
+        population_weight, activity_weight = self._sparse_work
+        if not activity_weight:
+            return population * population_weight
+        if activity is None:
+            return None
+        return population * population_weight + activity * activity_weight
+
+    def _get_sparse_seconds(self, population: int, activity: Optional[int]) -> float:
+        # the whole board is evaluated when the activity is not known yet, e.g. in the first generation
+        work = self._get_sparse_work(population, activity)
+        if work is None:
+            work = population * sum(self._sparse_work)
+        return work * self._sparse_seconds_per_cell
+
+    def _is_counting_activity(self) -> bool:
+        """Return True if the cells born and died in the next generation should be counted.
+
+        The sparse engine weighted by them counts them every generation to learn its time, and the dense engine only
+        before a check, since comparing its cells takes a part of a step.
+        """
+        if not self._sparse_work[1]:
+            return False
+        return not self._is_dense or (self.generation + 1) % self.check_every == 0
+
+    def step(self):
+        if self._is_counting_activity():
+            # the dense engine comparing its cells does not take the time of a usual step
+            self._step_backend(self.backend.step_with_changes, is_timed=not self._is_dense)
+        else:
+            self._step_backend(self.backend.step)
+
+    def step_with_changes(self) -> Tuple[List[int], List[int]]:
+        return self._step_backend(self.backend.step_with_changes)
+
+    def _step_backend(self, step: Callable, is_timed: bool = True):
+        """Step the board by `step` of the backend, learn the time it took, and switch the backend if it is due.
+
+        Args:
+            step: `step` or `step_with_changes` of the backend, whose cells born and died are counted
+            is_timed: False not to learn the time of the step
+
+        Returns:
+            what `step` returned
+        """
+        started_at = time.perf_counter()
+        res = step()
+        seconds = time.perf_counter() - started_at
+        self.generation += 1
+        self._activity = len(res[0]) + len(res[1]) if res is not None else None
+
+        if self._is_dense:
+            self.stats['dense_generations'] += 1
+            if is_timed:
+                self._dense_seconds += self.SMOOTHING * (seconds - self._dense_seconds)
+        else:
+            self.stats['sparse_generations'] += 1
+            work = self._get_sparse_work(self.backend.get_population(), self._activity)
+            if is_timed and work:
+                seconds_per_cell = seconds / work
+                self._sparse_seconds_per_cell += self.SMOOTHING * (seconds_per_cell - self._sparse_seconds_per_cell)
+
+        if self.generation % self.check_every == 0 and (
+                self._switched_at is None or self.generation - self._switched_at >= self.min_generations):
+            self._check_backend()
+
+        return res
+
+    def _check_backend(self):
+        """Switch to the other engine if it is estimated to be faster enough.
+        """
+        population = self.backend.get_population()
+        sparse_seconds = self._get_sparse_seconds(population, self._activity)
+        if self._is_dense:
+            if sparse_seconds < self._dense_seconds * self.switch_ratio:
+                self._switch(self.sparse, population)
+        elif self._is_dense_available and self._dense_seconds < sparse_seconds * self.switch_ratio:
+            self._switch(self.dense, population)
+
+    def _switch(self, name: str, population: int):
+        started_at = time.perf_counter()
+        backend = self._create_backend(name, self.backend.get_alive_indices())
+        if backend is None:
+            return
+
+        self.backend.close()
+        previous, self.backend = self.backend.name, backend
+        self._is_dense = name == self.dense
+        self._switched_at = self.generation
+        seconds = time.perf_counter() - started_at
+
+        self.switches.append({'generation': self.generation, 'from': previous, 'to': name,
+                              'population': population, 'activity': self._activity, 'seconds': seconds})
+        self.stats['switches'] += 1
+        logger.info("Switched from the {} engine to the {} engine at the generation {} (population: {}, activity: {}, "
+                    "{:.3f} ms)".format(previous, name, self.generation, population, self._activity, seconds * 1000))
+
+    def get_alive_indices(self) -> List[int]:
+        return self.backend.get_alive_indices()
+
+    def get_population(self) -> int:
+        return self.backend.get_population()
+
+    def get_fingerprint(self) -> Optional[int]:
+        return self.backend.get_fingerprint()
+
+    def get_grid(self):
+        return self.backend.get_grid()
+
+    def close(self):
+        self.backend.close()
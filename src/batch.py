@@ -0,0 +1,142 @@
+import glob
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .game_of_life import DUMP_EXTENSIONS, FILE_FOLDER, dump_game, load_game
+    from .life import Life
+    from .rules import Rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from game_of_life import DUMP_EXTENSIONS, FILE_FOLDER, dump_game, load_game
+    from life import Life
+    from rules import Rule
+
+
+def find_input_files(pattern: str) -> List[str]:
+    """Return input files of a directory or a glob pattern, looked up under `FILE_FOLDER` first.
+
+    Args:
+        pattern: a directory, whose files are all taken, or a glob pattern
+
+    Returns:
+        sorted paths of input files
+    """
+    for base in (os.path.join(FILE_FOLDER, pattern), pattern):
+        if os.path.isdir(base):
+            base = os.path.join(base, '*')
+
+        paths = sorted(path for path in glob.glob(base) if os.path.isfile(path))
+        if paths:
+            return paths
+
+    return []
+
+
+def run_board(task: Tuple[str, str, int, str, Optional[Dict], str, Optional[Rule], bool]) -> Dict:
+    """Proceed one board without showing it, and write its result.
+
+    This runs in worker processes, so an error is returned instead of stopping the other boards.
+
+    Args:
+        task: the input path, the output path, the number of generations, the engine, its options, the dump format,
+            the rule overriding the one of the input file, and whether cycles are detected
+
+    Returns:
+        the input path, the number of generations, the elapsed seconds, and the error message if it failed
+    """
+    input_path, output_path, num_of_generation, engine, engine_options, dump_format, rule, detect_cycles = task
+    started_at = time.perf_counter()
+    res = {'input': input_path, 'output': output_path, 'generations': 0, 'error': None}
+    game = None
+    try:
+        game = load_game(input_path, engine=engine, engine_options=engine_options, rule=rule)
+        game.detect_cycles = detect_cycles
+        game.proceed_generations(num_of_generation)
+        dump_game(game, output_path, dump_format)
+        res['generations'] = num_of_generation
+    except Exception as e:
+        res['error'] = str(e)
+    finally:
+        if game is not None:
+            game.close()
+
+    res['seconds'] = time.perf_counter() - started_at
+    return res
+
+
+def run_batch(input_paths: Iterable[str],
+              num_of_generation: int,
+              output_folder: str,
+              engine: str = Life.DEFAULT_ENGINE,
+              engine_options: Optional[Dict] = None,
+              dump_format: str = 'text',
+              jobs: Optional[int] = None,
+              rule: Optional[Rule] = None,
+              detect_cycles: bool = True) -> Dict:
+    """Proceed every board for `num_of_generation` in a process pool, and write one result for each of them.
+
+    Results are named after their input, with the extension of `dump_format`.
+
+    Args:
+        input_paths: paths of input files
+        num_of_generation: total number of generation to go for each board
+        output_folder: a directory to write results to, which is created if missing
+        engine: name of the engine stepping the boards
+        engine_options: keyword arguments given to the engine
+        dump_format: a key of `DUMP_EXTENSIONS`
+        jobs: number of worker processes (default: number of CPUs), boards are run in this process if 1
+        rule: the rule stepping every board, instead of the rule of each input file
+        detect_cycles: False to step every generation of boards which repeat (see `Life.detect_cycles`)
+
+    Returns:
+        results of boards (see `run_board`), the number of failures, the elapsed seconds and the throughput
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    tasks = []
+    output_paths = set()
+    for input_path in input_paths:
+        name = os.path.splitext(os.path.basename(input_path))[0] + DUMP_EXTENSIONS[dump_format]
+        output_path = os.path.join(output_folder, name)
+        if output_path in output_paths:
+            raise ValueError("Results of two input files have the same name ({})".format(name))
+        output_paths.add(output_path)
+        tasks.append((input_path, output_path, num_of_generation, engine, engine_options, dump_format, rule,
+                      detect_cycles))
+
+    started_at = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(tasks) <= 1:
+        results = [run_board(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # a chunk per task would spend more time on the round trips than on small boards
+            results = list(executor.map(run_board, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+    seconds = time.perf_counter() - started_at
+
+    num_of_boards = sum(1 for result in results if result['error'] is None)
+    return {
+        'results': results,
+        'boards': num_of_boards,
+        'failures': len(results) - num_of_boards,
+        'seconds': seconds,
+        'boards_per_second': num_of_boards / seconds if seconds else 0.0,
+        'generations_per_second': num_of_boards * num_of_generation / seconds if seconds else 0.0,
+    }
+
+
+def print_summary(summary: Dict):
+    """Print failed boards and the throughput of a batch.
+
+    Args:
+        summary: the return value of `run_batch`
+    """
+    for result in summary['results']:
+        if result['error'] is not None:
+            print("Failed: {} ({})".format(result['input'], result['error']))
+
+    print("Proceeded {} boards ({} failed) in {:.2f} seconds: {:.1f} boards/sec, {:.1f} generations/sec".format(
+        summary['boards'], summary['failures'], summary['seconds'], summary['boards_per_second'],
+        summary['generations_per_second']))
@@ -0,0 +1,222 @@
+import os
+import tempfile
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .engines import Engine, as_index_array, get_changed_indices, import_numpy
+    from .rules import Rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from engines import Engine, as_index_array, get_changed_indices, import_numpy
+    from rules import Rule
+
+
+MAGIC = b'GOLBLK1\0'
+TABLE_SIZE = 1 << 16
+CACHE_DIR_ENV = 'GAME_OF_LIFE_CACHE'    # overrides the directory where tables are cached
+
+_tables = {}    # type: Dict[Rule, bytes]
+
+
+def get_default_cache_dir() -> str:
+    """Return the directory where block tables are cached, `$GAME_OF_LIFE_CACHE` or `game_of_life` in the user cache.
+    """
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'game_of_life')
+
+
+def build_block_table(rule: Rule) -> bytes:
+    """Compute the next generation of the 2x2 center of every 4x4 block of cells.
+
+    A 4x4 block is a 16 bit key where the cell at (row, column) is bit `row * 4 + column`, and its entry is the center
+    of the block in the next generation, where the cell at (row + 1, column + 1) is bit `row * 2 + column`.
+
+    Args:
+        rule: the rule stepping the cells
+
+    Returns:
+        the table of 65536 entries
+    """
+    np = import_numpy()
+    keys = np.arange(TABLE_SIZE, dtype=np.int64)
+    neighborhood_table = np.frombuffer(rule.neighborhood_table, dtype=np.uint8)
+
+    table = np.zeros(TABLE_SIZE, dtype=np.uint8)
+    for center_row in range(2):
+        for center_column in range(2):
+            # the 3x3 neighborhood of the center cell, where the cell at (row, column) is bit `row * 3 + column`
+            neighborhoods = np.zeros(TABLE_SIZE, dtype=np.int64)
+            for row in range(3):
+                for column in range(3):
+                    bit = (keys >> ((center_row + row) * 4 + center_column + column)) & 1
+                    neighborhoods |= bit << (row * 3 + column)
+            table |= neighborhood_table[neighborhoods] << (center_row * 2 + center_column)
+
+    return table.tobytes()
+
+
+def get_block_table(rule: Rule, cache_dir: Optional[str] = None) -> bytes:
+    """Return the block table of `rule`, built once and cached on disk (see `build_block_table`).
+
+    Tables are kept in memory after they are first loaded. A cached table which cannot be read is built again, and a
+    table which cannot be cached (e.g. in a read-only directory) is still returned.
+
+    Args:
+        rule: the rule stepping the cells
+        cache_dir: the directory of cached tables (default: `get_default_cache_dir()`)
+
+    Returns:
+        the table of 65536 entries
+    """
+    table = _tables.get(rule)
+    if table is not None:
+        return table
+
+    path = os.path.join(cache_dir or get_default_cache_dir(), 'block_{}.bin'.format(str(rule).replace('/', '_')))
+    try:
+        with open(path, 'rb') as fp:
+            data = fp.read()
+        if len(data) == len(MAGIC) + TABLE_SIZE and data.startswith(MAGIC):
+            table = data[len(MAGIC):]
+    except OSError:
+        pass
+
+    if table is None:
+        table = build_block_table(rule)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # written to a temporary file first, so that other processes never read a partial table
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(MAGIC + table)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+    _tables[rule] = table
+    return table
+
+
+def _spread(np, blocks):
+    """Move the bits of 2x2 blocks (cell at (row, column) at bit `row * 2 + column`) to bits `row * 4 + column`.
+
+    In this form, the key of 4x4 cells is the OR of the four 2x2 blocks in it shifted by 0, 2, 8 and 10 bits.
+    """
+    blocks = blocks.astype(np.uint16)
+    return (blocks & 0b0011) | ((blocks & 0b1100) << 2)
+
+
+class BlockTableEngine(Engine):
+    """An engine stepping the board by 2x2 blocks, looking the next generation of each block up in a table.
+
+    The next generation of a 2x2 block only depends on the 4x4 cells around it, which are all precomputed for the rule
+    by `build_block_table`. The board is kept as 2x2 blocks: the four blocks of a 4x4 square are combined into a key
+    with a few shifts, and the looked up result is the block at its center, one cell down and right. Blocks are
+    therefore aligned on odd cells every other generation, and stepped back to even cells in the next one. The grid is
+    surrounded by dead blocks, and cells past the grid are cleared after each generation, so the edges behave exactly
+    as in the other engines (requires numpy).
+
+    Attributes:
+        blocks: uint16 array of blocks, where the cell at (row, column) of a block is bit `row * 4 + column`
+        phase: 0 if a block (i, j) has the cell (2 * i - 2, 2 * j - 2) at its top left, 1 if (2 * i - 1, 2 * j - 1)
+        table: the block table of the rule, as uint16 blocks of `blocks`
+    """
+    name = 'table'
+    blocks = None
+    phase = None
+    table = None
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 alive_indices: Iterable[int],
+                 rule: Optional[Rule] = None,
+                 cache_dir: Optional[str] = None):
+        super().__init__(width, height, alive_indices, rule)
+        np = self._np = import_numpy()
+        self.table = _spread(np, np.frombuffer(get_block_table(self.rule, cache_dir), dtype=np.uint8))
+
+        # a block of dead cells on each side of the grid in both phases
+        shape = (height // 2 + 3, width // 2 + 3)
+        cells = np.zeros((shape[0] * 2, shape[1] * 2), dtype=np.uint8)
+        indices = as_index_array(np, alive_indices)
+        cells[indices // width + 2, indices % width + 2] = 1
+        self.blocks = self._pack(cells)
+        self.phase = 0
+
+        # blocks of cells inside of the grid, for each phase (one cell up and left in the phase 1)
+        inside = np.zeros_like(cells)
+        inside[2:height + 2, 2:width + 2] = 1
+        shifted = np.zeros_like(cells)
+        shifted[1:height + 1, 1:width + 1] = 1
+        self._masks = (self._pack(inside), self._pack(shifted))
+        self._keys = np.empty((shape[0] - 1, shape[1] - 1), dtype=np.uint16)
+        self._shifted = np.empty_like(self._keys)
+
+    def _pack(self, cells):
+        """Return blocks of 2x2 cells, from an array of cells of even numbers of rows and columns.
+        """
+        return (cells[0::2, 0::2].astype(self._np.uint16) | (cells[0::2, 1::2] << 1)
+                | (cells[1::2, 0::2] << 4) | (cells[1::2, 1::2] << 5))
+
+    def _unpack(self):
+        """Return the cells of the grid from the blocks.
+        """
+        np = self._np
+        cells = np.empty((self.blocks.shape[0] * 2, self.blocks.shape[1] * 2), dtype=np.uint8)
+        for row in range(2):
+            for column in range(2):
+                cells[row::2, column::2] = (self.blocks >> (row * 4 + column)) & 1
+        offset = 2 - self.phase
+        return cells[offset:offset + self.height, offset:offset + self.width]
+
+    def step(self):
+        np = self._np
+        blocks, keys, shifted = self.blocks, self._keys, self._shifted
+
+        # the 4x4 cells of blocks (i, j), (i, j + 1), (i + 1, j) and (i + 1, j + 1)
+        np.copyto(keys, blocks[:-1, :-1])
+        for (row, column), shift in (((0, 1), 2), ((1, 0), 8), ((1, 1), 10)):
+            np.left_shift(blocks[row:row + keys.shape[0], column:column + keys.shape[1]], shift, out=shifted)
+            np.bitwise_or(keys, shifted, out=keys)
+
+        # the center of the 4x4 cells at (i, j) is the block (i, j) of the other phase, or (i + 1, j + 1) back to 0
+        following = np.zeros_like(blocks)
+        if self.phase == 0:
+            following[:-1, :-1] = self.table[keys]
+        else:
+            following[1:, 1:] = self.table[keys]
+        self.phase = 1 - self.phase
+        # cells past the grid are born like others, but they are always dead
+        np.bitwise_and(following, self._masks[self.phase], out=following)
+        self.blocks = following
+
+    def step_with_changes(self) -> Tuple[List[int], List[int]]:
+        # blocks are laid out differently in each phase, so the cells are compared
+        previous = self._unpack()
+        self.step()
+        return get_changed_indices(self._np, previous, self._unpack())
+
+    def get_grid(self):
+        return self._unpack()
+
+    def get_cells(self):
+        """Return the cells unpacked to a uint8 array of shape (height, width).
+        """
+        return self._np.ascontiguousarray(self._unpack())
+
+    def get_alive_indices(self) -> List[int]:
+        return self._np.flatnonzero(self._unpack()).tolist()
+
+    def get_fingerprint(self) -> int:
+        # blocks of the same cells differ between phases, so the cells are hashed
+        return hash(self._np.packbits(self._unpack()).tobytes())
+
+    def get_population(self) -> int:
+        np = self._np
+        if hasattr(np, 'bitwise_count'):
+            # numpy 2.0 or later
+            return int(np.bitwise_count(self.blocks).sum())
+        return int(np.count_nonzero(self._unpack()))
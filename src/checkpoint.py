@@ -0,0 +1,202 @@
+import glob
+import os
+import re
+import threading
+import time
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from .life import Life
+    from .rules import Rule
+    from .snapshot import encode_snapshot, load_snapshot
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from life import Life
+    from rules import Rule
+    from snapshot import encode_snapshot, load_snapshot
+
+
+CHECKPOINT_PATTERN = re.compile(r'^checkpoint_(\d+)\.snap$')
+
+
+def get_checkpoint_path(directory: str, generation: int) -> str:
+    """Return the path of the checkpoint of `generation`.
+    """
+    return os.path.join(directory, 'checkpoint_{:012d}.snap'.format(generation))
+
+
+def list_checkpoints(directory: str) -> List[Tuple[int, str]]:
+    """Return generations and paths of checkpoints in `directory`, from the oldest generation.
+    """
+    res = []
+    for path in glob.glob(os.path.join(directory, 'checkpoint_*.snap')):
+        matched = CHECKPOINT_PATTERN.match(os.path.basename(path))
+        if matched:
+            res.append((int(matched.group(1)), path))
+
+    return sorted(res)
+
+
+def clear_checkpoints(directory: str):
+    """Remove every checkpoint in `directory`, so that a new run is not resumed from a previous one.
+    """
+    for _, path in list_checkpoints(directory):
+        os.remove(path)
+
+
+def load_latest_checkpoint(directory: str,
+                           engine: str = Life.DEFAULT_ENGINE,
+                           engine_options: Optional[Dict] = None,
+                           rule: Optional[Rule] = None) -> Optional[Life]:
+    """Load the game of the latest valid checkpoint in `directory`.
+
+    Checkpoints which cannot be loaded (e.g. truncated by a crash) are removed, and the previous one is tried.
+
+    Args:
+        directory: a directory checkpoints were written to by `Checkpointer`
+        engine: name of the engine stepping the board
+        engine_options: keyword arguments given to the engine
+        rule: the rule stepping the board, which overrides the rule recorded in the checkpoint
+
+    Returns:
+        the game at the generation of the checkpoint, None if there is no valid checkpoint
+    """
+    for _, path in reversed(list_checkpoints(directory)):
+        try:
+            return load_snapshot(path, engine=engine, engine_options=engine_options, rule=rule)
+        except Exception as e:
+            print("Skipping a broken checkpoint {} ({})".format(path, e))
+            os.remove(path)
+
+    return None
+
+
+class Checkpointer:
+    """Write checkpoints of a game every `every` generations or every `seconds`, from a background thread.
+
+    The state is copied when a checkpoint is taken, and the copy is written by the writer thread, so stepping never
+    waits on the disk. If the writer falls behind, a pending checkpoint is replaced by the newer one. Each checkpoint
+    is written to a temporary file and renamed, so a crash never leaves a partial checkpoint behind, and only the
+    latest `keep` checkpoints are kept.
+
+    Attributes:
+        directory: a directory to write checkpoints to, which is created if missing
+        every: take a checkpoint when the generation is a multiple of this (never if None)
+        seconds: take a checkpoint when this time has passed since the last one (never if None)
+        keep: the number of checkpoints kept
+        num_of_checkpoints: number of checkpoints written
+        num_of_dropped_checkpoints: number of checkpoints replaced by a newer one before they were written
+        last_generation: the generation of the last checkpoint written
+    """
+    directory = None
+    every = None
+    seconds = None
+    keep = None
+    num_of_checkpoints = None
+    num_of_dropped_checkpoints = None
+    last_generation = None
+
+    def __init__(self,
+                 directory: str,
+                 every: Optional[int] = None,
+                 seconds: Optional[float] = None,
+                 keep: int = 2,
+                 clock: Callable[[], float] = time.monotonic):
+        if every is not None and every < 1:
+            raise ValueError("every should be positive ({})".format(every))
+        if keep < 1:
+            raise ValueError("keep should be positive ({})".format(keep))
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.every = every
+        self.seconds = seconds
+        self.keep = keep
+        self.num_of_checkpoints = 0
+        self.num_of_dropped_checkpoints = 0
+        self._clock = clock
+        self._last_taken_at = clock()
+
+        self._condition = threading.Condition()
+        self._pending = None    # (generation, header, payload) of the checkpoint to write next
+        self._is_closed = False
+        self._error = None
+        self._writer = threading.Thread(target=self._write_checkpoints, name='checkpoint-writer', daemon=True)
+        self._writer.start()
+
+    def is_due(self, game: Life) -> bool:
+        """Return True if a checkpoint of the current generation of `game` should be taken.
+        """
+        if self.every is not None and game.generation % self.every == 0:
+            return True
+        return self.seconds is not None and self._clock() - self._last_taken_at >= self.seconds
+
+    def update(self, game: Life):
+        """Take a checkpoint of `game` if it is due, called after each step.
+        """
+        if self.is_due(game):
+            self.take(game)
+
+    def take(self, game: Life):
+        """Copy the current generation of `game`, to be written by the writer thread.
+        """
+        header, payload = encode_snapshot(game)
+        # the payload may be the board of the engine, which changes in the next generation
+        checkpoint = (game.generation, header, bytes(payload))
+        self._last_taken_at = self._clock()
+
+        with self._condition:
+            self._raise_error()
+            if self._pending is not None:
+                self.num_of_dropped_checkpoints += 1
+            self._pending = checkpoint
+            self._condition.notify()
+
+    def close(self):
+        """Wait for the pending checkpoint to be written, and stop the writer thread.
+
+        Raises:
+            the error of the writer thread, if writing a checkpoint failed
+        """
+        with self._condition:
+            self._is_closed = True
+            self._condition.notify()
+        self._writer.join()
+
+        with self._condition:
+            self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write_checkpoints(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._is_closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                checkpoint, self._pending = self._pending, None
+
+            try:
+                self._write(*checkpoint)
+            except Exception as e:
+                with self._condition:
+                    self._error = e
+
+    def _write(self, generation: int, header: bytes, payload: bytes):
+        path = get_checkpoint_path(self.directory, generation)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as fp:
+            fp.write(header)
+            fp.write(payload)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temp_path, path)
+
+        self.num_of_checkpoints += 1
+        self.last_generation = generation
+        for _, old_path in list_checkpoints(self.directory)[:-self.keep]:
+            os.remove(old_path)
@@ -0,0 +1,257 @@
+import struct
+
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+try:
+    from .life import Life
+    from .rules import Rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from life import Life
+    from rules import Rule
+
+
+MAGIC = b'GOLDELTA'
+VERSION = 1
+
+# magic, version, grid_height, grid_width, generation of the first state (all little endian)
+HEADER = struct.Struct('<8sIQQQ')
+
+
+def _append_varint(out: bytearray, value: int):
+    """Append an unsigned integer in 7 bits per byte, where the high bit of a byte marks that more bytes follow.
+    """
+    while value >= 0x80:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """Return an integer written by `_append_varint` at `position` of `data`, and the position following it.
+    """
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _append_indices(out: bytearray, indices: Iterable[int]):
+    """Append the number of indices, and the gaps between them in ascending order.
+    """
+    indices = sorted(indices)
+    _append_varint(out, len(indices))
+    previous = -1
+    for index in indices:
+        _append_varint(out, index - previous - 1)
+        previous = index
+
+
+def _read_indices(data: bytes, position: int) -> Tuple[List[int], int]:
+    """Return indices written by `_append_indices` at `position` of `data`, and the position following them.
+    """
+    num_of_indices, position = _read_varint(data, position)
+    indices = []
+    previous = -1
+    for _ in range(num_of_indices):
+        gap, position = _read_varint(data, position)
+        previous += gap + 1
+        indices.append(previous)
+    return indices, position
+
+
+def _read_record(fp: BinaryIO) -> Optional[bytes]:
+    """Read the payload of a record, None at the end of the file or at a record which is not completely written.
+    """
+    length = shift = 0
+    while True:
+        byte = fp.read(1)
+        if not byte:
+            return None
+        length |= (byte[0] & 0x7f) << shift
+        if byte[0] < 0x80:
+            break
+        shift += 7
+
+    payload = fp.read(length)
+    return payload if len(payload) == length else None
+
+
+class DeltaLogWriter:
+    """Write generations of a game as a delta log, to be played back by `DeltaLogReader` without simulating them.
+
+    A delta log is a fixed size header, the alive cells of the first generation, and a record of the cells born and
+    died in every following generation. Cells are flat indices (`row * grid_width + column`) written in ascending
+    order as gaps from the previous one, in 7 bits per byte, so a record mostly takes a byte or two per changed cell.
+    Every record is prefixed by its length, so a log which is still written (or was cut off) is read up to its last
+    complete record.
+
+    Attributes:
+        generation: the last generation written
+    """
+    generation = None
+
+    def __init__(self, file_name: str, game: Life):
+        """Create a delta log starting from the current generation of `game`.
+        """
+        self._fp = open(file_name, 'wb')
+        self._fp.write(HEADER.pack(MAGIC, VERSION, game.grid_height, game.grid_width, game.generation))
+        payload = bytearray()
+        _append_indices(payload, game.get_alive_indices())
+        self._write_record(payload)
+        self.generation = game.generation
+
+    def _write_record(self, payload: bytearray):
+        prefix = bytearray()
+        _append_varint(prefix, len(payload))
+        self._fp.write(prefix)
+        self._fp.write(payload)
+
+    def write(self, generation: int, births: Iterable[int], deaths: Iterable[int]):
+        """Write the cells born and died since the last generation written.
+
+        Args:
+            generation: the generation of the record, after the last one written (generations may be skipped)
+            births: flat indices of cells born
+            deaths: flat indices of cells died
+        """
+        if generation <= self.generation:
+            raise ValueError("The generation does not follow the delta log ({}, last: {})".format(
+                generation, self.generation))
+
+        payload = bytearray()
+        _append_varint(payload, generation - self.generation)
+        _append_indices(payload, births)
+        _append_indices(payload, deaths)
+        self._write_record(payload)
+        self.generation = generation
+
+    def flush(self):
+        """Make records written so far readable by other processes.
+        """
+        self._fp.flush()
+
+    def close(self):
+        self._fp.close()
+
+    def __enter__(self) -> 'DeltaLogWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def record_game(file_name: str, game: Life, num_of_generation: int):
+    """Proceed `game` `num_of_generation` generations, and record all of them to a delta log.
+
+    Args:
+        file_name: a path of the delta log
+        game: the game to proceed and record from its current generation
+        num_of_generation: total number of generation to go
+    """
+    with DeltaLogWriter(file_name, game) as writer:
+        for generation, births, deaths in game.iter_generations(num_of_generation):
+            writer.write(generation, births, deaths)
+
+
+class DeltaLogReader:
+    """Play back a delta log written by `DeltaLogWriter`.
+
+    Attributes:
+        grid_width: a width of the grid
+        grid_height: a height of the grid
+        generation: the first generation of the log
+        alive_indices: flat indices of alive cells of the first generation
+    """
+    grid_width = None
+    grid_height = None
+    generation = None
+    alive_indices = None
+
+    def __init__(self, file_name: str):
+        self._fp = open(file_name, 'rb')
+        try:
+            header = self._fp.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise Exception("The delta log is truncated ({}).".format(file_name))
+            magic, version, self.grid_height, self.grid_width, self.generation = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise Exception("The file is not a delta log ({}).".format(file_name))
+            if version != VERSION:
+                raise Exception("The version of the delta log is not supported ({}).".format(version))
+
+            payload = _read_record(self._fp)
+            if payload is None:
+                raise Exception("The delta log is truncated ({}).".format(file_name))
+            self.alive_indices = _read_indices(payload, 0)[0]
+            self._deltas_offset = self._fp.tell()
+        except Exception:
+            self._fp.close()
+            raise
+
+    def __iter__(self) -> Iterator[Tuple[int, List[int], List[int]]]:
+        """Yield the generation, and flat indices of cells born and of cells died of every record, in order.
+
+        Records are read lazily, up to the last one written completely when the iteration reaches it.
+        """
+        self._fp.seek(self._deltas_offset)
+        generation = self.generation
+        while True:
+            payload = _read_record(self._fp)
+            if payload is None:
+                return
+            gap, position = _read_varint(payload, 0)
+            births, position = _read_indices(payload, position)
+            deaths, _ = _read_indices(payload, position)
+            generation += gap
+            yield generation, births, deaths
+
+    def iter_alive_indices(self) -> Iterator[Tuple[int, Set[int]]]:
+        """Yield the generation and alive cells of every generation of the log, from the first one.
+
+        The yielded set is updated in place by the following generations, so it should be copied to be kept.
+        """
+        alive = set(self.alive_indices)
+        yield self.generation, alive
+        for generation, births, deaths in self:
+            alive.difference_update(deaths)
+            alive.update(births)
+            yield generation, alive
+
+    def replay(self,
+               generation: Optional[int] = None,
+               engine: str = Life.DEFAULT_ENGINE,
+               rule: Union[Rule, str, None] = None) -> Life:
+        """Create a game at a generation of the log by applying its records, without simulating it.
+
+        Args:
+            generation: a generation written to the log (default: the last one)
+            engine: name of the engine stepping the game
+            rule: the rule stepping the game, which is not recorded in the log (default: Conway's game of life)
+
+        Returns:
+            the game at the generation
+        """
+        found = None
+        for found in self.iter_alive_indices():
+            if found[0] == generation:
+                break
+        if generation is not None and found[0] != generation:
+            raise ValueError("The generation is not in the delta log ({})".format(generation))
+
+        game = Life(engine=engine, rule=rule)
+        game.init_grid_from_indices(self.grid_width, self.grid_height, sorted(found[1]))
+        game.generation = found[0]
+        return game
+
+    def close(self):
+        self._fp.close()
+
+    def __enter__(self) -> 'DeltaLogReader':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
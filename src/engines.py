@@ -0,0 +1,796 @@
+import importlib
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .rules import CONWAY, Rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from rules import CONWAY, Rule
+
+
+def import_numpy():
+    """Import numpy on demand so that engines which do not need it keep the startup fast.
+
+    Returns:
+        the numpy module
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("This engine requires numpy, which is not installed.")
+
+    return numpy
+
+
+def as_index_array(np, alive_indices: Iterable[int]):
+    """Return flat indices as an int64 numpy array, without copying numpy arrays which already are.
+    """
+    if isinstance(alive_indices, np.ndarray):
+        return alive_indices.astype(np.int64, copy=False)
+    return np.fromiter(alive_indices, dtype=np.int64)
+
+
+def unpack_bitpacked_indices(data, width: int, height: int) -> Iterable[int]:
+    """Return flat indices of alive cells in bit-packed rows.
+
+    Each row takes a whole number of 64 bit words, and column `c` is bit `c % 8` of byte `c // 8` of the row, which is
+    the layout of `BitboardEngine.words` in little endian.
+
+    Args:
+        data: the packed rows as a bytes-like object or a uint64 numpy array
+        width: a width of the grid
+        height: a height of the grid
+
+    Returns:
+        flat indices (a numpy array if numpy is installed)
+    """
+    num_of_bytes = (width + 63) // 64 * 8
+    try:
+        np = import_numpy()
+    except ImportError:
+        res = []
+        data = memoryview(data).cast('B')
+        for row in range(height):
+            bits = int.from_bytes(data[row * num_of_bytes:(row + 1) * num_of_bytes], 'little')
+            while bits:
+                lowest = bits & -bits
+                res.append(row * width + lowest.bit_length() - 1)
+                bits ^= lowest
+        return res
+
+    words = np.frombuffer(data, dtype='<u8').reshape(height, num_of_bytes // 8)
+    return np.flatnonzero(_unpack_words(np, words, width))
+
+
+def pack_bitpacked_indices(alive_indices: Iterable[int], width: int, height: int):
+    """Return alive cells packed in rows, the reverse of `unpack_bitpacked_indices`.
+
+    Args:
+        alive_indices: flat indices of alive cells
+        width: a width of the grid
+        height: a height of the grid
+
+    Returns:
+        uint64 array of shape (height, number of words per row), or a bytearray in little endian if numpy is not
+        installed
+    """
+    num_of_words = (width + 63) // 64
+    try:
+        np = import_numpy()
+    except ImportError:
+        res = bytearray(height * num_of_words * 8)
+        for index in alive_indices:
+            row, col = divmod(index, width)
+            res[row * num_of_words * 8 + col // 8] |= 1 << (col % 8)
+        return res
+
+    words = np.zeros((height, num_of_words), dtype=np.uint64)
+    indices = as_index_array(np, alive_indices)
+    cols = indices % width
+    bits = np.left_shift(np.uint64(1), (cols % 64).astype(np.uint64))
+    np.bitwise_or.at(words, (indices // width, cols // 64), bits)
+    return words
+
+
+def count_alive_neighbors_in_padded(np, padded):
+    """Return the number of alive neighbors for every cell of a board surrounded by a border of one cell.
+
+    Args:
+        np: the numpy module
+        padded: uint8 array of the board with one extra row and column on each side
+
+    Returns:
+        uint8 array of the counts, without the border
+    """
+    height, width = padded.shape[0] - 2, padded.shape[1] - 2
+
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for i in range(3):
+        for j in range(3):
+            if i == 1 and j == 1:
+                continue
+            counts += padded[i:i + height, j:j + width]
+
+    return counts
+
+
+def apply_rule_to_counts(np, rule: Rule, board, counts):
+    """Return the next generation of a board from the number of alive neighbors of every cell.
+
+    Args:
+        np: the numpy module
+        rule: the rule to apply
+        board: array of the cells (nonzero for alive cells)
+        counts: array of the numbers of alive neighbors, of the same shape
+
+    Returns:
+        bool array of the next generation
+    """
+    if rule.is_conway:
+        # comparisons are much faster than indexing the table by every cell
+        return (counts == 3) | ((board == 1) & (counts == 2))
+
+    # the compiled table is indexed by the state and the neighbor count of every cell at once
+    return np.asarray(rule.table, dtype=bool)[(board != 0).astype(np.intp), counts]
+
+
+def get_changed_indices(np, previous, current) -> Tuple[List[int], List[int]]:
+    """Return flat indices of cells born and of cells died between two boards of the same shape.
+
+    Args:
+        np: the numpy module
+        previous: array of the cells of the previous generation (nonzero for alive cells)
+        current: array of the cells of the current generation
+
+    Returns:
+        flat indices of cells born, and of cells died
+    """
+    previous, current = previous.reshape(-1), current.reshape(-1)
+    changed = np.flatnonzero(previous != current)
+    is_born = current[changed] != 0
+    return changed[is_born].tolist(), changed[~is_born].tolist()
+
+
+def get_neighbor_indices(index: int, width: int, height: int) -> List[int]:
+    """Return flat indices of the neighbors of the cell at `index` inside of the grid.
+
+    Args:
+        index: flat index of the center cell
+        width: a width of the grid
+        height: a height of the grid
+
+    Returns:
+        list of flat indices of neighbors (exclude center)
+    """
+    row, col = divmod(index, width)
+    if 0 < row < height - 1 and 0 < col < width - 1:
+        return [index - width - 1, index - width, index - width + 1,
+                index - 1, index + 1,
+                index + width - 1, index + width, index + width + 1]
+
+    return [
+        (row + i) * width + col + j
+        for i in (-1, 0, 1) for j in (-1, 0, 1)
+        if (i or j) and 0 <= row + i < height and 0 <= col + j < width
+    ]
+
+
+def count_alive_neighbors_by_index(alive_indices: Iterable[int], width: int, height: int) -> Counter:
+    """For each cell which has at least one alive neighbor, get the total number of alive neighbors.
+
+    Args:
+        alive_indices: flat indices of alive cells
+        width: a width of the grid
+        height: a height of the grid
+
+    Returns:
+        total number of alive neighbors by flat index
+    """
+    counter = Counter()    # type: Counter
+
+    inner_cells = []
+    for index in alive_indices:
+        row, col = divmod(index, width)
+        if 0 < row < height - 1 and 0 < col < width - 1:
+            inner_cells.append(index)
+        else:
+            # cells on the edge have neighbors only inside of the grid
+            counter.update(get_neighbor_indices(index, width, height))
+
+    # count a whole offset at once, which is much faster than counting cell by cell
+    for offset in (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1):
+        counter.update([index + offset for index in inner_cells])
+
+    return counter
+
+
+class Engine:
+    """A base class for the stepping engines of `Life`.
+
+    An engine owns the board storage and advances it by generations.
+    Cells are exchanged as flat indices (`row * width + column`), so engines never allocate `CellIndex` objects.
+
+    Attributes:
+        name: a name to select the engine with
+        width: a width of the grid
+        height: a height of the grid
+        rule: the rule stepping the board
+        can_jump: True if `advance` skips intermediate generations instead of stepping through them
+        stats: counters describing the work done by the engine
+    """
+    name = None
+    width = None
+    height = None
+    rule = None
+    can_jump = False
+    stats = None
+
+    def __init__(self, width: int, height: int, alive_indices: Iterable[int], rule: Optional[Rule] = None):
+        self.width = width
+        self.height = height
+        self.rule = rule or CONWAY
+
+    def step(self):
+        """Proceed one generation.
+        """
+        raise NotImplementedError
+
+    def advance(self, num_of_generation: int):
+        """Proceed `num_of_generation` generations.
+
+        Args:
+            num_of_generation: total number of generation to go
+        """
+        for _ in range(num_of_generation):
+            self.step()
+
+    def step_with_changes(self) -> Tuple[List[int], List[int]]:
+        """Proceed one generation, and return the cells which changed in it.
+
+        Alive cells are compared with the previous generation by default. Engines override it to find the changes
+        from their own storage, without listing every alive cell twice.
+
+        Returns:
+            flat indices of cells born, and of cells died
+        """
+        previous = set(self.get_alive_indices())
+        self.step()
+        current = set(self.get_alive_indices())
+        return list(current - previous), list(previous - current)
+
+    def get_alive_indices(self) -> List[int]:
+        """Return flat indices of alive cells in the current generation.
+        """
+        raise NotImplementedError
+
+    def get_population(self) -> int:
+        """Return the number of alive cells in the current generation.
+        """
+        return len(self.get_alive_indices())
+
+    def get_fingerprint(self) -> Optional[int]:
+        """Return a hash of the current generation computed from the storage of the engine, or None to have the alive
+        cells hashed instead (see `Life.detect_cycles`).
+
+        Equal states of an engine should have equal hashes, and different states rarely share one. It is called every
+        generation, so it should take a small part of a step.
+        """
+        return None
+
+    def get_grid(self):
+        """Return the status of each cell, which can be read as `grid[row][column]`.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release resources held by the engine, such as worker processes.
+        """
+
+
+class NumpyEngine(Engine):
+    """An engine keeping the board as a uint8 numpy array.
+
+    Neighbor counts are the sum of the eight shifted copies of the board, so a generation is computed in bulk.
+    """
+    name = 'numpy'
+    board = None
+
+    def __init__(self, width: int, height: int, alive_indices: Iterable[int], rule: Optional[Rule] = None):
+        super().__init__(width, height, alive_indices, rule)
+        self._np = import_numpy()
+
+        self.board = self._np.zeros((height, width), dtype=self._np.uint8)
+        indices = as_index_array(self._np, alive_indices)
+        self.board.reshape(-1)[indices] = 1
+
+    def count_alive_neighbors(self):
+        """Return the number of alive neighbors for every cell.
+
+        Cells outside of the grid are regarded as dead.
+        """
+        return count_alive_neighbors_in_padded(self._np, self._np.pad(self.board, 1, mode='constant'))
+
+    def step(self):
+        counts = self.count_alive_neighbors()
+        self.board = apply_rule_to_counts(self._np, self.rule, self.board, counts).astype(self._np.uint8)
+
+    def step_with_changes(self) -> Tuple[List[int], List[int]]:
+        # the board is replaced by the next generation, so the previous one is still there to compare with
+        previous = self.board
+        self.step()
+        return get_changed_indices(self._np, previous, self.board)
+
+    def get_alive_indices(self) -> List[int]:
+        return self._np.flatnonzero(self.board).tolist()
+
+    def get_population(self) -> int:
+        return int(self._np.count_nonzero(self.board))
+
+    def get_fingerprint(self) -> int:
+        # packing the board first is faster than hashing a byte per cell
+        return hash(self._np.packbits(self.board).tobytes())
+
+    def get_grid(self):
+        return self.board
+
+    def get_cells(self):
+        """Return the board itself, which is replaced rather than changed by the next generation.
+        """
+        return self.board
+
+
+def _full_adder(a, b, c):
+    """Add three bit-planes, returning the bit-planes of the sum and the carry.
+    """
+    partial = a ^ b
+    return partial ^ c, (a & b) | (partial & c)
+
+
+def _unpack_words(np, words, width: int):
+    """Unpack bit-packed rows to a uint8 array of cells.
+
+    Args:
+        np: the numpy module
+        words: uint64 array whose last axis holds the words of a row (column `c` is bit `c % 64` of word `c // 64`)
+        width: number of cells per row
+
+    Returns:
+        uint8 array whose last axis has `width` cells
+    """
+    as_bytes = words.astype('<u8').view(np.uint8)
+    bits = np.unpackbits(as_bytes, axis=-1)
+    # `unpackbits` starts from the most significant bit of each byte
+    bits = bits.reshape(as_bytes.shape + (8,))[..., ::-1]
+    return bits.reshape(words.shape[:-1] + (-1,))[..., :width]
+
+
+def _get_set_bit_indices(np, words, width: int):
+    """Return flat indices of the cells set in bit-packed rows, unpacking only the rows having any of them.
+    """
+    rows = np.flatnonzero(words.any(axis=1))
+    if not len(rows):
+        # an empty array cannot be unpacked to rows of `width` cells
+        return rows
+    row_offsets, columns = np.nonzero(_unpack_words(np, words[rows], width))
+    return rows[row_offsets] * width + columns
+
+
+class PackedRow:
+    """A read-only view of a bit-packed row which can be read as `row[column]`.
+    """
+    def __init__(self, np, words, width: int):
+        self._np = np
+        self._words = words
+        self._width = width
+
+    def __len__(self):
+        return self._width
+
+    def __getitem__(self, column: int) -> bool:
+        if column < 0:
+            column += self._width
+        if not 0 <= column < self._width:
+            raise IndexError("column index out of range ({})".format(column))
+
+        return bool((int(self._words[column >> 6]) >> (column & 63)) & 1)
+
+    def __iter__(self):
+        return iter(_unpack_words(self._np, self._words, self._width).astype(bool).tolist())
+
+
+class PackedGrid:
+    """A read-only view of a bit-packed board which can be read as `grid[row][column]`.
+    """
+    def __init__(self, np, words, width: int):
+        self._np = np
+        self._words = words
+        self._width = width
+
+    def __len__(self):
+        return len(self._words)
+
+    def __getitem__(self, row: int) -> PackedRow:
+        return PackedRow(self._np, self._words[row], self._width)
+
+    def __iter__(self):
+        for words in self._words:
+            yield PackedRow(self._np, words, self._width)
+
+
+class BitboardEngine(Engine):
+    """An engine packing 64 cells into each machine word.
+
+    The board is stored as rows of uint64 words, where column `c` is bit `c % 64` of word `c // 64`.
+    Neighbor counts are computed for 64 cells at once with bitwise full adders.
+
+    Attributes:
+        words: uint64 array of shape (height, number of words per row)
+        ROWS_PER_BAND: number of rows stepped together, which bounds the memory used for temporaries
+    """
+    name = 'bitboard'
+    words = None
+    ROWS_PER_BAND = 1024
+    WORD_SIZE = 64
+
+    def __init__(self, width: int, height: int, alive_indices: Iterable[int], rule: Optional[Rule] = None):
+        super().__init__(width, height, alive_indices, rule)
+        np = self._np = import_numpy()
+
+        num_of_words = (width + self.WORD_SIZE - 1) // self.WORD_SIZE
+        # bits past the last column must stay zero so that they never count as neighbors
+        num_of_last_bits = width - (num_of_words - 1) * self.WORD_SIZE
+        self._last_word_mask = np.uint64((1 << num_of_last_bits) - 1)
+
+        self.words = pack_bitpacked_indices(alive_indices, width, height)
+
+    def _shift_from_left(self, words):
+        """Move every cell one column to the right, so each cell sees its left neighbor.
+        """
+        res = words << self._np.uint64(1)
+        res[:, 1:] |= words[:, :-1] >> self._np.uint64(self.WORD_SIZE - 1)
+        return res
+
+    def _shift_from_right(self, words):
+        """Move every cell one column to the left, so each cell sees its right neighbor.
+        """
+        res = words >> self._np.uint64(1)
+        res[:, :-1] |= words[:, 1:] << self._np.uint64(self.WORD_SIZE - 1)
+        return res
+
+    def _step_band(self, start: int, stop: int):
+        """Return the next generation of rows from `start` to `stop`.
+        """
+        np = self._np
+        num_of_rows = stop - start
+
+        # rows `start - 1` to `stop` where rows outside of the grid are dead
+        padded = np.zeros((num_of_rows + 2, self.words.shape[1]), dtype=np.uint64)
+        padded[max(1 - start, 0):num_of_rows + 2 - max(stop + 1 - self.height, 0)] = \
+            self.words[max(start - 1, 0):min(stop + 1, self.height)]
+
+        left = self._shift_from_left(padded)
+        right = self._shift_from_right(padded)
+
+        center = padded[1:-1]
+        neighbors = (
+            padded[:-2], left[:-2], right[:-2],
+            left[1:-1], right[1:-1],
+            padded[2:], left[2:], right[2:],
+        )
+
+        sum0, carry0 = _full_adder(*neighbors[0:3])
+        sum1, carry1 = _full_adder(*neighbors[3:6])
+        sum2, carry2 = neighbors[6] ^ neighbors[7], neighbors[6] & neighbors[7]
+        ones, carry3 = _full_adder(sum0, sum1, sum2)
+        # the neighbor count is `ones + 2 * (carry0 + carry1 + carry2 + carry3)`
+        partial, carry4 = _full_adder(carry0, carry1, carry2)
+        twos = partial ^ carry3
+
+        if self.rule.is_conway:
+            # 2 or 3 neighbors keep a live cell, exactly 3 neighbors give a birth
+            fours_or_more = carry4 | (partial & carry3)
+            res = twos & ~fours_or_more & (ones | center)
+        else:
+            carry5 = partial & carry3
+            res = self._apply_rule(center, (ones, twos, carry4 ^ carry5, carry4 & carry5))
+
+        res[:, -1] &= self._last_word_mask
+        return res
+
+    def _apply_rule(self, center, bits):
+        """Return the next generation of `center` from the bits of its neighbor counts, from the lowest one.
+
+        Each number of neighbors in the rule is matched on all bits at once, for 64 cells per word.
+        """
+        res = self._np.zeros_like(center)
+        for states, numbers in ((~center, self.rule.births), (center, self.rule.survivals)):
+            for number in numbers:
+                matched = states.copy()
+                for i, bit in enumerate(bits):
+                    matched &= bit if (number >> i) & 1 else ~bit
+                res |= matched
+
+        return res
+
+    def step(self):
+        next_words = self._np.empty_like(self.words)
+        for start in range(0, self.height, self.ROWS_PER_BAND):
+            stop = min(start + self.ROWS_PER_BAND, self.height)
+            next_words[start:stop] = self._step_band(start, stop)
+
+        self.words = next_words
+
+    def step_with_changes(self) -> Tuple[List[int], List[int]]:
+        previous = self.words
+        self.step()
+        births = _get_set_bit_indices(self._np, self.words & ~previous, self.width)
+        deaths = _get_set_bit_indices(self._np, previous & ~self.words, self.width)
+        return births.tolist(), deaths.tolist()
+
+    def get_alive_indices(self) -> List[int]:
+        res = []
+        for start in range(0, self.height, self.ROWS_PER_BAND):
+            cells = _unpack_words(self._np, self.words[start:start + self.ROWS_PER_BAND], self.width)
+            res.extend((self._np.flatnonzero(cells) + start * self.width).tolist())
+
+        return res
+
+    def get_population(self) -> int:
+        np = self._np
+        if hasattr(np, 'bitwise_count'):
+            # numpy 2.0 or later
+            return int(np.bitwise_count(self.words).sum())
+        return int(np.unpackbits(self.words.view(np.uint8)).sum())
+
+    def get_fingerprint(self) -> int:
+        return hash(self.words.tobytes())
+
+    def get_cells(self):
+        """Return the cells unpacked to a uint8 array of shape (height, width).
+        """
+        return self._np.ascontiguousarray(_unpack_words(self._np, self.words, self.width))
+
+    @classmethod
+    def from_bitpacked(cls, width: int, height: int, words, rule: Optional[Rule] = None) -> 'BitboardEngine':
+        """Create an engine adopting bit-packed rows without copying them.
+
+        Args:
+            width: a width of the grid
+            height: a height of the grid
+            words: uint64 array of shape (height, number of words per row), e.g. mapped from a snapshot file
+            rule: the rule stepping the board
+        """
+        engine = cls(width, height, [], rule)
+        if not isinstance(words, engine._np.ndarray):
+            words = engine._np.frombuffer(words, dtype='<u8').reshape(height, -1)
+        if words.shape != engine.words.shape:
+            raise ValueError("Packed rows of shape {} do not fit a grid of {}".format(words.shape, (height, width)))
+        if (words[:, -1] & ~engine._last_word_mask).any():
+            raise ValueError("Packed rows have alive cells past the last column")
+
+        engine.words = words
+        return engine
+
+    def get_grid(self) -> PackedGrid:
+        return PackedGrid(self._np, self.words, self.width)
+
+
+class SparseRow:
+    """A read-only view of a row of `SparseEngine` which can be read as `row[column]`.
+    """
+    def __init__(self, alive_indices: Set[int], row: int, width: int):
+        self._alive_indices = alive_indices
+        self._first_index = row * width
+        self._width = width
+
+    def __len__(self):
+        return self._width
+
+    def __getitem__(self, column: int) -> bool:
+        if column < 0:
+            column += self._width
+        if not 0 <= column < self._width:
+            raise IndexError("column index out of range ({})".format(column))
+
+        return self._first_index + column in self._alive_indices
+
+    def __iter__(self):
+        for index in range(self._first_index, self._first_index + self._width):
+            yield index in self._alive_indices
+
+
+class SparseGrid:
+    """A read-only view of `SparseEngine` which can be read as `grid[row][column]`.
+
+    Nothing is allocated per cell until a row is iterated.
+    """
+    def __init__(self, alive_indices: Set[int], width: int, height: int):
+        self._alive_indices = alive_indices
+        self._width = width
+        self._height = height
+
+    def __len__(self):
+        return self._height
+
+    def __getitem__(self, row: int) -> SparseRow:
+        if row < 0:
+            row += self._height
+        if not 0 <= row < self._height:
+            raise IndexError("row index out of range ({})".format(row))
+
+        return SparseRow(self._alive_indices, row, self._width)
+
+    def __iter__(self):
+        for row in range(self._height):
+            yield SparseRow(self._alive_indices, row, self._width)
+
+
+class SparseEngine(Engine):
+    """An engine keeping only the set of alive cells, so memory and time scale with the population.
+
+    Attributes:
+        alive: flat indices of alive cells
+    """
+    name = 'sparse'
+    alive = None
+
+    def __init__(self, width: int, height: int, alive_indices: Iterable[int], rule: Optional[Rule] = None):
+        super().__init__(width, height, alive_indices, rule)
+        self.alive = set(alive_indices)
+
+    def count_alive_neighbors(self) -> Counter:
+        """Return the number of alive neighbors for each cell having at least one alive neighbor.
+        """
+        return count_alive_neighbors_by_index(self.alive, self.width, self.height)
+
+    def get_neighbor_indices(self, index: int) -> List[int]:
+        """Return flat indices of the neighbors of the cell at `index` inside of the grid.
+        """
+        return get_neighbor_indices(index, self.width, self.height)
+
+    def step(self):
+        alive = self.alive
+        if self.rule.is_conway:
+            # comparisons are faster than looking the table up
+            self.alive = {
+                index for index, num_of_alive_neighbors in self.count_alive_neighbors().items()
+                if num_of_alive_neighbors == 3 or (num_of_alive_neighbors == 2 and index in alive)
+            }
+            return
+
+        births, survivals = self.rule.table
+        counts = self.count_alive_neighbors()
+        self.alive = {
+            index for index, num_of_alive_neighbors in counts.items()
+            if (births[num_of_alive_neighbors] and (survivals[num_of_alive_neighbors] or index not in alive))
+            or (survivals[num_of_alive_neighbors] and index in alive)
+        }
+        if survivals[0]:
+            # alive cells without alive neighbors are not counted
+            self.alive.update(index for index in alive if index not in counts)
+
+    def step_with_changes(self) -> Tuple[List[int], List[int]]:
+        # the set of alive cells is replaced by the next generation
+        previous = self.alive
+        self.step()
+        return list(self.alive - previous), list(previous - self.alive)
+
+    def get_alive_indices(self) -> List[int]:
+        return sorted(self.alive)
+
+    def get_population(self) -> int:
+        return len(self.alive)
+
+    def get_grid(self) -> SparseGrid:
+        return SparseGrid(self.alive, self.width, self.height)
+
+
+class IncrementalEngine(SparseEngine):
+    """A sparse engine re-evaluating only the neighborhoods of cells changed in the previous generation.
+
+    A cell whose state and neighbor count did not change keeps following the same transition, so stable areas are
+    skipped and the cost of a generation follows the activity instead of the population.
+
+    Attributes:
+        counts: number of alive neighbors of each cell having at least one, kept up to date with births and deaths
+        stats: number of cells re-evaluated and skipped in the last generation
+    """
+    name = 'incremental'
+    counts = None
+
+    def __init__(self, width: int, height: int, alive_indices: Iterable[int], rule: Optional[Rule] = None):
+        super().__init__(width, height, alive_indices, rule)
+        self.counts = self.count_alive_neighbors()
+        self.stats = {'evaluated_cells': 0, 'skipped_cells': 0}
+        # every cell is evaluated in the first generation
+        self._changed = None
+        self._last_changes = None    # cells born and died in the last generation
+
+    def _update_counts(self, indices: List[int], difference: int):
+        """Add `difference` to the neighbor count of every neighbor of `indices`.
+        """
+        counts = self.counts
+        for index in indices:
+            for neighbor in self.get_neighbor_indices(index):
+                count = counts[neighbor] + difference
+                if count:
+                    counts[neighbor] = count
+                else:
+                    del counts[neighbor]
+
+    def step(self):
+        alive, counts = self.alive, self.counts
+
+        if self._changed is None:
+            candidates = set(counts) | alive
+        else:
+            candidates = set(self._changed)
+            for index in self._changed:
+                candidates.update(self.get_neighbor_indices(index))
+
+        births = []
+        deaths = []
+        is_born, is_surviving = self.rule.table
+        num_of_evaluated_counted_cells = 0
+        for index in candidates:
+            num_of_alive_neighbors = counts.get(index, 0)
+            if num_of_alive_neighbors:
+                num_of_evaluated_counted_cells += 1
+
+            if index in alive:
+                if not is_surviving[num_of_alive_neighbors]:
+                    deaths.append(index)
+            elif is_born[num_of_alive_neighbors]:
+                births.append(index)
+
+        # cells with at least one alive neighbor are the ones a full pass would evaluate
+        self.stats['evaluated_cells'] = len(candidates)
+        self.stats['skipped_cells'] = len(counts) - num_of_evaluated_counted_cells
+
+        alive.difference_update(deaths)
+        alive.update(births)
+        self._update_counts(deaths, -1)
+        self._update_counts(births, 1)
+        self._changed = births + deaths
+        self._last_changes = (births, deaths)
+
+    def step_with_changes(self) -> Tuple[List[int], List[int]]:
+        # the alive cells are updated in place, from the cells born and died found by the step
+        self.step()
+        return self._last_changes
+
+
+# engines by name, given as `module.class` so that modules are imported only when their engine is used
+ENGINES = {
+    NumpyEngine.name: 'engines.NumpyEngine',
+    BitboardEngine.name: 'engines.BitboardEngine',
+    SparseEngine.name: 'engines.SparseEngine',
+    IncrementalEngine.name: 'engines.IncrementalEngine',
+    'hashlife': 'hashlife.HashlifeEngine',
+    'adaptive': 'adaptive.AdaptiveEngine',
+    'table': 'blocktable.BlockTableEngine',
+    'parallel': 'parallel.ParallelEngine',
+}    # type: Dict[str, str]
+
+
+def get_engine_class(name: str) -> type:
+    """Return the engine class registered as `name`.
+
+    Args:
+        name: a name of the engine
+
+    Returns:
+        the engine class
+    """
+    if name not in ENGINES:
+        raise ValueError("{} is not an engine (available: {})".format(name, ', '.join(sorted(ENGINES))))
+
+    module_name, class_name = ENGINES[name].split('.')
+    if __package__:
+        module = importlib.import_module('.' + module_name, __package__)
+    else:
+        # imported as a top-level module when running `src/game_of_life.py`
+        module = importlib.import_module(module_name)
+
+    return getattr(module, class_name)
@@ -0,0 +1,321 @@
+from typing import Iterable, List, Optional, Union
+
+try:
+    from .engines import apply_rule_to_counts, as_index_array, import_numpy
+    from .life import Life
+    from .rules import CONWAY, Rule, parse_rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from engines import apply_rule_to_counts, as_index_array, import_numpy
+    from life import Life
+    from rules import CONWAY, Rule, parse_rule
+
+
+class Ensemble:
+    """Many independent boards of the same size, stepped together by one vectorized step (requires numpy).
+
+    Active boards are rows of a 3-D uint8 array of cells, so a generation of every board is a few numpy operations
+    instead of a Python loop per board. A board whose state repeats with a period up to `max_period` (e.g. every board
+    which died out or became a still life, for the period 1) is retired: it stops changing, and it is not stepped
+    anymore once enough boards are retired to compact the rest. Cells outside of a board are regarded as dead.
+
+    Attributes:
+        num_of_boards: the number of boards
+        width: a width of every board
+        height: a height of every board
+        rule: the rule stepping every board
+        max_period: boards repeating a state after this number of generations or less are retired (0 retires none)
+        generation: the number of generations stepped
+        is_active: bool array, True for boards which are not retired
+        retired_at: int64 array of the generation at which each board was retired (-1 for active boards)
+        periods: int8 array of the period each board was retired with (0 for active boards)
+    """
+    DEFAULT_MAX_PERIOD = 2
+    COMPACT_RATIO = 0.75    # retired boards are dropped from the stepped rows once this ratio of rows is active
+
+    num_of_boards = None
+    width = None
+    height = None
+    rule = CONWAY
+    max_period = None
+    generation = None
+    is_active = None
+    retired_at = None
+    periods = None
+
+    def __init__(self, boards, rule: Union[Rule, str, None] = None, max_period: int = DEFAULT_MAX_PERIOD):
+        """Create an ensemble from an array of shape (boards, height, width) (or a sequence of 2D arrays), where
+        nonzero cells are alive.
+        """
+        np = self._np = import_numpy()
+        if max_period < 0:
+            raise ValueError("The maximum period should not be negative ({})".format(max_period))
+
+        cells = (np.asarray(boards) != 0).view(np.uint8)
+        if cells.ndim != 3:
+            raise ValueError("Boards should be an array of 3 dimensions ({})".format(cells.shape))
+        self.num_of_boards, self.height, self.width = cells.shape
+        if rule is not None:
+            self.rule = parse_rule(rule) if isinstance(rule, str) else rule
+        self.max_period = max_period
+        self.generation = 0
+
+        self.is_active = np.ones(self.num_of_boards, dtype=bool)
+        self.retired_at = np.full(self.num_of_boards, -1, dtype=np.int64)
+        self.periods = np.zeros(self.num_of_boards, dtype=np.int8)
+
+        # states of the current and the `max_period` previous generations of stepped rows, as a ring
+        self._states = [np.ascontiguousarray(cells)] + [None] * max_period
+        self._current = 0
+        self._num_of_known_states = 1
+        # the board of each stepped row, and whether the board of the row is still active
+        self._board_ids = np.arange(self.num_of_boards)
+        self._is_row_active = np.ones(self.num_of_boards, dtype=bool)
+        # the row of each board, -1 once it is dropped from the stepped rows
+        self._rows = np.arange(self.num_of_boards)
+        # states of retired boards, allocated when the first one is retired
+        self._retired_boards = None
+        self._populations = None
+        self._populations_generation = None
+        self._allocate_buffers(self.num_of_boards)
+
+    @classmethod
+    def from_alive_indices(cls,
+                           width: int,
+                           height: int,
+                           boards: Iterable[Iterable[int]],
+                           rule: Union[Rule, str, None] = None,
+                           max_period: int = DEFAULT_MAX_PERIOD) -> 'Ensemble':
+        """Create an ensemble from flat indices (`row * width + column`) of alive cells of each board.
+        """
+        np = import_numpy()
+        boards = list(boards)
+        cells = np.zeros((len(boards), height * width), dtype=np.uint8)
+        for i, alive_indices in enumerate(boards):
+            cells[i, as_index_array(np, alive_indices)] = 1
+        return cls(cells.reshape(len(boards), height, width), rule=rule, max_period=max_period)
+
+    @classmethod
+    def random(cls,
+               num_of_boards: int,
+               width: int,
+               height: int,
+               density: float = 0.5,
+               seed: Optional[int] = None,
+               rule: Union[Rule, str, None] = None,
+               max_period: int = DEFAULT_MAX_PERIOD) -> 'Ensemble':
+        """Create an ensemble of random soups, where each cell is alive with the probability `density`.
+        """
+        np = import_numpy()
+        cells = np.random.RandomState(seed).random_sample((num_of_boards, height, width)) < density
+        return cls(cells, rule=rule, max_period=max_period)
+
+    def _allocate_buffers(self, num_of_rows: int):
+        np = self._np
+        shape = (num_of_rows, self.height, self.width)
+        self._horizontal_sums = np.empty(shape, dtype=np.uint8)
+        self._sums = np.empty(shape, dtype=np.uint8)
+        self._born = np.empty(shape, dtype=bool)
+        self._survived = np.empty(shape, dtype=bool)
+
+    @property
+    def num_of_active_boards(self) -> int:
+        return int(self._np.count_nonzero(self.is_active))
+
+    def get_board(self, index: int):
+        """Return the cells of a board, as a view which is not copied.
+
+        The cells of an active board are only valid until the next generation.
+
+        Args:
+            index: the index of the board
+
+        Returns:
+            uint8 array of shape (height, width), 1 for alive cells
+        """
+        if not self.is_active[index]:
+            return self._retired_boards[index]
+        return self._states[self._current][self._rows[index]]
+
+    @property
+    def boards(self):
+        """Cells of every board, as an array of shape (boards, height, width).
+
+        Until a board is retired, this is the array stepped in place and nothing is copied. Afterwards, active boards
+        are copied into the array of retired boards every time this is read.
+        """
+        current = self._states[self._current]
+        if self._retired_boards is None:
+            return current
+
+        rows = self._is_row_active.nonzero()[0]
+        self._retired_boards[self._board_ids[rows]] = current[rows]
+        return self._retired_boards
+
+    @property
+    def populations(self):
+        """The number of alive cells of each board, as an int64 array computed once per generation.
+        """
+        np = self._np
+        if self._populations_generation != self.generation:
+            if self._populations is None:
+                self._populations = np.zeros(self.num_of_boards, dtype=np.int64)
+            rows = self._is_row_active.nonzero()[0]
+            current = self._states[self._current]
+            if len(rows) < len(current):
+                current = current[rows]
+            self._populations[self._board_ids[rows]] = self._get_row_populations(current)
+            self._populations_generation = self.generation
+        return self._populations
+
+    def _get_row_populations(self, cells):
+        return cells.reshape(len(cells), self.width * self.height).sum(axis=1, dtype=self._np.int64)
+
+    def to_life(self, index: int, engine: str = Life.DEFAULT_ENGINE) -> Life:
+        """Create a game from the current cells of a board, e.g. to inspect an interesting soup.
+
+        Args:
+            index: the index of the board, which should be at least of the minimum size of `Life`
+            engine: name of the engine stepping the game
+
+        Returns:
+            the game at the generation of the board
+        """
+        game = Life.from_array(self.get_board(index), engine=engine, rule=self.rule)
+        game.generation = int(self.retired_at[index]) if not self.is_active[index] else self.generation
+        return game
+
+    def _count(self, cells):
+        """Return the sum of the 3x3 neighborhood of every cell, including the cell itself.
+        """
+        np = self._np
+        horizontal_sums = self._horizontal_sums
+        np.copyto(horizontal_sums, cells)
+        horizontal_sums[:, :, 1:] += cells[:, :, :-1]
+        horizontal_sums[:, :, :-1] += cells[:, :, 1:]
+
+        sums = self._sums
+        np.copyto(sums, horizontal_sums)
+        sums[:, 1:] += horizontal_sums[:, :-1]
+        sums[:, :-1] += horizontal_sums[:, 1:]
+        return sums
+
+    def _step_rows(self, cells, out):
+        """Write the next generation of `cells` to `out`.
+        """
+        np = self._np
+        sums = self._count(cells)
+        if self.rule.is_conway:
+            # with the cell itself in the sum, a cell is alive with 3, or with 4 if it is alive
+            born, survived = self._born, self._survived
+            np.equal(sums, 3, out=born)
+            np.equal(sums, 4, out=survived)
+            np.logical_and(survived, cells, out=survived)
+            np.logical_or(born, survived, out=out.view(bool))
+            return
+
+        np.subtract(sums, cells, out=sums)
+        np.copyto(out, apply_rule_to_counts(np, self.rule, cells, sums))
+
+    def _get_changed_rows(self, cells, other):
+        """Return a bool array, True for rows whose cells differ between two states.
+        """
+        np = self._np
+        num_of_rows = len(cells)
+        if (self.width * self.height) % 8 == 0:
+            # compare 8 cells at once
+            return (cells.reshape(num_of_rows, -1).view(np.uint64)
+                    != other.reshape(num_of_rows, -1).view(np.uint64)).any(axis=1)
+        return (cells != other).reshape(num_of_rows, -1).any(axis=1)
+
+    def proceed_generation(self):
+        """Proceed every active board one generation, and retire boards which repeated a previous state.
+        """
+        self.generation += 1
+        if not self._is_row_active.any():
+            return
+
+        np = self._np
+        current = self._states[self._current]
+        if self.max_period == 0:
+            # the previous state is not kept, so the ring has a single buffer written after stepping
+            out = np.empty_like(current)
+            self._step_rows(current, out)
+            self._states[0] = out
+            return
+
+        following = (self._current + 1) % len(self._states)
+        out = self._states[following]
+        if out is None or out.shape != current.shape:
+            out = self._states[following] = np.empty_like(current)
+        self._step_rows(current, out)
+        self._current = following
+        self._num_of_known_states = min(self._num_of_known_states + 1, len(self._states))
+
+        self._retire_repeated_rows()
+
+    def _retire_repeated_rows(self):
+        np = self._np
+        current = self._states[self._current]
+        # rows which repeated the state of `period` generations ago, with the shortest period first
+        repeated = np.zeros(len(current), dtype=bool)
+        periods = np.zeros(len(current), dtype=np.int8)
+        for period in range(1, self._num_of_known_states):
+            previous = self._states[(self._current - period) % len(self._states)]
+            is_repeated = ~self._get_changed_rows(current, previous) & self._is_row_active & ~repeated
+            periods[is_repeated] = period
+            repeated |= is_repeated
+
+        if not repeated.any():
+            return
+
+        rows = repeated.nonzero()[0]
+        board_ids = self._board_ids[rows]
+        if self._retired_boards is None:
+            self._retired_boards = np.zeros((self.num_of_boards, self.height, self.width), dtype=np.uint8)
+        self._retired_boards[board_ids] = current[rows]
+        if self._populations is None:
+            self._populations = np.zeros(self.num_of_boards, dtype=np.int64)
+        self._populations[board_ids] = self._get_row_populations(current[rows])
+        self.is_active[board_ids] = False
+        self.retired_at[board_ids] = self.generation
+        self.periods[board_ids] = periods[rows]
+        self._is_row_active[rows] = False
+
+        if np.count_nonzero(self._is_row_active) <= self.COMPACT_RATIO * len(self._is_row_active):
+            self._compact()
+
+    def _compact(self):
+        """Drop rows of retired boards from the stepped rows, so that they are not computed anymore.
+        """
+        np = self._np
+        rows = self._is_row_active.nonzero()[0]
+        for i in range(self._num_of_known_states):
+            index = (self._current - i) % len(self._states)
+            self._states[index] = np.ascontiguousarray(self._states[index][rows])
+        for i in range(self._num_of_known_states, len(self._states)):
+            self._states[(self._current - i) % len(self._states)] = None
+
+        self._rows[self._board_ids] = -1
+        self._board_ids = self._board_ids[rows]
+        self._rows[self._board_ids] = np.arange(len(rows))
+        self._is_row_active = np.ones(len(rows), dtype=bool)
+        self._allocate_buffers(len(rows))
+
+    def proceed_generations(self, num_of_generation: int):
+        """Proceed every active board `num_of_generation` generations.
+
+        Args:
+            num_of_generation: total number of generation to go
+        """
+        target = self.generation + num_of_generation
+        while self.generation < target:
+            if not self._is_row_active.any():
+                # every board is retired
+                self.generation = target
+                return
+            self.proceed_generation()
+
+    def get_alive_indices(self, index: int) -> List[int]:
+        """Return flat indices (`row * width + column`) of alive cells of a board.
+        """
+        return self._np.flatnonzero(self.get_board(index)).tolist()
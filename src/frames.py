@@ -0,0 +1,217 @@
+import os
+import queue
+import struct
+import threading
+import zlib
+
+from typing import List, Optional, Tuple
+
+try:
+    from .life import Life
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from life import Life
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+ANIMATION_EXTENSIONS = ('.png', '.apng')
+PALETTE = bytes((255, 255, 255, 0, 0, 0))    # dead cells are white, and alive ones are black
+
+# bytes with their bits in the reverse order, as bit-packed rows start from the least significant bit and PNG rows
+# from the most significant one
+_REVERSED_BITS = bytes(int('{:08b}'.format(value)[::-1], 2) for value in range(256))
+
+
+def _get_scaling_tables(scale: int) -> List[bytes]:
+    """Return `scale` translation tables, where the table `k` gives the byte `k` of a byte whose every bit is repeated
+    `scale` times.
+    """
+    tables = []
+    for k in range(scale):
+        table = bytearray(256)
+        for value in range(256):
+            for bit in range(8):
+                # the bit `bit` of the output byte `k` (from the most significant one) repeats this input bit
+                if value & (0x80 >> ((k * 8 + bit) // scale)):
+                    table[value] |= 0x80 >> bit
+        tables.append(bytes(table))
+    return tables
+
+
+def _chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+
+class FrameWriter:
+    """Write generations of a game as PNG images, or as frames of an animated PNG, from a background thread.
+
+    Taking a frame only copies the bit-packed rows of the board, and the writer thread scales, compresses and writes
+    it, so stepping mostly does not wait on encoding (zlib releases the GIL while it compresses). Up to `max_pending`
+    frames wait for the writer, after which taking a frame waits for it, as frames are never dropped.
+
+    If `path` ends with `.png` or `.apng`, frames are written to a single animated PNG (APNG), whose number of frames
+    is written when it is closed. Otherwise, `path` is a directory where every frame is a PNG image named after its
+    generation. Images have a cell per `scale` x `scale` pixels in 1 bit per pixel.
+
+    Attributes:
+        path: the animated PNG, or the directory of images
+        every: take a frame when the generation is a multiple of this
+        scale: the number of pixels of a side of a cell
+        delay_ms: time each frame of an animation is shown
+        is_animation: True if frames are written to a single animated PNG
+        num_of_frames: number of frames written
+        last_generation: the generation of the last frame taken
+    """
+    DEFAULT_DELAY_MS = 100
+
+    path = None
+    every = None
+    scale = None
+    delay_ms = None
+    is_animation = None
+    num_of_frames = None
+    last_generation = None
+
+    def __init__(self,
+                 path: str,
+                 every: int = 1,
+                 scale: int = 1,
+                 delay_ms: int = DEFAULT_DELAY_MS,
+                 max_pending: int = 16):
+        if every < 1:
+            raise ValueError("every should be positive ({})".format(every))
+        if scale < 1:
+            raise ValueError("scale should be positive ({})".format(scale))
+
+        self.path = path
+        self.every = every
+        self.scale = scale
+        self.delay_ms = delay_ms
+        self.is_animation = path.lower().endswith(ANIMATION_EXTENSIONS)
+        self.num_of_frames = 0
+        if self.is_animation:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        else:
+            os.makedirs(path, exist_ok=True)
+
+        self._scaling_tables = _get_scaling_tables(scale) if scale > 1 else None
+        self._fp = None
+        self._header = None    # the image header of the first frame of the animation
+        self._num_of_frames_offset = None    # where the number of frames of the animation is written
+        self._sequence_number = 0
+        self._error = None
+        self._frames = queue.Queue(maxsize=max_pending)
+        self._writer = threading.Thread(target=self._write_frames, name='frame-writer', daemon=True)
+        self._writer.start()
+
+    def update(self, game: Life):
+        """Take a frame of `game` if it is due, called after each step.
+        """
+        if game.generation % self.every == 0 and game.generation != self.last_generation:
+            self.take(game)
+
+    def take(self, game: Life):
+        """Copy the current generation of `game`, to be written by the writer thread.
+        """
+        self._raise_error()
+        rows = game.get_bitpacked_rows()
+        # rows may be the board of the engine, which changes in the next generation
+        data = rows.astype('<u8').tobytes() if hasattr(rows, 'astype') else bytes(rows)
+        self.last_generation = game.generation
+        self._frames.put((game.generation, game.grid_width, game.grid_height, data))
+
+    def close(self):
+        """Wait for pending frames to be written, and stop the writer thread.
+
+        Raises:
+            the error of the writer thread, if writing a frame failed
+        """
+        self._frames.put(None)
+        self._writer.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write_frames(self):
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                break
+            if self._error is not None:
+                # frames are still taken from the queue, so that taking a frame never waits forever
+                continue
+
+            try:
+                self._write(*frame)
+            except Exception as e:
+                self._error = e
+
+        try:
+            if self._fp is not None:
+                self._finish_animation()
+        except Exception as e:
+            self._error = self._error or e
+
+    def _encode(self, width: int, height: int, data: bytes) -> Tuple[bytes, bytes]:
+        """Return the header and the compressed image data of a frame, from bit-packed rows.
+        """
+        scale = self.scale
+        num_of_row_bytes = len(data) // height
+        num_of_pixel_bytes = (width * scale + 7) // 8
+        lines = []
+        for row in range(height):
+            cells = data[row * num_of_row_bytes:row * num_of_row_bytes + (width + 7) // 8].translate(_REVERSED_BITS)
+            if scale > 1:
+                pixels = bytearray(len(cells) * scale)
+                for k, table in enumerate(self._scaling_tables):
+                    pixels[k::scale] = cells.translate(table)
+                cells = bytes(pixels[:num_of_pixel_bytes])
+            # each line starts with the filter type, 0 for none
+            lines.extend([b'\0' + cells] * scale)
+
+        # 1 bit per pixel of a palette of 2 colors
+        header = struct.pack('>IIBBBBB', width * scale, height * scale, 1, 3, 0, 0, 0)
+        return header, zlib.compress(b''.join(lines))
+
+    def _write(self, generation: int, width: int, height: int, data: bytes):
+        header, compressed = self._encode(width, height, data)
+        if not self.is_animation:
+            path = os.path.join(self.path, 'generation_{:08d}.png'.format(generation))
+            with open(path, 'wb') as fp:
+                fp.write(PNG_SIGNATURE + _chunk(b'IHDR', header) + _chunk(b'PLTE', PALETTE)
+                         + _chunk(b'IDAT', compressed) + _chunk(b'IEND', b''))
+            self.num_of_frames += 1
+            return
+
+        if self._fp is None:
+            self._fp = open(self.path, 'wb')
+            self._fp.write(PNG_SIGNATURE + _chunk(b'IHDR', header))
+            # the number of frames (written when the animation is finished), and 0 to play it forever
+            self._num_of_frames_offset = self._fp.tell()
+            self._fp.write(_chunk(b'acTL', struct.pack('>II', 0, 0)) + _chunk(b'PLTE', PALETTE))
+            self._header = header
+
+        if header != self._header:
+            raise Exception("Frames of an animation should have the same size ({}).".format(generation))
+
+        # every frame covers the whole image, shown for `delay_ms` milliseconds
+        frame_control = struct.pack('>IIIIIHHBB', self._sequence_number, width * self.scale, height * self.scale,
+                                    0, 0, self.delay_ms, 1000, 0, 0)
+        self._fp.write(_chunk(b'fcTL', frame_control))
+        self._sequence_number += 1
+        if self.num_of_frames == 0:
+            # the first frame is the image shown by viewers without animations
+            self._fp.write(_chunk(b'IDAT', compressed))
+        else:
+            self._fp.write(_chunk(b'fdAT', struct.pack('>I', self._sequence_number) + compressed))
+            self._sequence_number += 1
+        self.num_of_frames += 1
+
+    def _finish_animation(self):
+        self._fp.write(_chunk(b'IEND', b''))
+        self._fp.seek(self._num_of_frames_offset)
+        self._fp.write(_chunk(b'acTL', struct.pack('>II', self.num_of_frames, 0)))
+        self._fp.close()
+        self._fp = None
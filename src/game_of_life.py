@@ -1,12 +1,55 @@
 import argparse
+import contextlib
+import operator
+import os
+import random
+import re
+import sys
 
+from array import array
 from enum import Enum
-from typing import List
+from typing import Dict, List, Optional, TextIO, Tuple
 
-from life import CellIndex, Life
+try:
+    from .checkpoint import Checkpointer, clear_checkpoints, load_latest_checkpoint
+    from .engines import ENGINES, import_numpy
+    from .frames import FrameWriter
+    from .history import History
+    from .life import CellIndex, Life
+    from .metrics import MetricsRecorder, Profiler
+    from .patterns import read_macrocell, read_rle, write_macrocell, write_rle
+    from .renderer import RENDERERS, FullRenderer, Renderer
+    from .rules import CONWAY, Rule, parse_rule
+    from .snapshot import load_snapshot, write_snapshot
+except (ImportError, SystemError):    # run as a script from `src`
+    from checkpoint import Checkpointer, clear_checkpoints, load_latest_checkpoint
+    from engines import ENGINES, import_numpy
+    from frames import FrameWriter
+    from history import History
+    from life import CellIndex, Life
+    from metrics import MetricsRecorder, Profiler
+    from patterns import read_macrocell, read_rle, write_macrocell, write_rle
+    from renderer import RENDERERS, FullRenderer, Renderer
+    from rules import CONWAY, Rule, parse_rule
+    from snapshot import load_snapshot, write_snapshot
 
 
 FILE_FOLDER = 'shared_folder'
+RESULT_FOLDER = 'batch_results'    # results of `--batch` under `FILE_FOLDER`
+CHECKPOINT_FOLDER = 'checkpoints'    # checkpoints of each input file under `FILE_FOLDER`
+SNAPSHOT_EXTENSION = '.snap'
+
+# readers and writers of pattern formats by the file extension, other files are in the format of `FileParser`
+PATTERN_READERS = {'.rle': read_rle, '.mc': read_macrocell}
+PATTERN_WRITERS = {'.rle': write_rle, '.mc': write_macrocell}
+
+# extensions of the dumped file by `--format`
+DUMP_EXTENSIONS = {'text': '.txt', 'binary': SNAPSHOT_EXTENSION, 'rle': '.rle', 'macrocell': '.mc'}
+
+# alive cell index data lines which `FileParser._parse_alive_cell_line` accepts, read with the same values: two
+# integers (short enough for int64) separated by a single space, with ASCII whitespace around them
+_ALIVE_CELL_LINE = r'[ \t\r\f\v]*[+-]?[0-9]{1,18} [+-]?[0-9]{1,18}[ \t\r\f\v]*'
+_ALIVE_CELL_LINES = re.compile('(?:{0}\n)*{0}'.format(_ALIVE_CELL_LINE))
 
 
 class Menu(Enum):
@@ -14,6 +57,9 @@ class Menu(Enum):
     NEXT_N = 2
     DUMP_RESULT = 3
     QUIT = 4
+    PREVIOUS = 5
+    PREVIOUS_N = 6
+    JUMP = 7
 
     @staticmethod
     def get_text_description(value: 'Menu') -> str:
@@ -33,6 +79,12 @@ class Menu(Enum):
             return "Dump the current generation to a file"
         elif value == Menu.QUIT:
             return "Quit"
+        elif value == Menu.PREVIOUS:
+            return "Go back to the previous generation"
+        elif value == Menu.PREVIOUS_N:
+            return "Go back N generations"
+        elif value == Menu.JUMP:
+            return "Go to a recent generation"
         else:
             raise ValueError("{} is not an option".format(value))
 
@@ -42,137 +94,494 @@ class FileParser:
 
     A file has the following format (every value is separated by the white space):
     `
-    grid_height grid_width
+    grid_height grid_width [rule]
     total_number_of_alive_cells
     row_index_of_first_alive_cell column_index_of_first_alive_cell
     row_index_of_second_alive_cell column_index_of_second_alive_cell
     ...
     `
+
+    The rule is optional, in the B/S notation (e.g. `B36/S23`), and Conway's game of life is played without it.
+
+    Parsed alive cells are kept as flat indices (`row * grid_width + column`) in `alive_indices`, and `alive_cells`
+    creates `CellIndex` objects only when it is read.
+
+    Files with an extension in `PATTERN_READERS` and `PATTERN_WRITERS` are in the RLE or the Macrocell format instead,
+    and their pattern is placed at the top left corner of a board of at least the minimum size of `Life` (or where it
+    was, for a Macrocell file recording its board).
     """
     grid_width = None
     grid_height = None
-    alive_cells = None
+    alive_indices = None
+    rule = None    # the rule of the file, None if it does not have one
+    _alive_cells = None
+
+    CHUNK_SIZE = 1 << 20    # number of characters read at once
 
-    def __init__(self, grid_width: int = None, grid_height: int = None, alive_cells: List[CellIndex] = None):
+    def __init__(self,
+                 grid_width: int = None,
+                 grid_height: int = None,
+                 alive_cells: List[CellIndex] = None,
+                 alive_indices: List[int] = None,
+                 rule: Optional[Rule] = None):
         self.grid_width = grid_width
         self.grid_height = grid_height
-        self.alive_cells = alive_cells
+        self._alive_cells = alive_cells
+        self.alive_indices = alive_indices
+        self.rule = rule
+
+    @property
+    def alive_cells(self) -> List[CellIndex]:
+        if self._alive_cells is None and self.alive_indices is not None:
+            self._alive_cells = [CellIndex(*divmod(index, self.grid_width)) for index in self.alive_indices]
+        return self._alive_cells
+
+    @alive_cells.setter
+    def alive_cells(self, value: List[CellIndex]):
+        self._alive_cells = value
+        self.alive_indices = None
 
     def dump_grid_to_file(self, file_name: str = 'result_dump.txt'):
         """Write the information to a file
         
         Args:
-            file_name (str): name of the file        
+            file_name (str): name of the file, whose extension selects the format (`.txt` is added to an unknown one)
         """
-        if (self.grid_width is None or self.grid_height is None or self.alive_cells is None):
+        if os.path.splitext(file_name)[1] not in PATTERN_WRITERS and file_name.split('.')[-1] != 'txt':
+            file_name = file_name + '.txt'
+
+        self.write_to_file(FILE_FOLDER + '/{}'.format(file_name))
+
+    def write_to_file(self, path: str):
+        """Write the information to the file at `path`, in the format selected by its extension.
+
+        Args:
+            path: a path of the file
+        """
+        if (self.grid_width is None or self.grid_height is None
+                or (self._alive_cells is None and self.alive_indices is None)):
             raise Exception(
                 "All attributes must be set: (grid_width: {}, grid_height: {}, alive_cells: {})".format(
                     self.grid_width, self.grid_height, self.alive_cells))
 
-        if file_name.split('.')[-1] != 'txt':
-            file_name = file_name + '.txt'
+        writer = PATTERN_WRITERS.get(os.path.splitext(path)[1])
+        if writer is not None:
+            alive_indices = self.alive_indices
+            if alive_indices is None:
+                alive_indices = [cell.row * self.grid_width + cell.column for cell in self.alive_cells]
+            with open(path, 'w+') as fp:
+                writer(fp, self.grid_width, self.grid_height, alive_indices, rule=self.rule or CONWAY)
+            return
+
+        with open(path, 'w+') as fp:
+            if self.rule is None or self.rule.is_conway:
+                # files of Conway's game of life are kept readable by older versions
+                fp.write("{} {}\n".format(self.grid_height, self.grid_width))
+            else:
+                fp.write("{} {} {}\n".format(self.grid_height, self.grid_width, self.rule))
+            if self.alive_indices is not None:
+                fp.write("{}\n".format(len(self.alive_indices)))
+                fp.writelines("{} {}\n".format(*divmod(index, self.grid_width)) for index in self.alive_indices)
+            else:
+                fp.write("{}\n".format(len(self.alive_cells)))
+                fp.writelines("{} {}\n".format(cell.row, cell.column) for cell in self.alive_cells)
+
+    @staticmethod
+    def resolve_path(file_name: str) -> str:
+        """Return the path of `file_name`, looked up under `FILE_FOLDER` first.
 
-        with open(FILE_FOLDER + '/{}'.format(file_name), 'w+') as fp:
-            fp.write("{} {}\n".format(self.grid_height, self.grid_width))
-            fp.write("{}\n".format(len(self.alive_cells)))
-            for cell in self.alive_cells:
-                fp.write("{} {}\n".format(cell.row, cell.column))
+        Args:
+            file_name: a name of the file under `FILE_FOLDER`, or any path
+
+        Returns:
+            the path to open
+        """
+        path = os.path.join(FILE_FOLDER, file_name)
+        if os.path.exists(path):
+            return path
+        return file_name
 
     def parse_from_file(self, file_name: str = 'input.txt'):
         """Set attributes' values from the file `file_name`.
         
         Args:
-            file_name: a name of the file to read from
+            file_name: a name of the file under `FILE_FOLDER`, any path, or `-` to read from stdin
         """
-        with open(FILE_FOLDER + '/{}'.format(file_name)) as fp:
-            contents = fp.readlines()
-
-        num_of_initial_alive_cells = -1
-        alive_cells = []
-        for content in contents:
-            tokens = content.strip().split(' ')
-            if tokens:                
-                if self.grid_width is None:
-                    if not len(tokens) == 2:
-                        raise Exception("The first data line is not in the correct format ({}).".format(content[:-1]))
-
-                    try:
-                        self.grid_height = int(tokens[0])
-                        self.grid_width = int(tokens[1])
-                    except ValueError:
-                        raise Exception("The first data line is not in the correct format ({}).".format(content[:-1]))
-                
-                elif num_of_initial_alive_cells == -1:
-                    if not len(tokens) == 1:
-                        raise Exception("The second data line is not in the correct format ({}).".format(content[:-1]))
-
-                    try:
-                        num_of_initial_alive_cells = int(tokens[0])
-                    except ValueError:
-                        raise Exception("The second data line is not in the correct format ({}).".format(content[:-1]))
-
-                else:
-                    if not len(tokens) == 2:
-                        raise Exception(
-                            "The initial alive cell index data line is not in the correct format ({}).".format(
-                                content[:-1]))
-
-                    try:
-                        alive_cells.append(CellIndex(int(tokens[0]),int(tokens[1])))
-                    except ValueError:
-                        raise Exception(
-                            "The initial alive cell index data line is not in the correct format ({}).".format(
-                                content[:-1]))
-
-                    if len(alive_cells) == num_of_initial_alive_cells:
-                        self.alive_cells = alive_cells
-                        # ignore the rest of lines
-                        return
+        if file_name == '-':
+            self.parse_from_stream(sys.stdin)
+            return
+
+        reader = PATTERN_READERS.get(os.path.splitext(file_name)[1])
+        with open(self.resolve_path(file_name)) as fp:
+            if reader is not None:
+                self.grid_height, self.grid_width, self.alive_indices, self.rule = reader(
+                    fp, Life.MIN_GRID_WIDTH, Life.MIN_GRID_HEIGHT)
+                self._alive_cells = None
+            else:
+                self.parse_from_stream(fp)
+
+    @staticmethod
+    def _parse_alive_cell_line(content: str) -> Tuple[int, int]:
+        """Return the row and the column of an alive cell index data line.
+        """
+        tokens = content.strip().split(' ')
+        try:
+            if len(tokens) == 2:
+                return int(tokens[0]), int(tokens[1])
+        except ValueError:
+            pass
+
+        raise Exception(
+            "The initial alive cell index data line is not in the correct format ({}).".format(content.rstrip('\n')))
+
+    @staticmethod
+    def _parse_alive_cell_lines_with_numpy(np, block: str, num_of_lines: int):
+        """Convert alive cell index data lines to a numpy array in a single vectorized pass.
+
+        Returns:
+            rows and columns interleaved, or None unless every line is exactly two integers (of up to 18 digits, with
+            an optional sign) separated by a single space
+        """
+        try:
+            chars = np.frombuffer(block.encode('ascii'), dtype=np.uint8)
+        except UnicodeEncodeError:
+            return None
+        if not len(chars):
+            return None
+
+        is_digit = (chars >= ord('0')) & (chars <= ord('9'))
+        is_sign = (chars == ord('+')) | (chars == ord('-'))
+        is_space = chars == ord(' ')
+        is_new_line = chars == ord('\n')
+        # characters before and after each one, where the block starts and ends with a new line
+        is_digit_before = np.concatenate(([False], is_digit[:-1]))
+        is_separator_before = np.concatenate(([True], is_space[:-1] | is_new_line[:-1]))
+        is_digit_after = np.concatenate((is_digit[1:], [False]))
+        is_number_after = np.concatenate((is_digit[1:] | is_sign[1:], [False]))
+
+        # a sign starts a token, and a space or a new line follows a digit, so no token is empty
+        if not is_digit[-1] or not (
+                is_digit
+                | (is_sign & is_separator_before & is_digit_after)
+                | (is_space & is_digit_before & is_number_after)
+                | (is_new_line & is_digit_before)).all():
+            return None
+
+        # every line has exactly one space, so it has exactly two tokens
+        line_of_each_space = np.cumsum(is_new_line)[is_space]
+        if not (np.bincount(line_of_each_space, minlength=num_of_lines) == 1).all():
+            return None
+
+        # every number fits in int64
+        non_digits = np.flatnonzero(~is_digit)
+        if np.diff(np.concatenate(([-1], non_digits, [len(chars)]))).max() > 19:
+            return None
+
+        return np.fromstring(block, dtype=np.int64, sep=' ')
+
+    def _parse_alive_cell_lines(self, lines: List[str], np=None):
+        """Return rows and columns of alive cell index data lines.
+
+        Well formed lines are converted in one pass over all of their tokens (vectorized if numpy is given). A chunk
+        with any other line is parsed line by line, which reports the first malformed line.
+
+        Returns:
+            rows and columns, as numpy arrays if numpy is given or as `array` otherwise
+        """
+        block = '\n'.join(lines)
+        values = None
+        if np is not None:
+            values = self._parse_alive_cell_lines_with_numpy(np, block, len(lines))
+
+        if values is None and lines and _ALIVE_CELL_LINES.fullmatch(block):
+            # e.g. lines with whitespace around them, or without numpy
+            values = array('q', map(int, block.split()))
+
+        if values is None:
+            values = array('q')
+            for content in lines:
+                values.extend(self._parse_alive_cell_line(content))
+
+        return values[0::2], values[1::2]
+
+    def _check_bounds(self, rows, columns, lines: List[str]):
+        """Check every alive cell index is inside of the grid.
+        """
+        if not len(rows):
+            return
+
+        if hasattr(rows, 'min'):
+            # numpy arrays
+            low_row, high_row, low_col, high_col = rows.min(), rows.max(), columns.min(), columns.max()
+        else:
+            low_row, high_row, low_col, high_col = min(rows), max(rows), min(columns), max(columns)
+
+        if low_row >= 0 and high_row < self.grid_height and low_col >= 0 and high_col < self.grid_width:
+            return
+
+        for content, row, col in zip(lines, rows, columns):
+            if not (0 <= row < self.grid_height and 0 <= col < self.grid_width):
+                raise Exception("The initial alive cell index data line is out of the grid ({}).".format(
+                    content.rstrip('\n')))
+
+    def parse_from_stream(self, fp: TextIO):
+        """Set attributes' values from a text stream, which is read in chunks.
+
+        Args:
+            fp: a stream to read from
+        """
+        content = fp.readline()
+        if not content:
+            return
+
+        tokens = content.strip().split(' ')
+        if not 2 <= len(tokens) <= 3:
+            raise Exception("The first data line is not in the correct format ({}).".format(content.rstrip('\n')))
+        try:
+            self.grid_height = int(tokens[0])
+            self.grid_width = int(tokens[1])
+        except ValueError:
+            raise Exception("The first data line is not in the correct format ({}).".format(content.rstrip('\n')))
+        if len(tokens) == 3:
+            try:
+                self.rule = parse_rule(tokens[2])
+            except ValueError:
+                raise Exception("The rule is not supported ({}).".format(tokens[2]))
+
+        content = fp.readline()
+        if not content:
+            return
+
+        tokens = content.strip().split(' ')
+        if not len(tokens) == 1:
+            raise Exception("The second data line is not in the correct format ({}).".format(content.rstrip('\n')))
+        try:
+            num_of_initial_alive_cells = int(tokens[0])
+        except ValueError:
+            raise Exception("The second data line is not in the correct format ({}).".format(content.rstrip('\n')))
+
+        try:
+            np = import_numpy()
+        except ImportError:
+            np = None
+
+        alive_indices = []
+        remaining = num_of_initial_alive_cells
+        rest = ''
+        while remaining > 0:
+            chunk = fp.read(self.CHUNK_SIZE)
+            if chunk:
+                # keep the last line which may be cut in the middle for the next chunk
+                lines = (rest + chunk).split('\n')
+                rest = lines.pop()
+                if not lines:
+                    continue
+            elif rest:
+                lines = [rest]
+                rest = ''
+            else:
+                break
+
+            # ignore the rest of lines
+            lines = lines[:remaining]
+            remaining -= len(lines)
+
+            rows, columns = self._parse_alive_cell_lines(lines, np)
+            self._check_bounds(rows, columns, lines)
+            # `row * grid_width + column` for every cell, without a Python level loop
+            if np is not None and isinstance(rows, np.ndarray):
+                alive_indices.extend((rows * self.grid_width + columns).tolist())
+            else:
+                alive_indices.extend(map(operator.add, map(self.grid_width.__mul__, rows), columns))
+
+        if num_of_initial_alive_cells > 0 and remaining == 0:
+            self.alive_indices = alive_indices
+
+
+def load_game(file_name: str,
+              engine: str = Life.DEFAULT_ENGINE,
+              engine_options: Optional[Dict] = None,
+              rule: Optional[Rule] = None) -> Life:
+    """Create a game from a file in any of the supported formats, selected by its extension.
+
+    Args:
+        file_name: a name of the file under `FILE_FOLDER`, or any path
+        engine: name of the engine stepping the board
+        engine_options: keyword arguments given to the engine
+        rule: the rule stepping the board, which overrides the rule of the file (Conway's if neither is given)
+
+    Returns:
+        the initialized game
+    """
+    if file_name.endswith(SNAPSHOT_EXTENSION):
+        return load_snapshot(FileParser.resolve_path(file_name), engine=engine, engine_options=engine_options,
+                             rule=rule)
+
+    fp = FileParser()
+    fp.parse_from_file(file_name)
+    game = Life(engine=engine, engine_options=engine_options, rule=rule or fp.rule)
+    game.init_grid_from_indices(fp.grid_width, fp.grid_height, fp.alive_indices or [])
+    return game
+
+
+def dump_game(game: Life, path: str, dump_format: str = 'text'):
+    """Write the current generation of `game` to `path`.
+
+    Args:
+        game: the game to record
+        path: a path of the file, whose extension should match `dump_format`
+        dump_format: a key of `DUMP_EXTENSIONS`
+    """
+    if dump_format == 'binary':
+        write_snapshot(path, game)
+        return
+
+    # cells are sorted, so that a game gives the same file whatever the order of cells in its engine is
+    fp = FileParser(grid_width=game.grid_width, grid_height=game.grid_height,
+                    alive_indices=sorted(game.get_alive_indices()), rule=game.rule)
+    fp.write_to_file(path)
+
 
-        
 class StdoutInterface:
     """An interface for the game of life on Stdout
     """
     cur_game = None
     valid_menu = None
+    engine = None
+    engine_options = None
+    dump_format = None
+    renderer = None
+    metrics = None
+    profiler = None
+    checkpointer = None
+    frame_writer = None
+    history_budget = None
+    rule = None
+    detect_cycles = True
 
-    def __init__(self):
+    def __init__(self,
+                 engine: str = Life.DEFAULT_ENGINE,
+                 engine_options: Optional[Dict] = None,
+                 dump_format: str = 'text',
+                 renderer: Optional[Renderer] = None,
+                 metrics: Optional[MetricsRecorder] = None,
+                 profiler: Optional[Profiler] = None,
+                 checkpointer: Optional[Checkpointer] = None,
+                 history_budget: int = History.DEFAULT_BUDGET_BYTES,
+                 rule: Optional[Rule] = None,
+                 frame_writer: Optional[FrameWriter] = None,
+                 detect_cycles: bool = True):
+        self.engine = engine
+        self.engine_options = engine_options
+        self.dump_format = dump_format
+        self.renderer = renderer or FullRenderer()
+        self.metrics = metrics
+        self.profiler = profiler
+        self.checkpointer = checkpointer
+        self.history_budget = history_budget
+        self.rule = rule
+        self.frame_writer = frame_writer
+        self.detect_cycles = detect_cycles
         self.valid_menu = set(v.value for v in Menu.__members__.values())
 
+        if profiler is not None:
+            profiler.instrument(self.renderer, 'render', 'render')
+            profiler.instrument(self, '_dump_game_to_file', 'dump')
+
+    def _set_game(self, game: Life):
+        """Make `game` the current game, recording its metrics and profiling its steps if they are asked for.
+        """
+        self.cur_game = game
+        game.detect_cycles = self.detect_cycles
+        if self.metrics is not None:
+            game.enable_metrics(self.metrics)
+        if self.profiler is not None:
+            self.profiler.instrument(game, 'proceed_generation', 'step')
+            self.profiler.instrument(game, 'proceed_generations', 'step')
+
     def print_board(self):
         """Show the board's status to Stdout
-        
-        Args:
-            cur_life: Current game status instance
         """
-        print()
-        print("Generation: {}".format(self.cur_game.generation))
-        separator_str = "===" * self.cur_game.grid_width
-        print(separator_str)
-        
-        for cur_row in self.cur_game.grid:
-            print("  ".join(['o' if cur_col else 'x' for cur_col in cur_row]))
-        
-        print(separator_str)
+        self.renderer.start()
+        self.renderer.render(self.cur_game, is_last=True)
 
     def process_generation(self, num_of_generation: int = 1):
         """Process the game for num_of_generation
-        
+
+        Every generation is handed to the renderer, which may skip some of them, to the checkpointer and to the frame
+        writer.
+
         Args:
             num_of_generation: total number of generation to go
         """
-        for _ in range(num_of_generation):
+        self.renderer.start()
+        target = self.cur_game.generation + num_of_generation
+        is_repeating = False
+        while self.cur_game.generation < target:
+            if self.cur_game.can_jump or self.cur_game.period is not None:
+                # intermediate generations are never computed or only repeat, so go to the last one directly
+                is_repeating = self.cur_game.period is not None
+                self._jump_generations(target)
+                break
+
             self.cur_game.proceed_generation()
-            self.print_board()
+            self._update_writers()
+            if self.cur_game.generation < target:
+                self.renderer.render(self.cur_game)
+
+        self.renderer.render(self.cur_game, is_last=True)
+        if is_repeating:
+            print("The board repeats every {} generations since the generation {}.".format(
+                self.cur_game.period, self.cur_game.period_start))
+
+    def _jump_generations(self, target: int):
+        """Jump to the generation `target`, stopping at every generation a checkpoint or a frame is taken at.
+        """
+        intervals = []
+        if self.checkpointer is not None and self.checkpointer.every is not None:
+            intervals.append(self.checkpointer.every)
+        if self.frame_writer is not None:
+            intervals.append(self.frame_writer.every)
+
+        while self.cur_game.generation < target:
+            num_of_generation = target - self.cur_game.generation
+            for every in intervals:
+                num_of_generation = min(num_of_generation, every - self.cur_game.generation % every)
+
+            self.cur_game.proceed_generations(num_of_generation)
+            self._update_writers()
+
+    def _update_writers(self):
+        """Hand the current generation to the checkpointer and the frame writer, which take it if it is due.
+        """
+        if self.checkpointer is not None:
+            self.checkpointer.update(self.cur_game)
+        if self.frame_writer is not None:
+            self.frame_writer.update(self.cur_game)
+
+    def go_to_generation(self, generation: int):
+        """Go back (or forward) to a generation kept in the history of the game, and show it.
+
+        Args:
+            generation: the generation to go to
+        """
+        history = self.cur_game.history
+        if history is None or generation not in history:
+            if history is None or not len(history):
+                print("No generation is kept to go to.")
+            else:
+                print("The generation {} is not kept (kept: {} to {}).".format(
+                    generation, history.oldest_generation, history.newest_generation))
+            return
+
+        self.cur_game.rewind(generation)
+        self.print_board()
 
     def _dump_game_to_file(self):
-        """Record current game status to a file.
+        """Record current game status to a file, in the text format or as a binary snapshot.
         """
-        fp = FileParser(grid_width=self.cur_game.grid_width,
-                        grid_height=self.cur_game.grid_height,
-                        alive_cells=self.cur_game.alive_cells)
-        file_name = 'result_dump.txt'
-        fp.dump_grid_to_file(file_name)
+        file_name = 'result_dump' + DUMP_EXTENSIONS[self.dump_format]
+        dump_game(self.cur_game, os.path.join(FILE_FOLDER, file_name), self.dump_format)
         print("Alive cells for the {}th generation are recorded on {}".format(self.cur_game.generation, file_name))
 
     def process_menu(self, chosen: int) -> bool:
@@ -201,6 +610,26 @@ class StdoutInterface:
         elif chosen == Menu.DUMP_RESULT.value:
             self._dump_game_to_file()
 
+        elif chosen == Menu.PREVIOUS.value:
+            self.go_to_generation(self.cur_game.generation - 1)
+
+        elif chosen in (Menu.PREVIOUS_N.value, Menu.JUMP.value):
+            if chosen == Menu.PREVIOUS_N.value:
+                user_input = input("Number of generations to go back:")
+            else:
+                history = self.cur_game.history
+                if history is not None and len(history):
+                    print("Kept generations: {} to {}".format(history.oldest_generation, history.newest_generation))
+                user_input = input("Generation to go to:")
+
+            try:
+                number = int(user_input.strip())
+            except ValueError:
+                print("Unknown menu has chosen.")
+                return True
+
+            self.go_to_generation(self.cur_game.generation - number if chosen == Menu.PREVIOUS_N.value else number)
+
         elif chosen ==Menu.QUIT.value:
             return False
         
@@ -235,25 +664,46 @@ class StdoutInterface:
     def start_new_game(self, 
                        grid_width: int = None, 
                        grid_height: int = None, 
-                       alive_cells: List[CellIndex] = None):
+                       alive_cells: List[CellIndex] = None,
+                       density: Optional[float] = None,
+                       seed: Optional[int] = None,
+                       alive_indices: Optional[List[int]] = None,
+                       game: Optional[Life] = None):
         """Start the new game of life in the interactive mode (where user input is required).
 
         Args:
             grid_width: the grid width
             grid_height the grid height
             init_alive_cells: list of initial alive cells
+            density: probability of a cell to be alive when cells are randomly assigned
+            seed: seed of the random board, which is chosen and shown if not given
+            alive_indices: flat indices (`row * grid_width + column`) of initial alive cells, instead of alive_cells
+            game: an already initialized game (e.g. loaded from a snapshot), instead of every other argument
         """
         print("Starting the new game...")
-        self.cur_game = Life()
-        self.cur_game.start_game(grid_width=grid_width, grid_height=grid_height, init_alive_cells=alive_cells)
+        if game is None:
+            if not alive_cells and not alive_indices:
+                if seed is None:
+                    seed = random.randrange(2 ** 32)
+                print("Random seed: {}".format(seed))
+
+            game = Life(engine=self.engine, engine_options=self.engine_options, rule=self.rule)
+            game.start_game(grid_width=grid_width, grid_height=grid_height, init_alive_cells=alive_cells,
+                            density=density, seed=seed, init_alive_indices=alive_indices)
+        self._set_game(game)
+        if self.history_budget:
+            self.cur_game.enable_history(budget_bytes=self.history_budget)
         self.print_board()
         self.select_menu()
+        self.cur_game.close()
 
     def start_new_game_not_interactive(self,
                                        grid_width: int,
                                        grid_height: int, 
                                        alive_cells: List[CellIndex],
-                                       number_of_generations: int):
+                                       number_of_generations: int,
+                                       alive_indices: Optional[List[int]] = None,
+                                       game: Optional[Life] = None):
         """Start the new game of the life and dump the result of the game to a file.
         
         Args:
@@ -261,12 +711,21 @@ class StdoutInterface:
             grid_height the grid height
             init_alive_cells: list of initial alive cells
             number_of_generations: number of generations to process before dump the result to a file
+            alive_indices: flat indices (`row * grid_width + column`) of initial alive cells, instead of alive_cells
+            game: an already initialized game (e.g. loaded from a snapshot), instead of the grid and alive cells
         """
         print("Starting the new game...")
-        self.cur_game = Life()
-        self.cur_game.start_game(grid_width=grid_width, grid_height=grid_height, init_alive_cells=alive_cells)
+        if game is None:
+            game = Life(engine=self.engine, engine_options=self.engine_options, rule=self.rule)
+            game.start_game(grid_width=grid_width, grid_height=grid_height, init_alive_cells=alive_cells,
+                            init_alive_indices=alive_indices)
+        self._set_game(game)
+        if self.frame_writer is not None:
+            # the first frame is the initial board
+            self.frame_writer.update(self.cur_game)
         self.process_generation(num_of_generation=number_of_generations)
         self._dump_game_to_file()
+        self.cur_game.close()
         
 
 if __name__ == '__main__':
@@ -277,13 +736,174 @@ if __name__ == '__main__':
         nargs='*', 
         type=str,
         help=("1) If no argument is given, then the game start with random size and the initial alive cells. "
-              "2) The first argument should be the file name containing the status of the initial game. "
+              "2) The first argument should be the file name containing the status of the initial game "
+              "(`-` reads it from stdin, a `.snap` file is loaded as a binary snapshot, and `.rle` and `.mc` files "
+              "as patterns in the RLE and the Macrocell format). "
               "3) The second argument represent the number of generation to process before dump the result to the file."
               " e.g. `python game_of_life.py input.txt 10`"
         )
     )
-    
-    args = parser.parse_args().args
+    parser.add_argument(
+        '--engine',
+        default=Life.DEFAULT_ENGINE,
+        choices=[Life.DEFAULT_ENGINE] + sorted(ENGINES),
+        help="The engine stepping the board (default: {})".format(Life.DEFAULT_ENGINE)
+    )
+    parser.add_argument(
+        '--rule',
+        help=("The Life-like rule in the B/S notation, e.g. `B36/S23` for HighLife, which overrides the rule of the "
+              "input file (default: B3/S23, Conway's game of life)")
+    )
+    parser.add_argument(
+        '--max-nodes',
+        type=int,
+        help="The maximum number of quadtree nodes kept by the hashlife engine, which collects garbage when it is full"
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help="The number of worker processes of the parallel engine (default: number of CPUs)"
+    )
+
+    parser.add_argument(
+        '--format',
+        default='text',
+        choices=sorted(DUMP_EXTENSIONS),
+        help=("The format of the dumped result: a text line per alive cell, a binary snapshot, or a pattern in the "
+              "RLE or the Macrocell format (default: text)")
+    )
+
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help=("Run every input file of a directory or a glob pattern (the first argument) for the number of generations "
+              "(the second argument) without showing them, and write their results under `{}/{}`").format(
+                  FILE_FOLDER, RESULT_FOLDER)
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help="The number of processes running boards of --batch (default: number of CPUs)"
+    )
+
+    parser.add_argument(
+        '--render',
+        default='full',
+        choices=sorted(RENDERERS),
+        help=("How boards are shown: `full` prints every board, `diff` redraws changed cells in place, and `quiet` "
+              "only prints the last board of each run (default: full)")
+    )
+    parser.add_argument(
+        '--max-fps',
+        type=float,
+        help="The maximum number of boards shown per second, where generations in between are not shown"
+    )
+
+    parser.add_argument(
+        '--checkpoint-every',
+        type=int,
+        metavar='K',
+        help="Write a checkpoint every K generations in the non-interactive mode, to be resumed by --resume"
+    )
+    parser.add_argument(
+        '--checkpoint-seconds',
+        type=float,
+        metavar='T',
+        help="Write a checkpoint every T seconds in the non-interactive mode, to be resumed by --resume"
+    )
+    parser.add_argument(
+        '--checkpoint-dir',
+        help="The directory of checkpoints (default: `{}/{}/` and the name of the input file)".format(
+            FILE_FOLDER, CHECKPOINT_FOLDER)
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help=("Continue the non-interactive mode from the latest valid checkpoint of a previous run with the same "
+              "arguments, instead of the beginning")
+    )
+
+    parser.add_argument(
+        '--history-mb',
+        type=float,
+        default=History.DEFAULT_BUDGET_BYTES / (1 << 20),
+        help=("The memory in MB kept for recent generations, which the interactive mode can go back to (default: "
+              "{:g}, 0 disables it)").format(History.DEFAULT_BUDGET_BYTES / (1 << 20))
+    )
+
+    parser.add_argument(
+        '--metrics',
+        metavar='FILE',
+        help=("A file to write the wall time, population, births, deaths and neighbor counts of every generation to, "
+              "as a JSON line per generation")
+    )
+    parser.add_argument(
+        '--metrics-every',
+        type=int,
+        default=1,
+        metavar='N',
+        help="Only record every Nth generation to --metrics (default: 1)"
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        help=("Profile the run with cProfile, and write the statistics of parsing, stepping, rendering and dumping to "
+              "FILE (and the raw statistics of each of them to FILE.<phase>.prof)")
+    )
+    parser.add_argument(
+        '--frames',
+        metavar='PATH',
+        help=("Write generations of the non-interactive mode as images while it runs: an animated PNG if PATH ends "
+              "with `.png` or `.apng`, or a PNG image per generation in the directory PATH otherwise")
+    )
+    parser.add_argument(
+        '--frames-every',
+        type=int,
+        default=1,
+        metavar='N',
+        help="Only write every Nth generation to --frames (default: 1)"
+    )
+    parser.add_argument(
+        '--frame-scale',
+        type=int,
+        default=1,
+        metavar='S',
+        help="The number of pixels of a side of a cell in --frames (default: 1)"
+    )
+    parser.add_argument(
+        '--frame-delay',
+        type=int,
+        default=FrameWriter.DEFAULT_DELAY_MS,
+        metavar='MS',
+        help="Milliseconds each frame of an animated PNG is shown (default: {})".format(FrameWriter.DEFAULT_DELAY_MS)
+    )
+    parser.add_argument(
+        '--no-cycle-detection',
+        action='store_true',
+        help=("Do not fingerprint every generation to detect a repeating board, which otherwise skips the repeated "
+              "generations once it is found")
+    )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help="Log events of the run to stderr, such as switches between engines of the adaptive engine"
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help="The seed of the random board, to reproduce a previous game"
+    )
+    parser.add_argument(
+        '--density',
+        type=float,
+        help="The probability of a cell to be alive in the random board (default: random up to {})".format(
+            Life.MAX_RANDOM_DENSITY)
+    )
+
+    parsed_args = parser.parse_args()
+    args = parsed_args.args
     input_file_name = None
     number_of_generations = None
     if args:
@@ -294,31 +914,156 @@ if __name__ == '__main__':
             except ValueError:
                 raise Exception("The second argument should be a number ({})".format(args[1]))
 
-    interface = StdoutInterface()
+    if parsed_args.verbose:
+        import logging
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    engine_options = {}
+    if parsed_args.max_nodes is not None:
+        if parsed_args.engine != 'hashlife':
+            parser.error("--max-nodes is only used by the hashlife engine")
+        engine_options['max_nodes'] = parsed_args.max_nodes
+    if parsed_args.workers is not None:
+        if parsed_args.engine != 'parallel':
+            parser.error("--workers is only used by the parallel engine")
+        engine_options['workers'] = parsed_args.workers
+
+    rule = None
+    if parsed_args.rule is not None:
+        try:
+            rule = parse_rule(parsed_args.rule)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if parsed_args.batch:
+        if input_file_name is None or number_of_generations is None:
+            parser.error("--batch needs input files and the number of generations")
+
+        try:
+            from .batch import find_input_files, print_summary, run_batch
+        except (ImportError, SystemError):
+            from batch import find_input_files, print_summary, run_batch
+
+        input_paths = find_input_files(input_file_name)
+        if not input_paths:
+            parser.error("No input file matches {}".format(input_file_name))
+
+        print_summary(run_batch(input_paths, number_of_generations, os.path.join(FILE_FOLDER, RESULT_FOLDER),
+                                engine=parsed_args.engine, engine_options=engine_options,
+                                dump_format=parsed_args.format, jobs=parsed_args.jobs, rule=rule,
+                                detect_cycles=not parsed_args.no_cycle_detection))
+        sys.exit(0)
+
+    if parsed_args.history_mb < 0:
+        parser.error("--history-mb should not be negative")
+    if parsed_args.metrics_every < 1:
+        parser.error("--metrics-every should be positive")
+    metrics = None
+    if parsed_args.metrics:
+        metrics = MetricsRecorder.open(parsed_args.metrics, sample_every=parsed_args.metrics_every)
+    profiler = Profiler() if parsed_args.profile else None
+
+    checkpoint_dir = None
+    is_checkpointing = parsed_args.checkpoint_every is not None or parsed_args.checkpoint_seconds is not None
+    if is_checkpointing or parsed_args.resume:
+        if number_of_generations is None:
+            parser.error("Checkpoints are only taken in the non-interactive mode")
+        checkpoint_dir = parsed_args.checkpoint_dir or os.path.join(
+            FILE_FOLDER, CHECKPOINT_FOLDER, os.path.splitext(os.path.basename(input_file_name))[0])
+
+    interface = StdoutInterface(
+        engine=parsed_args.engine,
+        engine_options=engine_options,
+        dump_format=parsed_args.format,
+        renderer=RENDERERS[parsed_args.render](max_fps=parsed_args.max_fps),
+        metrics=metrics,
+        profiler=profiler,
+        history_budget=int(parsed_args.history_mb * (1 << 20)),
+        detect_cycles=not parsed_args.no_cycle_detection)
     grid_width = None
     grid_height = None
-    alive_cells = None
-    
-    if input_file_name:
-        fp = FileParser()
-        fp.parse_from_file(input_file_name)
-        grid_width = fp.grid_width
-        grid_height = fp.grid_height
-        alive_cells = fp.alive_cells
-
-    if number_of_generations is not None:
-        interface.start_new_game_not_interactive(
-            grid_width=grid_width,
-            grid_height=grid_height,
-            alive_cells=alive_cells,
-            number_of_generations=number_of_generations
-        )
-    
-    else:
-        interface.start_new_game(
-            grid_width=grid_width,
-            grid_height=grid_height,
-            alive_cells=alive_cells
-        )
+    alive_indices = None
+    game = None
+
+    with (profiler.phase('parse') if profiler is not None else contextlib.suppress()):
+        if input_file_name and input_file_name.endswith(SNAPSHOT_EXTENSION):
+            game = load_snapshot(FileParser.resolve_path(input_file_name), engine=parsed_args.engine,
+                                 engine_options=engine_options, rule=rule)
+            # the rule given by `--rule` overrides the one of the snapshot
+            rule = game.rule
+
+        elif input_file_name:
+            fp = FileParser()
+            fp.parse_from_file(input_file_name)
+            grid_width = fp.grid_width
+            grid_height = fp.grid_height
+            alive_indices = fp.alive_indices
+            # the rule given by `--rule` overrides the one of the file
+            rule = rule or fp.rule
+
+    interface.rule = rule
+
+    if parsed_args.resume:
+        checkpoint = load_latest_checkpoint(checkpoint_dir, engine=parsed_args.engine, engine_options=engine_options)
+        if checkpoint is None:
+            print("No checkpoint is found in {}, starting from the beginning.".format(checkpoint_dir))
+        else:
+            if checkpoint.rule != (rule or CONWAY):
+                parser.error("The checkpoint was written under another rule ({}, given: {})".format(
+                    checkpoint.rule, rule or CONWAY))
+            # the run ends at the same generation as the one it resumes
+            target = (game.generation if game is not None else 0) + number_of_generations
+            if checkpoint.generation > target:
+                parser.error("The checkpoint is beyond the last generation ({})".format(checkpoint.generation))
+
+            print("Resuming from the generation {}.".format(checkpoint.generation))
+            if game is not None:
+                game.close()
+            game = checkpoint
+            number_of_generations = target - checkpoint.generation
+
+    if parsed_args.frames:
+        if number_of_generations is None:
+            parser.error("Frames are only written in the non-interactive mode")
+        if parsed_args.frames_every < 1 or parsed_args.frame_scale < 1:
+            parser.error("--frames-every and --frame-scale should be positive")
+        interface.frame_writer = FrameWriter(parsed_args.frames, every=parsed_args.frames_every,
+                                             scale=parsed_args.frame_scale, delay_ms=parsed_args.frame_delay)
+
+    if is_checkpointing:
+        if not parsed_args.resume:
+            clear_checkpoints(checkpoint_dir)
+        interface.checkpointer = Checkpointer(
+            checkpoint_dir, every=parsed_args.checkpoint_every, seconds=parsed_args.checkpoint_seconds)
+
+    try:
+        if number_of_generations is not None:
+            interface.start_new_game_not_interactive(
+                grid_width=grid_width,
+                grid_height=grid_height,
+                alive_cells=None,
+                number_of_generations=number_of_generations,
+                alive_indices=alive_indices,
+                game=game
+            )
+
+        else:
+            interface.start_new_game(
+                grid_width=grid_width,
+                grid_height=grid_height,
+                density=parsed_args.density,
+                seed=parsed_args.seed,
+                alive_indices=alive_indices,
+                game=game
+            )
+    finally:
+        if interface.checkpointer is not None:
+            interface.checkpointer.close()
+        if interface.frame_writer is not None:
+            interface.frame_writer.close()
+        if metrics is not None:
+            metrics.close()
+        if profiler is not None:
+            profiler.write(parsed_args.profile)
 
     
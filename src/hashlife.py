@@ -0,0 +1,332 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .engines import Engine
+    from .rules import Rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from engines import Engine
+    from rules import Rule
+
+
+DEAD = 0
+ALIVE = 1
+WALL = 2    # a cell outside of the grid, which is always dead and never becomes alive
+
+
+class _TableFull(Exception):
+    """Raised when the node table reaches `HashlifeEngine.max_nodes` in the middle of a jump.
+    """
+
+
+class Node:
+    """A square of 2^level x 2^level cells in the quadtree.
+
+    Nodes are canonicalized by `HashlifeEngine`, so two nodes holding the same cells are the same object.
+
+    Attributes:
+        level: the node covers 2^level x 2^level cells
+        nw, ne, sw, se: quadrants of the node (None for a single cell)
+        value: state of a single cell (`DEAD`, `ALIVE` or `WALL`), only used when level is 0
+        population: number of alive cells
+        results: memoized results of `HashlifeEngine.advance_node` by the exponent of generations
+    """
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'value', 'population', 'results')
+
+    def __init__(self, level: int, nw: 'Node' = None, ne: 'Node' = None, sw: 'Node' = None, se: 'Node' = None,
+                 value: int = DEAD):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.value = value
+        self.results = None
+
+        if level == 0:
+            self.population = 1 if value == ALIVE else 0
+        else:
+            self.population = nw.population + ne.population + sw.population + se.population
+
+
+class HashlifeEngine(Engine):
+    """An engine running Hashlife, which can jump 2^k generations in one step.
+
+    The board is embedded in a quadtree padded with `WALL` cells, so the edges of the grid behave exactly as in the
+    other engines. Nodes are canonicalized in a hash table and results are memoized on the nodes.
+
+    Attributes:
+        max_nodes: the maximum number of nodes in the table. A jump which fills the table is started again with half
+            the generations once the table is garbage collected, so only a jump of a single generation, whose nodes
+            are needed anyway, may grow the table over it
+        stats: number of nodes in the table, number of garbage collections, and number of jumps split to stay under
+            `max_nodes`
+        MIN_LEVEL: the smallest level of the root node
+    """
+    name = 'hashlife'
+    can_jump = True
+    max_nodes = None
+    stats = None
+    MIN_LEVEL = 3
+    DEFAULT_MAX_NODES = 4000000
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 alive_indices: Iterable[int],
+                 rule: Optional[Rule] = None,
+                 max_nodes: int = DEFAULT_MAX_NODES):
+        super().__init__(width, height, alive_indices, rule)
+        self.max_nodes = max_nodes
+        self.stats = {'nodes': 0, 'garbage_collections': 0, 'split_jumps': 0}
+        self._node_limit = None    # `max_nodes` while a jump may be split, None otherwise
+
+        self._table = {}    # type: Dict[Tuple[Node, Node, Node, Node], Node]
+        self._leaves = {value: Node(0, value=value) for value in (DEAD, ALIVE, WALL)}
+        self._dead = [self._leaves[DEAD]]
+        self._wall = [self._leaves[WALL]]
+
+        # the grid has to fit in the center of the root, which covers a half of its width
+        level = self.MIN_LEVEL
+        while 2 ** (level - 1) < max(width, height):
+            level += 1
+
+        # position of the top left cell of the grid in the root
+        self._offset = 2 ** (level - 2)
+        cells = [divmod(index, width) for index in alive_indices]
+        self._root = self._build(level, -self._offset, -self._offset, cells)
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Return the canonical node made of four quadrants.
+        """
+        key = (nw, ne, sw, se)
+        node = self._table.get(key)
+        if node is None:
+            if self._node_limit is not None and len(self._table) >= self._node_limit:
+                raise _TableFull()
+            node = self._table[key] = Node(nw.level + 1, nw, ne, sw, se)
+        return node
+
+    def _uniform(self, nodes: List[Node], level: int) -> Node:
+        """Return the node of `level` filled with the leaf `nodes[0]`.
+        """
+        while len(nodes) <= level:
+            child = nodes[-1]
+            nodes.append(self._join(child, child, child, child))
+        return nodes[level]
+
+    def _build(self, level: int, top: int, left: int, cells: List[Tuple[int, int]]) -> Node:
+        """Build the node of `level` whose top left cell is (top, left) in grid coordinates.
+
+        Args:
+            level: level of the node
+            top: row of the top left cell
+            left: column of the top left cell
+            cells: alive cells (row, column) inside of the node
+        """
+        size = 2 ** level
+        if top >= self.height or left >= self.width or top + size <= 0 or left + size <= 0:
+            return self._uniform(self._wall, level)
+
+        if not cells and top >= 0 and left >= 0 and top + size <= self.height and left + size <= self.width:
+            return self._uniform(self._dead, level)
+
+        if level == 0:
+            if cells:
+                return self._leaves[ALIVE]
+            return self._leaves[DEAD]
+
+        half = size // 2
+        quadrants = ([], [], [], [])    # type: Tuple[List[Tuple[int, int]], ...]
+        for row, col in cells:
+            quadrants[(2 if row >= top + half else 0) + (1 if col >= left + half else 0)].append((row, col))
+
+        return self._join(
+            self._build(level - 1, top, left, quadrants[0]),
+            self._build(level - 1, top, left + half, quadrants[1]),
+            self._build(level - 1, top + half, left, quadrants[2]),
+            self._build(level - 1, top + half, left + half, quadrants[3]),
+        )
+
+    def _center(self, node: Node) -> Node:
+        """Return the center of `node`, covering a half of its width.
+        """
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _expand(self, node: Node) -> Node:
+        """Return the node one level higher, with `node` at the center and walls around it.
+        """
+        wall = self._uniform(self._wall, node.level - 1)
+        return self._join(
+            self._join(wall, wall, wall, node.nw),
+            self._join(wall, wall, node.ne, wall),
+            self._join(wall, node.sw, wall, wall),
+            self._join(node.se, wall, wall, wall),
+        )
+
+    def _step_base(self, node: Node) -> Node:
+        """Return the center 2x2 cells of the 4x4 `node` after one generation.
+        """
+        cells = [
+            [node.nw.nw.value, node.nw.ne.value, node.ne.nw.value, node.ne.ne.value],
+            [node.nw.sw.value, node.nw.se.value, node.ne.sw.value, node.ne.se.value],
+            [node.sw.nw.value, node.sw.ne.value, node.se.nw.value, node.se.ne.value],
+            [node.sw.sw.value, node.sw.se.value, node.se.sw.value, node.se.se.value],
+        ]
+
+        table = self.rule.neighborhood_table
+        res = []
+        for row in (1, 2):
+            for col in (1, 2):
+                if cells[row][col] == WALL:
+                    res.append(self._leaves[WALL])
+                    continue
+
+                # walls are dead neighbors
+                neighborhood = 0
+                for i in range(3):
+                    for j in range(3):
+                        if cells[row + i - 1][col + j - 1] == ALIVE:
+                            neighborhood |= 1 << (i * 3 + j)
+                res.append(self._leaves[ALIVE if table[neighborhood] else DEAD])
+
+        return self._join(*res)
+
+    def advance_node(self, node: Node, exponent: int) -> Node:
+        """Return the center of `node` after 2^exponent generations.
+
+        Args:
+            node: a node of level 2 or higher
+            exponent: log2 of the number of generations, at most `node.level - 2`
+
+        Returns:
+            the node one level lower than `node`
+        """
+        if node.population == 0:
+            # nothing can be born without alive cells, and walls never change
+            return self._center(node)
+
+        if node.results is not None and exponent in node.results:
+            return node.results[exponent]
+
+        if node.level == 2:
+            res = self._step_base(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            sub_nodes = [
+                nw,
+                self._join(nw.ne, ne.nw, nw.se, ne.sw),
+                ne,
+                self._join(nw.sw, nw.se, sw.nw, sw.ne),
+                self._center(node),
+                self._join(ne.sw, ne.se, se.nw, se.ne),
+                sw,
+                self._join(sw.ne, se.nw, sw.se, se.sw),
+                se,
+            ]
+
+            if exponent == node.level - 2:
+                # both halves of the jump are advanced
+                parts = [self.advance_node(sub_node, exponent - 1) for sub_node in sub_nodes]
+                inner_exponent = exponent - 1
+            else:
+                parts = [self._center(sub_node) for sub_node in sub_nodes]
+                inner_exponent = exponent
+
+            res = self._join(
+                self.advance_node(self._join(parts[0], parts[1], parts[3], parts[4]), inner_exponent),
+                self.advance_node(self._join(parts[1], parts[2], parts[4], parts[5]), inner_exponent),
+                self.advance_node(self._join(parts[3], parts[4], parts[6], parts[7]), inner_exponent),
+                self.advance_node(self._join(parts[4], parts[5], parts[7], parts[8]), inner_exponent),
+            )
+
+        if node.results is None:
+            node.results = {}
+        node.results[exponent] = res
+        return res
+
+    def collect_garbage(self):
+        """Drop every node unreachable from the root, along with all memoized results.
+        """
+        table = {}
+        stack = [self._root] + self._dead[1:] + self._wall[1:]
+        while stack:
+            node = stack.pop()
+            node.results = None
+            if node.level == 0:
+                continue
+
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in table:
+                table[key] = node
+                stack.extend(key)
+
+        self._table = table
+        self.stats['garbage_collections'] += 1
+
+    def advance(self, num_of_generation: int):
+        """Proceed `num_of_generation` generations by jumping the power of two generations at a time.
+
+        A jump which fills the node table (see `max_nodes`) is abandoned, and jumps of half the generations are taken
+        after collecting garbage, for the rest of this call.
+
+        Args:
+            num_of_generation: total number of generation to go
+        """
+        max_exponent = num_of_generation.bit_length()
+        while num_of_generation > 0:
+            exponent = min(num_of_generation.bit_length() - 1, max_exponent)
+            while self._root.level - 2 < exponent:
+                self._offset += 2 ** (self._root.level - 1)
+                self._root = self._expand(self._root)
+
+            # the root is only replaced once the jump is finished, so an abandoned jump changes nothing but the table
+            self._node_limit = self.max_nodes if exponent > 0 else None
+            try:
+                res = self.advance_node(self._root, exponent)
+            except _TableFull:
+                self.collect_garbage()
+                self.stats['split_jumps'] += 1
+                max_exponent = exponent - 1
+                continue
+            finally:
+                self._node_limit = None
+
+            self._root = self._expand(res)
+            num_of_generation -= 2 ** exponent
+
+            if len(self._table) > self.max_nodes:
+                self.collect_garbage()
+
+        self.stats['nodes'] = len(self._table)
+
+    def step(self):
+        self.advance(1)
+
+    def _collect_alive(self, node: Node, top: int, left: int, res: List[int]):
+        """Append flat indices of alive cells in `node` whose top left cell is (top, left) to `res`.
+        """
+        if node.population == 0:
+            return
+
+        if node.level == 0:
+            res.append(top * self.width + left)
+            return
+
+        half = 2 ** (node.level - 1)
+        self._collect_alive(node.nw, top, left, res)
+        self._collect_alive(node.ne, top, left + half, res)
+        self._collect_alive(node.sw, top + half, left, res)
+        self._collect_alive(node.se, top + half, left + half, res)
+
+    def get_alive_indices(self) -> List[int]:
+        res = []    # type: List[int]
+        self._collect_alive(self._root, -self._offset, -self._offset, res)
+        return sorted(res)
+
+    def get_grid(self) -> List[List[bool]]:
+        grid = [[False for _ in range(self.width)] for _ in range(self.height)]
+        for index in self.get_alive_indices():
+            row, col = divmod(index, self.width)
+            grid[row][col] = True
+
+        return grid
@@ -0,0 +1,176 @@
+from array import array
+from collections import deque
+from typing import Iterable, List, Optional, Set
+
+
+class _Segment:
+    """A keyframe and the deltas of the generations following it.
+
+    Attributes:
+        generation: the generation of the keyframe
+        keyframe: flat indices of alive cells at `generation`
+        births: cells born at each generation after `generation`
+        deaths: cells died at each generation after `generation`
+        num_of_bytes: memory taken by the arrays of this segment
+    """
+    __slots__ = ('generation', 'keyframe', 'births', 'deaths', 'num_of_bytes')
+
+    def __init__(self, generation: int, keyframe: array):
+        self.generation = generation
+        self.keyframe = keyframe
+        self.births = []    # type: List[array]
+        self.deaths = []    # type: List[array]
+        self.num_of_bytes = History.get_size(keyframe)
+
+    @property
+    def last_generation(self) -> int:
+        return self.generation + len(self.births)
+
+
+class History:
+    """Recent generations of a game, kept as keyframes of alive cells and the births and deaths since them.
+
+    Generations are kept in segments of a keyframe followed by at most `keyframe_every` deltas, in a ring buffer:
+    the oldest segments are dropped when the history takes more than `budget_bytes`. A generation is restored by
+    applying the deltas of its segment to the keyframe, so restoring takes at most `keyframe_every` deltas.
+
+    Attributes:
+        budget_bytes: the approximate memory the history may take
+        keyframe_every: the maximum number of deltas after a keyframe
+        num_of_bytes: memory taken by the history
+    """
+    DEFAULT_BUDGET_BYTES = 64 << 20
+    DEFAULT_KEYFRAME_EVERY = 64
+    ENTRY_OVERHEAD_BYTES = 64    # an array object, without its items
+
+    budget_bytes = None
+    keyframe_every = None
+    num_of_bytes = None
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES, keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        if budget_bytes <= 0 or keyframe_every < 1:
+            raise ValueError("The budget and the keyframe interval should be positive ({}, {})".format(
+                budget_bytes, keyframe_every))
+
+        self.budget_bytes = budget_bytes
+        self.keyframe_every = keyframe_every
+        self.num_of_bytes = 0
+        self._segments = deque()    # type: deque
+
+    @classmethod
+    def get_size(cls, indices: array) -> int:
+        """Return the approximate memory taken by an array of indices.
+        """
+        return cls.ENTRY_OVERHEAD_BYTES + len(indices) * indices.itemsize
+
+    @property
+    def oldest_generation(self) -> Optional[int]:
+        """The oldest generation kept, None if the history is empty.
+        """
+        return self._segments[0].generation if self._segments else None
+
+    @property
+    def newest_generation(self) -> Optional[int]:
+        """The newest generation kept, None if the history is empty.
+        """
+        return self._segments[-1].last_generation if self._segments else None
+
+    def __contains__(self, generation: int) -> bool:
+        return bool(self._segments) and self.oldest_generation <= generation <= self.newest_generation
+
+    def __len__(self) -> int:
+        return sum(len(segment.births) + 1 for segment in self._segments)
+
+    def clear(self):
+        """Forget every generation.
+        """
+        self._segments.clear()
+        self.num_of_bytes = 0
+
+    def needs_keyframe(self, generation: int) -> bool:
+        """Return True if `generation` should be added by `add_keyframe` instead of `add_delta`.
+        """
+        if not self._segments or generation != self.newest_generation + 1:
+            return True
+
+        segment = self._segments[-1]
+        # a segment is dropped as a whole, so a single one should not take most of the budget
+        return len(segment.births) >= self.keyframe_every or segment.num_of_bytes * 2 > self.budget_bytes
+
+    def add_keyframe(self, generation: int, alive_indices: Iterable[int]):
+        """Add a generation with all of its alive cells, after which deltas are added.
+
+        Generations from `generation` are replaced, and every generation is forgotten if `generation` does not follow
+        the ones kept.
+        """
+        if self._segments and self.oldest_generation < generation <= self.newest_generation + 1:
+            self.truncate(generation - 1)
+        else:
+            self.clear()
+
+        self._append(_Segment(generation, array('q', alive_indices)))
+
+    def add_delta(self, generation: int, births: Iterable[int], deaths: Iterable[int]):
+        """Add the generation following the newest one, with the cells born and died since it.
+        """
+        if not self._segments or generation != self.newest_generation + 1:
+            raise ValueError("The generation does not follow the history ({}, newest: {})".format(
+                generation, self.newest_generation))
+
+        segment = self._segments[-1]
+        births = array('q', births)
+        deaths = array('q', deaths)
+        segment.births.append(births)
+        segment.deaths.append(deaths)
+        num_of_bytes = self.get_size(births) + self.get_size(deaths)
+        segment.num_of_bytes += num_of_bytes
+        self.num_of_bytes += num_of_bytes
+        self._evict()
+
+    def truncate(self, generation: int):
+        """Forget generations after `generation`, to record different ones from it.
+        """
+        while self._segments and self._segments[-1].generation > generation:
+            self.num_of_bytes -= self._segments.pop().num_of_bytes
+
+        if self._segments:
+            segment = self._segments[-1]
+            num_of_deltas = generation - segment.generation
+            for births, deaths in zip(segment.births[num_of_deltas:], segment.deaths[num_of_deltas:]):
+                num_of_bytes = self.get_size(births) + self.get_size(deaths)
+                segment.num_of_bytes -= num_of_bytes
+                self.num_of_bytes -= num_of_bytes
+            del segment.births[num_of_deltas:]
+            del segment.deaths[num_of_deltas:]
+
+    def get_alive_indices(self, generation: int) -> List[int]:
+        """Restore alive cells of a generation kept in the history.
+
+        Args:
+            generation: a generation between `oldest_generation` and `newest_generation`
+
+        Returns:
+            flat indices of alive cells
+        """
+        if generation not in self:
+            raise ValueError("The generation is not in the history ({}, kept: {}-{})".format(
+                generation, self.oldest_generation, self.newest_generation))
+
+        segment = next(segment for segment in reversed(self._segments) if segment.generation <= generation)
+        alive = set(segment.keyframe)    # type: Set[int]
+        for births, deaths in zip(segment.births[:generation - segment.generation],
+                                  segment.deaths[:generation - segment.generation]):
+            alive.difference_update(deaths)
+            alive.update(births)
+
+        return sorted(alive)
+
+    def _append(self, segment: _Segment):
+        self._segments.append(segment)
+        self.num_of_bytes += segment.num_of_bytes
+        self._evict()
+
+    def _evict(self):
+        # the newest segment is always kept, to continue from the current generation
+        while self.num_of_bytes > self.budget_bytes and len(self._segments) > 1:
+            self.num_of_bytes -= self._segments.popleft().num_of_bytes
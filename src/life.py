@@ -1,12 +1,73 @@
+import math
 import random
+import time
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    from .engines import (
+        as_index_array, count_alive_neighbors_by_index, get_engine_class, import_numpy, pack_bitpacked_indices,
+        unpack_bitpacked_indices)
+    from .history import History
+    from .rules import CONWAY, Rule, parse_rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from engines import (
+        as_index_array, count_alive_neighbors_by_index, get_engine_class, import_numpy, pack_bitpacked_indices,
+        unpack_bitpacked_indices)
+    from history import History
+    from rules import CONWAY, Rule, parse_rule
+
+
+MASK_64 = (1 << 64) - 1
+
+
+def get_zobrist_key(index: int) -> int:
+    """Return the 64 bit random key of the cell at the flat index `index` (splitmix64 of the index).
+    """
+    key = (index + 0x9E3779B97F4A7C15) & MASK_64
+    key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return key ^ (key >> 31)
+
+
+def get_fingerprint(alive_indices) -> int:
+    """Return the Zobrist hash of a state, the XOR of keys of its alive cells.
+
+    As a cell toggles its key in and out, the hash of the next generation is the hash of the current one XOR keys of
+    cells which were born or died.
+
+    Args:
+        alive_indices: flat indices of alive cells
+
+    Returns:
+        the 64 bit fingerprint
+    """
+    res = 0
+    if len(alive_indices) < 1024:
+        for index in alive_indices:
+            res ^= get_zobrist_key(index)
+        return res
+
+    try:
+        np = import_numpy()
+    except ImportError:
+        for index in alive_indices:
+            res ^= get_zobrist_key(index)
+        return res
+
+    # the same computation on every index at once, where uint64 arithmetic wraps around
+    keys = as_index_array(np, alive_indices).astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    keys = (keys ^ (keys >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    keys = (keys ^ (keys >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    keys ^= keys >> np.uint64(31)
+    return int(np.bitwise_xor.reduce(keys))
 
-from typing import Dict, List, Optional, Tuple
 
 class CellIndex:
     """A class for a cell's coordinate
     """
-    row = None
-    column = None
+    # no instance dict, which keeps millions of cells affordable
+    __slots__ = ('row', 'column')
 
     def __init__(self, row, column):
         self.row = row
@@ -23,7 +84,8 @@ class CellIndex:
         return NotImplemented
 
     def __hash__(self):
-        return hash((self.row, self.column))
+        # avoid building a tuple on every dictionary lookup
+        return (self.row << 32) ^ self.column
 
     def __repr__(self):
         return 'CellIndex({}, {})'.format(self.row, self.column)
@@ -37,23 +99,230 @@ class Life:
         grid_height: a height of the grid
         alive_cells: list of indices of alive cells in the current generation
         generation: current generation number
+        engine: name of the engine stepping the board (`dict` is the built-in one)
+        engine_options: keyword arguments given to the engine
+        rule: the rule stepping the board (Conway's B3/S23 by default)
+        period: the number of generations after which the state repeats, None until a repetition is detected
+        period_start: the first generation of the repeating states, None until a repetition is detected
+        detect_cycles: False to skip fingerprinting generations, which disables the detection of `period`
+        metrics: the recorder of generations set by `enable_metrics`, None while metrics are disabled
+        history: recent generations to go back to set by `enable_history`, None if they are not kept
         MIN_GRID_WIDTH: minimum width of the grid
         MIN_GRID_HEIGHT minimum height of the grid
         MAX_GRID_SIZE: maximum width|height of the grid
+        MAX_RANDOM_DENSITY: maximum density of alive cells when the density is randomly chosen
+        MAX_FINGERPRINTS: the number of fingerprints kept to find a repetition, which bounds the detected period
     """
-    grid = None
     grid_width = None
     grid_height = None
-    alive_cells = None
     generation = None
+    engine = None
+    engine_options = None
+    rule = CONWAY
+    period = None
+    period_start = None
+    detect_cycles = True
+    metrics = None
+    history = None
+    DEFAULT_ENGINE = 'dict'
 
     # TODO: change the size limit to the actual specification
     MIN_GRID_WIDTH = 80
     MIN_GRID_HEIGHT = 40
     MAX_GRID_SIZE = 200    # set a cap for the random generation
+    MAX_RANDOM_DENSITY = 0.25
+    MAX_FINGERPRINTS = 1 << 16
+
+    _grid = None
+    _alive_indices = None    # flat indices (`row * grid_width + column`) stepped by the built-in engine
+    _alive_cells = None    # `CellIndex` objects of `_alive_indices`, created when they are asked for
+    _engine = None
+    _fingerprint = None    # fingerprint of the current generation
+    _fingerprints = None    # the first generation by fingerprint
+    _cycle_candidate = None    # (generation, period, alive indices) of a repetition yet to be verified
+    _last_step = None    # the return value of the last `_step_with_dict` while metrics are enabled
+    _is_keeping_delta = False    # True while `iter_generations` asks for the cells born and died
+    _last_delta = None    # cells born and died in the last generation, kept while `_is_keeping_delta`
+
+    def __init__(self,
+                 engine: str = DEFAULT_ENGINE,
+                 engine_options: Optional[Dict] = None,
+                 rule: Union[Rule, str, None] = None):
+        if engine != self.DEFAULT_ENGINE:
+            # fail fast on an unknown engine name
+            get_engine_class(engine)
 
-    def __init__(self):
         self.generation = 0
+        self.engine = engine
+        self.engine_options = engine_options or {}
+        if rule is not None:
+            self.rule = parse_rule(rule) if isinstance(rule, str) else rule
+
+    @property
+    def can_jump(self) -> bool:
+        """True if `proceed_generations` skips intermediate generations instead of stepping through them.
+        """
+        return self._engine is not None and self._engine.can_jump
+
+    @property
+    def grid(self):
+        """Status of each cell, which can be read as `grid[row][column]`.
+        """
+        if self._engine is None:
+            return self._grid
+        return self._engine.get_grid()
+
+    @grid.setter
+    def grid(self, value):
+        if self._engine is not None:
+            raise AttributeError("The grid is managed by the {} engine".format(self.engine))
+        self._grid = value
+
+    @property
+    def alive_cells(self) -> List[CellIndex]:
+        """List of indices of alive cells in the current generation.
+        """
+        if self._engine is None:
+            if self._alive_cells is None and self._alive_indices is not None:
+                self._alive_cells = [CellIndex(*divmod(index, self.grid_width)) for index in self._alive_indices]
+            return self._alive_cells
+        return [CellIndex(*divmod(index, self.grid_width)) for index in self._engine.get_alive_indices()]
+
+    @alive_cells.setter
+    def alive_cells(self, value: List[CellIndex]):
+        if self._engine is not None:
+            raise AttributeError("Alive cells are managed by the {} engine".format(self.engine))
+        self._alive_cells = value
+        self._alive_indices = [cell.row * self.grid_width + cell.column for cell in value]
+
+    def get_alive_indices(self) -> List[int]:
+        """Return flat indices (`row * grid_width + column`) of alive cells in the current generation.
+
+        Unlike `alive_cells`, no `CellIndex` is created.
+        """
+        if self._engine is None:
+            return list(self._alive_indices)
+        return self._engine.get_alive_indices()
+
+    def get_cells(self):
+        """Return the cells of the current generation as a uint8 array of shape (grid_height, grid_width), 1 for alive
+        cells.
+
+        Engines keeping such an array (`numpy`) return it without copying it, as it is replaced rather than changed by
+        the next generation. Cells of other engines are unpacked or copied into a new array.
+
+        Returns:
+            a C-contiguous numpy array, or a bytearray of the rows if numpy is not installed
+        """
+        if self._engine is not None and hasattr(self._engine, 'get_cells'):
+            return self._engine.get_cells()
+
+        try:
+            np = import_numpy()
+        except ImportError:
+            cells = bytearray(self.grid_width * self.grid_height)
+            for index in self.get_alive_indices():
+                cells[index] = 1
+            return cells
+
+        cells = np.zeros(self.grid_width * self.grid_height, dtype=np.uint8)
+        cells[as_index_array(np, self.get_alive_indices())] = 1
+        return cells.reshape(self.grid_height, self.grid_width)
+
+    def _get_cell_buffer(self) -> memoryview:
+        """Return a read-only view of `get_cells()` of shape (grid_height, grid_width), which keeps the cells alive as
+        long as it is used.
+        """
+        cells = self.get_cells()
+        if isinstance(cells, bytearray):
+            # without numpy, the cells are a new bytearray which is copied once more to be read-only
+            return memoryview(bytes(cells)).cast('B', (self.grid_height, self.grid_width))
+
+        # a read-only view of the array, so that the board of the engine stays writable
+        view = cells.view()
+        view.flags.writeable = False
+        return memoryview(view)
+
+    @property
+    def __array_interface__(self) -> Dict:
+        """The cells of the current generation for `numpy.asarray(game)` and other readers of arrays, shared without
+        a copy where the engine keeps them as an array (see `get_cells`). The array is read-only.
+        """
+        return {'version': 3, 'shape': (self.grid_height, self.grid_width), 'typestr': '|u1',
+                'data': self._get_cell_buffer()}
+
+    def __buffer__(self, flags: int) -> memoryview:
+        # the buffer protocol of Python 3.12 or later (PEP 688), for `memoryview(game)`
+        return self._get_cell_buffer()
+
+    def get_bitpacked_rows(self):
+        """Return alive cells packed in rows (see `engines.unpack_bitpacked_indices` for the layout).
+
+        Engines storing bit-packed rows return their storage without copying it.
+
+        Returns:
+            uint64 array of shape (grid_height, words per row), or a bytearray if numpy is not installed
+        """
+        if self._engine is not None and hasattr(self._engine, 'from_bitpacked'):
+            return self._engine.words
+        return pack_bitpacked_indices(self.get_alive_indices(), self.grid_width, self.grid_height)
+
+    @classmethod
+    def from_coordinates(cls,
+                         width: int,
+                         height: int,
+                         rows: Sequence[int],
+                         columns: Sequence[int],
+                         engine: str = DEFAULT_ENGINE,
+                         engine_options: Optional[Dict] = None,
+                         rule: Union[Rule, str, None] = None) -> 'Life':
+        """Create a game from coordinates of alive cells without creating `CellIndex` objects.
+
+        Args:
+            width: the grid width
+            height: the grid height
+            rows: row of each alive cell (a list, an `array` or a numpy array)
+            columns: column of each alive cell
+            engine: name of the engine stepping the board
+            engine_options: keyword arguments given to the engine
+            rule: the rule stepping the board, or its B/S notation
+
+        Returns:
+            the initialized game
+        """
+        game = cls(engine=engine, engine_options=engine_options, rule=rule)
+        game.init_grid_from_indices(width, height, [row * width + col for row, col in zip(rows, columns)])
+        return game
+
+    @classmethod
+    def from_array(cls,
+                   array,
+                   engine: str = DEFAULT_ENGINE,
+                   engine_options: Optional[Dict] = None,
+                   rule: Union[Rule, str, None] = None) -> 'Life':
+        """Create a game from a 2D array of cells, where nonzero cells are alive.
+
+        Args:
+            array: a numpy array or a list of rows
+            engine: name of the engine stepping the board
+            engine_options: keyword arguments given to the engine
+            rule: the rule stepping the board, or its B/S notation
+
+        Returns:
+            the initialized game
+        """
+        height = len(array)
+        width = len(array[0]) if height else 0
+        if hasattr(array, 'ravel'):
+            # numpy array
+            alive_indices = array.ravel().nonzero()[0].tolist()
+        else:
+            alive_indices = [row * width + col for row, cells in enumerate(array) for col, cell in enumerate(cells)
+                             if cell]
+
+        game = cls(engine=engine, engine_options=engine_options, rule=rule)
+        game.init_grid_from_indices(width, height, alive_indices)
+        return game
 
     def init_grid(self, width: int, height: int, init_alive_cells: List[CellIndex]):
         """Initialize the grid.
@@ -63,49 +332,168 @@ class Life:
             height the grid height
             init_alive_cells: list of initial alive cells
         """
+        self.init_grid_from_indices(width, height, [cell.row * width + cell.column for cell in init_alive_cells])
+
+    def init_grid_from_indices(self, width: int, height: int, alive_indices: List[int]):
+        """Initialize the grid from flat indices (`row * width + column`) of alive cells.
+
+        Args:
+            width: the grid width
+            height the grid height
+            alive_indices: flat indices of initial alive cells
+        """
         if width < self.MIN_GRID_WIDTH or height < self.MIN_GRID_HEIGHT:
             raise ValueError(
                 "A grid should have the minimum size of {} (Given: {}".format((
                     self.MIN_GRID_WIDTH, self.MIN_GRID_HEIGHT), 
                     (width, height)))
 
-        self.grid = [[False for _ in range(width)] for _ in range(height)]
         self.grid_width = width
         self.grid_height = height
+        self.period = None
+        self.period_start = None
+        self._fingerprint = None
+        self._fingerprints = None
+        self._cycle_candidate = None
+        if self.history is not None:
+            self.history.clear()
+
+        if self.engine != self.DEFAULT_ENGINE:
+            self._engine = get_engine_class(self.engine)(
+                width, height, alive_indices, rule=self.rule, **self.engine_options)
+            return
+
+        self.grid = [[False for _ in range(width)] for _ in range(height)]
+        # numpy arrays are converted to Python integers
+        self._alive_indices = alive_indices.tolist() if hasattr(alive_indices, 'tolist') else list(alive_indices)
+        self._alive_cells = None
+        for index in self._alive_indices:
+            row, col = divmod(index, width)
+            self.grid[row][col] = True
+
+    @staticmethod
+    def iter_random_alive_indices(grid_width: int,
+                                  grid_height: int,
+                                  density: float,
+                                  seed: Optional[int] = None,
+                                  chunk_size: int = 65536) -> Iterator[List[int]]:
+        """Yield flat indices (`row * grid_width + column`) of random alive cells, chunk by chunk.
+
+        Every cell is alive with the probability of `density`. Instead of drawing every cell, gaps between alive cells
+        are drawn from the geometric distribution, so time is linear in the number of alive cells.
+
+        Args:
+            grid_width: the grid's width
+            grid_height: the grid's height
+            density: probability of a cell to be alive
+            seed: seed of the random generator, the same seed gives the same cells
+            chunk_size: maximum number of indices in a chunk
+
+        Returns:
+            iterator of lists of increasing flat indices
+        """
+        if not 0 <= density <= 1:
+            raise ValueError("A density should be between 0 and 1 (Given: {})".format(density))
+
+        number_of_cells = grid_width * grid_height
+        if density == 0:
+            return
+
+        if density == 1:
+            for start in range(0, number_of_cells, chunk_size):
+                yield list(range(start, min(start + chunk_size, number_of_cells)))
+            return
 
-        self.alive_cells = init_alive_cells
-        for cur_cell in self.alive_cells:
-            self.grid[cur_cell.row][cur_cell.column] = True
+        rand = random.Random(seed)
+        log_of_dead_probability = math.log(1 - density)
+
+        chunk = []
+        index = -1
+        while True:
+            # number of dead cells before the next alive one
+            index += 1 + int(math.log(1.0 - rand.random()) / log_of_dead_probability)
+            if index >= number_of_cells:
+                break
+
+            chunk.append(index)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
 
     @staticmethod
-    def get_random_init_states(grid_width: int, grid_height: int, max_count=5) -> List[CellIndex]:
+    def get_random_init_states(grid_width: int,
+                               grid_height: int,
+                               density: Optional[float] = None,
+                               seed: Optional[int] = None) -> List[CellIndex]:
         """Return the list of randomly initialized alive cells.
         
         Args:
             grid_width: the grid's width 
             grid_height: the grid's height
+            density: probability of a cell to be alive (randomly chosen up to `MAX_RANDOM_DENSITY` if not given)
+            seed: seed of the random generator, the same seed gives the same cells
         
         Returns:
             list of index of alive cells
         """
+        return [CellIndex(*divmod(index, grid_width))
+                for index in Life.get_random_alive_indices(grid_width, grid_height, density=density, seed=seed)]
+
+    @staticmethod
+    def get_random_alive_indices(grid_width: int,
+                                 grid_height: int,
+                                 density: Optional[float] = None,
+                                 seed: Optional[int] = None) -> List[int]:
+        """Return flat indices of randomly initialized alive cells, the same cells as `get_random_init_states`.
+
+        Args:
+            grid_width: the grid's width
+            grid_height: the grid's height
+            density: probability of a cell to be alive (randomly chosen up to `MAX_RANDOM_DENSITY` if not given)
+            seed: seed of the random generator, the same seed gives the same cells
+
+        Returns:
+            list of flat indices (`row * grid_width + column`) of alive cells
+        """
+        rand = random.Random(seed)
+        if density is None:
+            density = rand.uniform(0, Life.MAX_RANDOM_DENSITY)
+
         res = []
-        max_number_of_cells = int(grid_width * grid_height / 4)
-        number_of_cells = random.randint(0, max_number_of_cells)
-        
-        while len(res) < number_of_cells:
-            # loop until all distinct random cells are created
-            row = random.randint(0, grid_height - 1)
-            col = random.randint(0, grid_width - 1)
-            cell = CellIndex(row, col)
-            if cell not in res:
-                res.append(cell)
+        for chunk in Life.iter_random_alive_indices(grid_width, grid_height, density, seed=rand.getrandbits(64)):
+            res.extend(chunk)
 
         return res
 
+    def init_grid_from_bitpacked(self, width: int, height: int, data):
+        """Initialize the grid from bit-packed rows (see `engines.unpack_bitpacked_indices` for the layout).
+
+        Engines storing bit-packed rows adopt `data` without copying it.
+
+        Args:
+            width: the grid width
+            height: the grid height
+            data: the packed rows as a bytes-like object or a uint64 numpy array of shape (height, words per row)
+        """
+        if self.engine != self.DEFAULT_ENGINE:
+            engine_class = get_engine_class(self.engine)
+            if hasattr(engine_class, 'from_bitpacked') and not self.engine_options:
+                self.init_grid_from_indices(width, height, [])
+                self._engine = engine_class.from_bitpacked(width, height, data, rule=self.rule)
+                return
+
+        self.init_grid_from_indices(width, height, unpack_bitpacked_indices(data, width, height))
+
     def start_game(self,
                    grid_width: Optional[int] = None, 
                    grid_height: Optional[int] = None, 
-                   init_alive_cells:Optional[List[CellIndex]] = None):
+                   init_alive_cells:Optional[List[CellIndex]] = None,
+                   density: Optional[float] = None,
+                   seed: Optional[int] = None,
+                   init_alive_indices: Optional[List[int]] = None):
         """Initialize the game board.
 
         If parmeters are not given, they are randomly assigned.
@@ -114,15 +502,26 @@ class Life:
             grid_width: the grid width
             grid_height the grid height
             init_alive_cells: list of initial alive cells
+            density: probability of a cell to be alive when cells are randomly assigned
+            seed: seed of the random generator, the same seed gives the same board
+            init_alive_indices: flat indices (`row * grid_width + column`) of initial alive cells, instead of
+                `init_alive_cells`
         """
+        rand = random.Random(seed)
         if not grid_width:
-            grid_width = random.randint(self.MIN_GRID_WIDTH, self.MAX_GRID_SIZE)
+            grid_width = rand.randint(self.MIN_GRID_WIDTH, self.MAX_GRID_SIZE)
 
         if not grid_height:
-            grid_height = random.randint(self.MIN_GRID_HEIGHT, self.MAX_GRID_SIZE)
+            grid_height = rand.randint(self.MIN_GRID_HEIGHT, self.MAX_GRID_SIZE)
+
+        if init_alive_indices:
+            self.init_grid_from_indices(grid_width, grid_height, init_alive_indices)
+            return
 
         if not init_alive_cells:
-            init_alive_cells = self.get_random_init_states(grid_width, grid_height)
+            self.init_grid_from_indices(grid_width, grid_height, self.get_random_alive_indices(
+                grid_width, grid_height, density=density, seed=rand.getrandbits(64)))
+            return
 
         self.init_grid(grid_width, grid_height, init_alive_cells)
 
@@ -154,24 +553,20 @@ class Life:
         Returns:
             total number of alive neighbors for each target cell
         """
-        alive_neighbor_counter = {}     # number of alive neighbor cells
-        
-        # for each alive cell, set its neighbor cell to have one live cell
-        for cur_alive_cell in self.alive_cells:            
-            cur_neighbors = self.get_neighbors(cur_alive_cell)
+        alive_neighbor_counter = count_alive_neighbors_by_index(
+            self._alive_indices, self.grid_width, self.grid_height)
 
-            for neighbor in cur_neighbors:
-                alive_neighbor_counter[neighbor] = alive_neighbor_counter.get(neighbor, 0) + 1
-        
-        return alive_neighbor_counter
+        return {CellIndex(*divmod(index, self.grid_width)): num_of_alive_neighbors
+                for index, num_of_alive_neighbors in alive_neighbor_counter.items()}
 
     def is_survive_for_the_next_generation(self, cell: CellIndex, num_of_alive_neighbors: int) -> bool:
         """Check if cell will be alive for the next generation.
 
-        A cell will not be alive unless 
+        With Conway's rule, a cell will not be alive unless
             1) a live cell with 2 or 3 neighbors 
             2) a dead cell with 3 neighbors
-        
+        and other rules are looked up in the table of `rule`.
+
         Args:
             cell: a cell to check
             num_of_alive_neighbors: number of alive neighbor cells for the current generation
@@ -180,11 +575,7 @@ class Life:
             True if cell will be alive for the next generation
         """
         is_alive = self.grid[cell.row][cell.column]
-
-        return (
-            (is_alive and (2 <= num_of_alive_neighbors <= 3)) 
-            or (not is_alive and num_of_alive_neighbors == 3)
-        )
+        return self.rule.table[1 if is_alive else 0][num_of_alive_neighbors]
 
     def proceed_generation(self):
         """Proceed one generation according to the following rule:
@@ -194,27 +585,307 @@ class Life:
         - Any other cells become dead for the next generation
 
         https://en.wikipedia.org/wiki/Conway%27s_Game_of_Life
+
+        Every generation is fingerprinted to detect `period` (see `detect_cycles`), and a still life is not computed
+        anymore once it is detected. Births and deaths are recorded to `history` if it is enabled.
+        """
+        if self.history is not None:
+            self._prepare_history()
+
+        if self.period == 1:
+            self.generation += 1
+            if self.history is not None:
+                self._record_history(set(), set())
+            if self._is_keeping_delta:
+                self._last_delta = (set(), set())
+            return
+
+        is_detecting = self.detect_cycles and self.period is None
+        if is_detecting and self._fingerprints is None:
+            self._fingerprints = {}
+            self._record_generation()
+
+        if self._engine is not None:
+            # changed cells are only asked for when they are kept, since a generation recorded to `history` as a
+            # keyframe does not need them
+            is_recording_delta = self.history is not None and not self.history.needs_keyframe(self.generation + 1)
+            births = deaths = None
+            if is_recording_delta or self._is_keeping_delta:
+                births, deaths = self._engine.step_with_changes()
+            else:
+                self._engine.step()
+            self.generation += 1
+            if is_detecting:
+                self._record_generation()
+            if self.history is not None:
+                self._record_history(births, deaths)
+            if self._is_keeping_delta:
+                self._last_delta = (set(births), set(deaths))
+            return
+
+        cell_to_die, cell_to_live, _ = self._step_with_dict()
+        self.generation += 1
+        if is_detecting:
+            self._record_generation(cell_to_die | cell_to_live)
+        if self.history is not None:
+            self._record_history(cell_to_live, cell_to_die)
+        if self._is_keeping_delta:
+            self._last_delta = (cell_to_live, cell_to_die)
+
+    def iter_generations(self, num_of_generation: int) -> Iterator[Tuple[int, Set[int], Set[int]]]:
+        """Proceed `num_of_generation` generations one at a time, yielding the cells born and died in each of them.
+
+        Generations are stepped lazily as they are asked for, by `proceed_generation`. The built-in engine yields the
+        sets it computes anyway, and other engines report them by `Engine.step_with_changes`.
+
+        Args:
+            num_of_generation: total number of generation to go
+
+        Yields:
+            the generation, and flat indices (`row * grid_width + column`) of cells born and of cells died in it
         """
-        alive_neighbor_counter = self.get_number_of_alive_neighbors()
+        self._is_keeping_delta = True
+        try:
+            for _ in range(num_of_generation):
+                self.proceed_generation()
+                births, deaths = self._last_delta
+                self._last_delta = None
+                yield self.generation, births, deaths
+        finally:
+            self._is_keeping_delta = False
+
+    def _step_with_dict(self) -> Tuple[Set[int], Set[int], int]:
+        """Step the built-in engine to the next generation, without changing `generation`.
+
+        Returns:
+            cells which died, cells which were born, and the number of cells with an alive neighbor
+        """
+        # cells are handled as flat indices here, `CellIndex` objects are only created when they are asked for
+        width = self.grid_width
+        cur_alive_cells_set = set(self._alive_indices)
+        alive_neighbor_counter = count_alive_neighbors_by_index(self._alive_indices, width, self.grid_height)
 
         # note that cells not in `alive_neighbor_counter` has no alive neighbors meaning dead for the next
-        next_alive_cells = []
-        for cur_cell, num_of_alive_neighbors in alive_neighbor_counter.items():
-            if self.is_survive_for_the_next_generation(cur_cell, num_of_alive_neighbors):
-                next_alive_cells.append(cur_cell)
+        if self.rule.is_conway:
+            # comparisons are faster than looking the table up
+            next_alive_cells = [
+                index for index, num_of_alive_neighbors in alive_neighbor_counter.items()
+                if num_of_alive_neighbors == 3 or (num_of_alive_neighbors == 2 and index in cur_alive_cells_set)
+            ]
+        else:
+            births, survivals = self.rule.table
+            next_alive_cells = [
+                index for index, num_of_alive_neighbors in alive_neighbor_counter.items()
+                if (births[num_of_alive_neighbors] and (
+                    survivals[num_of_alive_neighbors] or index not in cur_alive_cells_set))
+                or (survivals[num_of_alive_neighbors] and index in cur_alive_cells_set)
+            ]
+            if survivals[0]:
+                # alive cells without alive neighbors are not counted
+                next_alive_cells.extend(index for index in cur_alive_cells_set if index not in alive_neighbor_counter)
 
         # change to the next generation
-        cur_alive_cells_set = set(self.alive_cells)
         next_alive_cells_set = set(next_alive_cells)
 
         cell_to_die = cur_alive_cells_set - next_alive_cells_set
         cell_to_live = next_alive_cells_set - cur_alive_cells_set
 
-        for cur_cell in cell_to_die:
-            self.grid[cur_cell.row][cur_cell.column] = False
+        grid = self.grid
+        for index in cell_to_die:
+            row, col = divmod(index, width)
+            grid[row][col] = False
 
-        for cur_cell in cell_to_live:
-            self.grid[cur_cell.row][cur_cell.column] = True
+        for index in cell_to_live:
+            row, col = divmod(index, width)
+            grid[row][col] = True
         
-        self.alive_cells = next_alive_cells
-        self.generation += 1
+        self._alive_indices = next_alive_cells
+        self._alive_cells = None
+        return cell_to_die, cell_to_live, len(alive_neighbor_counter)
+
+    def _record_generation(self, changed_indices: Optional[Set[int]] = None):
+        """Fingerprint the current generation, and set `period` when a previous state is repeated.
+
+        Different states may share a fingerprint, so a repetition is only accepted when the state is repeated again
+        after one more period. Engines hash their own storage when they can (see `Engine.get_fingerprint`), as listing
+        the alive cells of a large board every generation takes much longer than stepping it.
+
+        Args:
+            changed_indices: cells born or died in the last generation, which update the fingerprint incrementally
+                (it is computed from every alive cell otherwise)
+        """
+        fingerprint = self._engine.get_fingerprint() if self._engine is not None else None
+        if fingerprint is not None:
+            self._fingerprint = fingerprint
+        elif changed_indices is not None and self._fingerprint is not None:
+            self._fingerprint ^= get_fingerprint(changed_indices)
+        else:
+            self._fingerprint = get_fingerprint(self._get_alive_indices())
+
+        if self._cycle_candidate is not None:
+            generation, period_start, candidate = self._cycle_candidate
+            if self.generation == 2 * generation - period_start:
+                self._cycle_candidate = None
+                if set(self._get_alive_indices()) == candidate:
+                    self.period = generation - period_start
+                    self.period_start = period_start
+                    return
+
+        first_generation = self._fingerprints.get(self._fingerprint)
+        if first_generation is None:
+            if len(self._fingerprints) >= self.MAX_FINGERPRINTS:
+                # keep memory bounded, periods shorter than this are still detected when they repeat again
+                self._fingerprints.clear()
+            self._fingerprints[self._fingerprint] = self.generation
+        elif self._cycle_candidate is None:
+            self._cycle_candidate = (self.generation, first_generation, set(self._get_alive_indices()))
+
+    def _get_alive_indices(self) -> List[int]:
+        return self._alive_indices if self._engine is None else self._engine.get_alive_indices()
+
+    def enable_history(self,
+                       budget_bytes: int = History.DEFAULT_BUDGET_BYTES,
+                       keyframe_every: int = History.DEFAULT_KEYFRAME_EVERY):
+        """Keep recent generations stepped by `proceed_generation` in `history`, to go back to them by `rewind`.
+
+        Only the cells born and died are recorded for most generations, with all alive cells every `keyframe_every`
+        generations. Generations skipped by `proceed_generations` are not kept.
+
+        Args:
+            budget_bytes: the approximate memory the history may take, older generations are forgotten over it
+            keyframe_every: the maximum number of generations recorded as births and deaths after all alive cells
+        """
+        self.history = History(budget_bytes=budget_bytes, keyframe_every=keyframe_every)
+
+    def rewind(self, generation: int):
+        """Go back to a generation kept in `history` (or forward to it again, until another generation is stepped).
+
+        Args:
+            generation: a generation between `history.oldest_generation` and `history.newest_generation`
+        """
+        if self.history is None:
+            raise ValueError("The history of generations is not kept")
+
+        alive_indices = self.history.get_alive_indices(generation)
+        # the board is initialized again, without forgetting its history
+        history, self.history = self.history, None
+        try:
+            self.close()
+            self.init_grid_from_indices(self.grid_width, self.grid_height, alive_indices)
+        finally:
+            self.history = history
+        self.generation = generation
+
+    def _prepare_history(self):
+        """Make the current generation the newest one of `history` before it is stepped.
+        """
+        if self.generation in self.history:
+            # generations after a rewound one are stepped again
+            self.history.truncate(self.generation)
+        else:
+            self.history.add_keyframe(self.generation, self.get_alive_indices())
+
+    def _record_history(self, births: Optional[Iterable[int]], deaths: Optional[Iterable[int]]):
+        # the cells born and died are only given for generations which are not keyframes
+        if self.history.needs_keyframe(self.generation):
+            self.history.add_keyframe(self.generation, self.get_alive_indices())
+        else:
+            self.history.add_delta(self.generation, births, deaths)
+
+    def close(self):
+        """Release resources held by the engine, such as worker processes.
+        """
+        if self._engine is not None:
+            self._engine.close()
+
+    def get_engine_stats(self) -> Dict[str, int]:
+        """Return counters reported by the engine.
+
+        Returns:
+            counters by name (empty if the engine reports nothing)
+        """
+        if self._engine is None or self._engine.stats is None:
+            return {}
+        return dict(self._engine.stats)
+
+    def enable_metrics(self, recorder):
+        """Record every generation stepped by `proceed_generation` to `recorder`.
+
+        The methods measuring generations are only set on this instance, so a game without metrics runs the same code
+        as before. Generations skipped by `proceed_generations` (jumps and repeated periods) are not recorded.
+
+        Args:
+            recorder: a `metrics.MetricsRecorder`, or anything with its `is_sampled` and `record`
+        """
+        self.metrics = recorder
+        self.proceed_generation = self._proceed_generation_with_metrics
+        self._step_with_dict = self._step_with_dict_with_metrics
+
+    def disable_metrics(self):
+        """Stop recording generations set by `enable_metrics`.
+        """
+        if self.metrics is None:
+            return
+
+        del self.proceed_generation
+        del self._step_with_dict
+        self.metrics = None
+        self._last_step = None
+
+    def _step_with_dict_with_metrics(self) -> Tuple[Set[int], Set[int], int]:
+        self._last_step = type(self)._step_with_dict(self)
+        return self._last_step
+
+    def _proceed_generation_with_metrics(self):
+        if not self.metrics.is_sampled(self.generation + 1):
+            type(self).proceed_generation(self)
+            return
+
+        # engines report the cells born and died like for `iter_generations`
+        is_keeping_delta, self._is_keeping_delta = self._is_keeping_delta, True
+        self._last_step = None
+        started_at = time.perf_counter()
+        try:
+            type(self).proceed_generation(self)
+        finally:
+            self._is_keeping_delta = is_keeping_delta
+        seconds = time.perf_counter() - started_at
+
+        births, deaths = self._last_delta
+        if not is_keeping_delta:
+            self._last_delta = None
+        neighbor_entries = self._last_step[2] if self._last_step is not None else None
+        population = self._engine.get_population() if self._engine is not None else len(self._alive_indices)
+
+        self.metrics.record({
+            'generation': self.generation,
+            'seconds': seconds,
+            'population': population,
+            'births': len(births),
+            'deaths': len(deaths),
+            'neighbor_entries': neighbor_entries,
+        })
+
+    def proceed_generations(self, num_of_generation: int):
+        """Proceed `num_of_generation` generations.
+
+        Engines which can jump (see `can_jump`) go there directly without computing intermediate generations. Others
+        skip every whole period once `period` is detected.
+
+        Args:
+            num_of_generation: total number of generation to go
+        """
+        if self._engine is not None and (self._engine.can_jump or not self.detect_cycles):
+            self._engine.advance(num_of_generation)
+            self.generation += num_of_generation
+            return
+
+        target = self.generation + num_of_generation
+        while self.generation < target:
+            if self.period is not None:
+                # the state at `target` is the one `(target - generation) % period` generations later
+                self.generation += (target - self.generation) // self.period * self.period
+                if self.generation == target:
+                    break
+
+            self.proceed_generation()
@@ -0,0 +1,177 @@
+import functools
+import io
+import json
+import time
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, TextIO
+
+if TYPE_CHECKING:
+    # only for type comments, cProfile is imported when a phase is first profiled
+    import cProfile
+
+
+class MetricsRecorder:
+    """Collect metrics of generations, hand them to callbacks and stream them as JSON lines.
+
+    A game records its generations here after `Life.enable_metrics`. Every record has `generation`, `seconds` (wall
+    time of the step), `population`, `births`, `deaths` and `neighbor_entries` (the number of cells with an alive
+    neighbor counted by the built-in engine, None for other engines).
+
+    Attributes:
+        stream: a text stream to write a JSON line per record to (nothing is written if None)
+        sample_every: only generations which are multiples of this are recorded
+        callbacks: functions called with every record
+        num_of_records: number of records so far
+    """
+    stream = None
+    sample_every = None
+    callbacks = None
+    num_of_records = None
+
+    def __init__(self,
+                 stream: Optional[TextIO] = None,
+                 sample_every: int = 1,
+                 callbacks: Optional[List[Callable[[Dict], None]]] = None):
+        if sample_every < 1:
+            raise ValueError("sample_every should be positive ({})".format(sample_every))
+
+        self.stream = stream
+        self.sample_every = sample_every
+        self.callbacks = list(callbacks or [])
+        self.num_of_records = 0
+        self._owns_stream = False
+
+    @classmethod
+    def open(cls, path: str, sample_every: int = 1) -> 'MetricsRecorder':
+        """Create a recorder writing JSON lines to `path`, which is closed by `close`.
+        """
+        recorder = cls(stream=open(path, 'w'), sample_every=sample_every)
+        recorder._owns_stream = True
+        return recorder
+
+    def add_callback(self, callback: Callable[[Dict], None]):
+        """Call `callback` with every following record.
+        """
+        self.callbacks.append(callback)
+
+    def is_sampled(self, generation: int) -> bool:
+        """Return True if `generation` is recorded, so that unsampled ones are not measured at all.
+        """
+        return generation % self.sample_every == 0
+
+    def record(self, metrics: Dict):
+        """Hand a record to the callbacks and write it to the stream.
+
+        Args:
+            metrics: metrics of a generation
+        """
+        self.num_of_records += 1
+        for callback in self.callbacks:
+            callback(metrics)
+
+        if self.stream is not None:
+            self.stream.write(json.dumps(metrics) + '\n')
+
+    def close(self):
+        """Flush the stream, and close it if it was opened by `open`.
+        """
+        if self.stream is None:
+            return
+
+        if self._owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+class Profiler:
+    """Profile a run with cProfile, separately for each phase of it.
+
+    A profile is kept for each phase (e.g. `parse`, `step`, `render` and `dump`), and only the innermost phase is
+    profiled at a time, so that the time of a phase is not counted in the other one.
+
+    Attributes:
+        profiles: `cProfile.Profile` by phase, in the order the phases were first entered
+        seconds: wall time spent in each phase
+    """
+    profiles = None
+    seconds = None
+
+    def __init__(self):
+        self.profiles = {}    # type: Dict[str, cProfile.Profile]
+        self.seconds = {}    # type: Dict[str, float]
+        self._phases = []    # type: List[str]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Profile the block as a part of the phase `name`.
+
+        Entering the phase which is already being profiled does nothing, so wrapped functions may call each other.
+        """
+        outer = self._phases[-1] if self._phases else None
+        if outer == name:
+            yield
+            return
+
+        if outer is not None:
+            self.profiles[outer].disable()
+
+        profile = self.profiles.get(name)
+        if profile is None:
+            # imported on demand, as they take a noticeable part of the startup of the CLI
+            import cProfile
+            profile = self.profiles[name] = cProfile.Profile()
+
+        self._phases.append(name)
+        started_at = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - started_at
+            self._phases.pop()
+            if outer is not None:
+                self.profiles[outer].enable()
+
+    def wrap(self, func: Callable, name: str) -> Callable:
+        """Return `func` profiled as a part of the phase `name`.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def instrument(self, obj: object, method_name: str, name: str):
+        """Profile a method of `obj` as a part of the phase `name`, without changing its class.
+        """
+        setattr(obj, method_name, self.wrap(getattr(obj, method_name), name))
+
+    def get_report(self, limit: int = 20) -> str:
+        """Return the statistics of every phase sorted by the cumulative time.
+
+        Args:
+            limit: number of functions shown for each phase
+        """
+        import pstats
+
+        out = io.StringIO()
+        for name, profile in self.profiles.items():
+            out.write("==== {}: {:.3f} seconds ====\n".format(name, self.seconds.get(name, 0.0)))
+            stats = pstats.Stats(profile, stream=out)
+            stats.sort_stats('cumulative').print_stats(limit)
+
+        return out.getvalue()
+
+    def write(self, path: str, limit: int = 20):
+        """Write the report of `get_report` to `path`, and the raw statistics of each phase to `{path}.{phase}.prof`
+        to be loaded by `pstats`.
+        """
+        with open(path, 'w') as fp:
+            fp.write(self.get_report(limit))
+
+        for name, profile in self.profiles.items():
+            profile.dump_stats('{}.{}.prof'.format(path, name))
@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    from .engines import (Engine, apply_rule_to_counts, as_index_array, count_alive_neighbors_in_padded,
+                          get_changed_indices, import_numpy)
+    from .rules import CONWAY, Rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from engines import (Engine, apply_rule_to_counts, as_index_array, count_alive_neighbors_in_padded,
+                         get_changed_indices, import_numpy)
+    from rules import CONWAY, Rule
+
+
+# boards and the rule of the current worker process, set up by `_init_worker`
+_worker_boards = None
+_worker_rule = None
+
+
+def _as_boards(np, buffers: List, width: int, height: int) -> List:
+    """Return numpy views over shared buffers without copying them.
+    """
+    return [np.frombuffer(buffer, dtype=np.uint8).reshape(height, width) for buffer in buffers]
+
+
+def _init_worker(buffers: List, width: int, height: int, rule: Rule):
+    """Attach a worker process to the shared boards.
+    """
+    global _worker_boards, _worker_rule
+    _worker_boards = _as_boards(import_numpy(), buffers, width, height)
+    _worker_rule = rule
+
+
+def step_band(boards: List, source: int, start: int, stop: int, rule: Rule = CONWAY):
+    """Write the next generation of rows from `start` to `stop` of `boards[source]` to the other board.
+
+    Only the band and one halo row on each side of it are read.
+
+    Args:
+        boards: the two boards, one for the current generation and one for the next
+        source: index of the board of the current generation
+        start: the first row of the band
+        stop: the row after the last row of the band
+        rule: the rule to apply
+    """
+    np = import_numpy()
+    board = boards[source]
+    height, width = board.shape
+
+    # rows outside of the grid and columns on both sides are dead
+    padded = np.zeros((stop - start + 2, width + 2), dtype=np.uint8)
+    padded[max(1 - start, 0):stop - start + 2 - max(stop + 1 - height, 0), 1:-1] = \
+        board[max(start - 1, 0):min(stop + 1, height)]
+
+    counts = count_alive_neighbors_in_padded(np, padded)
+    boards[1 - source][start:stop] = apply_rule_to_counts(np, rule, padded[1:-1, 1:-1], counts)
+
+
+def _step_band_in_worker(source: int, start: int, stop: int):
+    step_band(_worker_boards, source, start, stop, _worker_rule)
+
+
+class ParallelEngine(Engine):
+    """An engine splitting the board into horizontal bands, each stepped by a worker process.
+
+    The current and the next generation live in two shared memory buffers, so boards are never pickled between
+    processes. Workers only receive the band to step, and read one halo row above and below it.
+
+    Attributes:
+        workers: number of worker processes
+        bands: (start, stop) rows of each band
+    """
+    name = 'parallel'
+    workers = None
+    bands = None
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 alive_indices: Iterable[int],
+                 rule: Optional[Rule] = None,
+                 workers: int = None):
+        super().__init__(width, height, alive_indices, rule)
+        self._np = import_numpy()
+        self.workers = workers or os.cpu_count() or 1
+
+        self._buffers = [multiprocessing.RawArray('B', width * height) for _ in range(2)]
+        self._boards = _as_boards(self._np, self._buffers, width, height)
+        self._current = 0
+        indices = as_index_array(self._np, alive_indices)
+        self._boards[0].reshape(-1)[indices] = 1
+
+        num_of_bands = min(self.workers, height)
+        self.bands = [
+            (height * i // num_of_bands, height * (i + 1) // num_of_bands) for i in range(num_of_bands)
+        ]    # type: List[Tuple[int, int]]
+
+        self._pool = None
+        if self.workers > 1:
+            self._pool = multiprocessing.Pool(
+                self.workers, initializer=_init_worker, initargs=(self._buffers, width, height, self.rule))
+
+    def step(self):
+        tasks = [(self._current, start, stop) for start, stop in self.bands]
+        if self._pool is None:
+            for task in tasks:
+                step_band(self._boards, *task, rule=self.rule)
+        else:
+            self._pool.starmap(_step_band_in_worker, tasks)
+
+        self._current = 1 - self._current
+
+    def step_with_changes(self) -> Tuple[List[int], List[int]]:
+        self.step()
+        # the other buffer still holds the previous generation
+        return get_changed_indices(self._np, self._boards[1 - self._current], self._boards[self._current])
+
+    def get_alive_indices(self) -> List[int]:
+        return self._np.flatnonzero(self._boards[self._current]).tolist()
+
+    def get_fingerprint(self) -> int:
+        return hash(self._np.packbits(self._boards[self._current]).tobytes())
+
+    def get_grid(self):
+        return self._boards[self._current]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
@@ -0,0 +1,301 @@
+import re
+
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+try:
+    from .rules import CONWAY, Rule, parse_rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from rules import CONWAY, Rule, parse_rule
+
+
+CHUNK_SIZE = 1 << 20    # number of characters read at once
+MAX_LINE_LENGTH = 70    # lines of RLE files are wrapped before this number of characters
+
+_RLE_HEADER = re.compile(r'\s*x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)\s*(?:,\s*rule\s*=\s*(\S+))?\s*$')
+_RLE_TOKEN = re.compile(r'(\d*)([^\d\s])')
+# the board of a written Macrocell file: its height and width, and the position of its top left cell in the quadtree
+_MACROCELL_BOARD = re.compile(r'#C\s+board\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s*$')
+
+
+def _parse_rule(notation: str) -> Rule:
+    """Parse the rule of a pattern file, raising if it is not a supported Life-like rule.
+    """
+    try:
+        return parse_rule(notation)
+    except ValueError:
+        raise Exception("The rule is not supported ({}).".format(notation))
+
+
+def read_rle(fp: TextIO, min_width: int = 1, min_height: int = 1) -> Tuple[int, int, array, Optional[Rule]]:
+    """Read a pattern in the run length encoded (RLE) format, in chunks.
+
+    Runs of alive cells are decoded to flat indices directly, and the pattern is placed at the top left corner of the
+    board.
+
+    Args:
+        fp: a stream to read from
+        min_width: the minimum width of the board, which is the width of the pattern otherwise
+        min_height: the minimum height of the board, which is the height of the pattern otherwise
+
+    Returns:
+        the height and the width of the board, flat indices (`row * width + column`) of alive cells, and the rule of
+        the pattern (None if the file does not have one)
+    """
+    content = fp.readline()
+    while content.startswith('#') or (content and not content.strip()):
+        content = fp.readline()
+
+    match = _RLE_HEADER.match(content)
+    if match is None:
+        raise Exception("The RLE header line is not in the correct format ({}).".format(content.rstrip('\n')))
+    rule = _parse_rule(match.group(3)) if match.group(3) else None
+
+    pattern_width, pattern_height = int(match.group(1)), int(match.group(2))
+    width = max(pattern_width, min_width)
+    height = max(pattern_height, min_height)
+
+    res = array('q')
+    row = col = 0
+    rest = ''
+    is_finished = False
+    while not is_finished:
+        chunk = fp.read(CHUNK_SIZE)
+        block = rest + chunk
+        rest = ''
+        if chunk:
+            # keep a run count which may continue in the next chunk
+            tokens = block.rstrip('0123456789')
+            rest = block[len(tokens):]
+            block = tokens
+        else:
+            is_finished = True
+
+        for count, tag in _RLE_TOKEN.findall(block):
+            num_of_cells = int(count) if count else 1
+            if tag == '!':
+                is_finished = True
+                break
+            elif tag == '$':
+                row += num_of_cells
+                col = 0
+            elif tag in 'b.':
+                col += num_of_cells
+            else:
+                # `o`, or any other state of patterns with more than two states
+                if row >= pattern_height or col + num_of_cells > pattern_width:
+                    raise Exception("The RLE data is out of the pattern ({}x{}).".format(pattern_width, pattern_height))
+
+                start = row * width + col
+                res.extend(range(start, start + num_of_cells))
+                col += num_of_cells
+
+    return height, width, res, rule
+
+
+def _iter_runs(width: int, alive_indices: Iterable[int]) -> Iterator[Tuple[int, int]]:
+    """Yield the first flat index and the length of each run of alive cells on a row.
+    """
+    start = prev = None
+    for index in sorted(alive_indices):
+        if start is not None and index == prev + 1 and index % width:
+            prev = index
+            continue
+
+        if start is not None:
+            yield start, prev - start + 1
+        start = prev = index
+
+    if start is not None:
+        yield start, prev - start + 1
+
+
+def _iter_rle_tokens(width: int, alive_indices: Iterable[int]) -> Iterator[str]:
+    """Yield RLE tokens of the board, such as `3o` or `$`, up to the final `!`.
+    """
+    row = col = 0
+    for start, length in _iter_runs(width, alive_indices):
+        cur_row, cur_col = divmod(start, width)
+        if cur_row > row:
+            yield '{}$'.format(cur_row - row if cur_row - row > 1 else '')
+            row, col = cur_row, 0
+        if cur_col > col:
+            yield '{}b'.format(cur_col - col if cur_col - col > 1 else '')
+        yield '{}o'.format(length if length > 1 else '')
+        col = cur_col + length
+
+    yield '!'
+
+
+def write_rle(fp: TextIO, width: int, height: int, alive_indices: Iterable[int], rule: Rule = CONWAY):
+    """Write the board in the run length encoded (RLE) format.
+
+    Args:
+        fp: a stream to write to
+        width: a width of the board
+        height: a height of the board
+        alive_indices: flat indices (`row * width + column`) of alive cells
+        rule: the rule of the game
+    """
+    fp.write("x = {}, y = {}, rule = {}\n".format(width, height, rule))
+
+    line = []    # type: List[str]
+    line_length = 0
+    for token in _iter_rle_tokens(width, alive_indices):
+        if line_length + len(token) > MAX_LINE_LENGTH:
+            fp.write(''.join(line) + '\n')
+            line = []
+            line_length = 0
+        line.append(token)
+        line_length += len(token)
+
+    fp.write(''.join(line) + '\n')
+
+
+def read_macrocell(fp: TextIO, min_width: int = 1, min_height: int = 1) -> Tuple[int, int, array, Optional[Rule]]:
+    """Read a pattern in the Macrocell format, line by line.
+
+    The quadtree is expanded to flat indices without creating a cell object. If the file records its board (a
+    `#C board` line written by `write_macrocell`), alive cells are placed where they were on it, and otherwise the
+    bounding box of alive cells is placed at the top left corner of the board.
+
+    Args:
+        fp: a stream to read from
+        min_width: the minimum width of the board, which is the width of the pattern otherwise
+        min_height: the minimum height of the board, which is the height of the pattern otherwise
+
+    Returns:
+        the height and the width of the board, flat indices (`row * width + column`) of alive cells, and the rule of
+        the pattern (None if the file does not have one)
+    """
+    content = fp.readline()
+    if not content.startswith('[M2]'):
+        raise Exception("The first line of a Macrocell file is not in the correct format ({}).".format(
+            content.rstrip('\n')))
+
+    # a leaf is a list of alive (row, column) in its 8x8 cells, other nodes are (level, nw, ne, sw, se)
+    # and the node 0 is the empty node
+    nodes = [None]    # type: List
+    rule = None
+    board = None    # height, width, top and left of the recorded board
+    for content in fp:
+        content = content.strip()
+        if not content:
+            continue
+
+        if content.startswith('#'):
+            if content.startswith('#R'):
+                rule = _parse_rule(content[2:].strip())
+            match = _MACROCELL_BOARD.match(content)
+            if match is not None:
+                board = tuple(int(value) for value in match.groups())
+            continue
+
+        if content[0] in '.*$':
+            cells = []
+            row = col = 0
+            for char in content:
+                if char == '$':
+                    row += 1
+                    col = 0
+                    continue
+                if char == '*':
+                    cells.append((row, col))
+                col += 1
+            nodes.append(cells)
+            continue
+
+        tokens = content.split()
+        try:
+            node = tuple(int(token) for token in tokens)
+        except ValueError:
+            node = ()
+        if len(node) != 5 or node[0] < 4 or not all(0 <= child < len(nodes) for child in node[1:]):
+            raise Exception("The Macrocell node line is not in the correct format ({}).".format(content))
+        nodes.append(node)
+
+    rows = array('q')
+    columns = array('q')
+    stack = [(len(nodes) - 1, 0, 0)] if len(nodes) > 1 else []
+    while stack:
+        node_id, top, left = stack.pop()
+        node = nodes[node_id]
+        if isinstance(node, list):
+            for row, col in node:
+                rows.append(top + row)
+                columns.append(left + col)
+            continue
+
+        half = 1 << (node[0] - 1)
+        for child, (row, col) in zip(node[1:], ((0, 0), (0, half), (half, 0), (half, half))):
+            if child:
+                stack.append((child, top + row, left + col))
+
+    if board is not None:
+        board_height, board_width, top, left = board
+        if rows and (min(rows) < top or max(rows) >= top + board_height
+                     or min(columns) < left or max(columns) >= left + board_width):
+            raise Exception("Alive cells of the Macrocell file are out of the board ({}x{}).".format(
+                board_height, board_width))
+        width = max(board_width, min_width)
+        height = max(board_height, min_height)
+        return height, width, array('q', ((row - top) * width + col - left for row, col in zip(rows, columns))), rule
+
+    if not rows:
+        return min_height, min_width, array('q'), rule
+
+    top, left = min(rows), min(columns)
+    width = max(max(columns) - left + 1, min_width)
+    height = max(max(rows) - top + 1, min_height)
+    return height, width, array('q', ((row - top) * width + col - left for row, col in zip(rows, columns))), rule
+
+
+def write_macrocell(fp: TextIO, width: int, height: int, alive_indices: Iterable[int], rule: Rule = CONWAY):
+    """Write the board in the Macrocell format.
+
+    Identical squares of the board are written once, so a board with repeating structures is much smaller than in
+    other formats. The quadtree starts at the top left cell of the board, and the size of the board is recorded in a
+    `#C board` comment line (`#C board {height} {width} 0 0`), so that `read_macrocell` places cells back where they
+    were. Other programs ignore the comment.
+
+    Args:
+        fp: a stream to write to
+        width: a width of the board
+        height: a height of the board
+        alive_indices: flat indices (`row * width + column`) of alive cells
+        rule: the rule of the game
+    """
+    fp.write("[M2] (game-of-life)\n#R {}\n#C board {} {} 0 0\n".format(rule, height, width))
+    ids = {}    # type: Dict
+
+    def get_id(key, content: str) -> int:
+        """Return the line number of the node, writing it if it is new.
+        """
+        if key not in ids:
+            fp.write(content + '\n')
+            ids[key] = len(ids) + 1
+        return ids[key]
+
+    leaves = defaultdict(lambda: [['.'] * 8 for _ in range(8)])
+    for index in alive_indices:
+        row, col = divmod(index, width)
+        leaves[(row >> 3, col >> 3)][row & 7][col & 7] = '*'
+
+    nodes = {}    # type: Dict[Tuple[int, int], int]
+    for position, cells in sorted(leaves.items()):
+        content = ''.join(''.join(line).rstrip('.') + '$' for line in cells).rstrip('$') + '$'
+        nodes[position] = get_id(content, content)
+
+    if not nodes:
+        get_id('$', '$')
+        return
+
+    level = 3
+    while (1 << level) < max(width, height):
+        level += 1
+        parents = {}    # type: Dict[Tuple[int, int], int]
+        for row, col in sorted(set((row >> 1, col >> 1) for row, col in nodes)):
+            children = tuple(nodes.get((2 * row + i, 2 * col + j), 0) for i in (0, 1) for j in (0, 1))
+            parents[(row, col)] = get_id((level,) + children, '{} {} {} {} {}'.format(level, *children))
+        nodes = parents
@@ -0,0 +1,147 @@
+import sys
+import time
+
+from typing import Callable, List, Optional, TextIO
+
+try:
+    from .life import Life
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from life import Life
+
+
+ALIVE = 'o'
+DEAD = 'x'
+
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+
+
+def move_cursor(row: int, column: int) -> str:
+    """Return the ANSI escape sequence moving the cursor to `row` and `column` of the screen (starting from 1).
+    """
+    return '\x1b[{};{}H'.format(row, column)
+
+
+def format_board(game: Life) -> str:
+    """Return the current generation of `game` as text, with the generation number and separators around the board.
+    """
+    separator = "===" * game.grid_width
+    lines = ["Generation: {}".format(game.generation), separator]
+    lines.extend("  ".join([ALIVE if cell else DEAD for cell in row]) for row in game.grid)
+    lines.append(separator)
+    return '\n'.join(lines) + '\n'
+
+
+class Renderer:
+    """Draw boards of a game to a text stream, each frame with a single buffered write.
+
+    `render` is called after every generation, and frames are skipped to keep under `max_fps`. The simulation keeps
+    going while frames are skipped, and the last frame of a run is always drawn.
+
+    Attributes:
+        stream: the stream to write frames to
+        max_fps: the maximum number of frames per second (no limit if None)
+        num_of_frames: number of frames drawn
+        num_of_skipped_frames: number of frames skipped
+    """
+    stream = None
+    max_fps = None
+    num_of_frames = None
+    num_of_skipped_frames = None
+
+    def __init__(self,
+                 stream: Optional[TextIO] = None,
+                 max_fps: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.stream = stream or sys.stdout
+        self.max_fps = max_fps
+        self.num_of_frames = 0
+        self.num_of_skipped_frames = 0
+        self._clock = clock
+        self._last_drawn_at = None
+
+    def start(self):
+        """Begin a run of frames, after something else may have been printed.
+        """
+        self._last_drawn_at = None
+
+    def render(self, game: Life, is_last: bool = False):
+        """Draw the current generation of `game` unless the frame rate is over `max_fps`.
+
+        Args:
+            game: the game to draw
+            is_last: True for the last frame of a run, which is always drawn
+        """
+        now = self._clock()
+        if (not is_last and self.max_fps and self._last_drawn_at is not None
+                and now - self._last_drawn_at < 1 / self.max_fps):
+            self.num_of_skipped_frames += 1
+            return
+
+        self._last_drawn_at = now
+        self.num_of_frames += 1
+        self.stream.write(self.get_frame(game))
+        self.stream.flush()
+
+    def get_frame(self, game: Life) -> str:
+        """Return the text of a frame.
+        """
+        raise NotImplementedError
+
+
+class FullRenderer(Renderer):
+    """Print the whole board as text on every frame.
+    """
+    def get_frame(self, game: Life) -> str:
+        return '\n' + format_board(game)
+
+
+class QuietRenderer(FullRenderer):
+    """Print only the last board of a run.
+    """
+    def render(self, game: Life, is_last: bool = False):
+        if is_last:
+            super().render(game, is_last=is_last)
+        else:
+            self.num_of_skipped_frames += 1
+
+
+class DiffRenderer(Renderer):
+    """Draw the whole board once, then only redraw cells which changed since the previous frame.
+
+    The board is drawn from the top left corner of the terminal with ANSI escape sequences, so the terminal has to be
+    tall enough to show the whole board.
+    """
+    BYTES_PER_CHANGE = 10    # a cursor movement and a cell
+
+    _drawn = None    # flat indices of alive cells on the screen, None when the screen has to be redrawn
+
+    def start(self):
+        super().start()
+        self._drawn = None
+
+    def get_frame(self, game: Life) -> str:
+        alive_indices = set(game.get_alive_indices())
+        width = game.grid_width
+        # the generation line and a separator are above the board
+        below_board = game.grid_height + 4
+
+        changed = None if self._drawn is None else self._drawn ^ alive_indices
+        if changed is None:
+            res = [CLEAR_SCREEN, format_board(game)]    # type: List[str]
+        elif len(changed) * self.BYTES_PER_CHANGE > game.grid_width * game.grid_height * 3:
+            # moving the cursor to every changed cell takes more than drawing the whole board over
+            res = [move_cursor(1, 1), format_board(game)]
+        else:
+            res = [move_cursor(1, 1), "Generation: {}".format(game.generation)]
+            for index in changed:
+                row, col = divmod(index, width)
+                res.append(move_cursor(row + 3, col * 3 + 1))
+                res.append(ALIVE if index in alive_indices else DEAD)
+
+            res.append(move_cursor(below_board, 1))
+
+        self._drawn = alive_indices
+        return ''.join(res)
+
+
+RENDERERS = {'full': FullRenderer, 'diff': DiffRenderer, 'quiet': QuietRenderer}
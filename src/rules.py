@@ -0,0 +1,95 @@
+import re
+
+from typing import Iterable, Tuple
+
+
+_BS_NOTATION = re.compile(r'^b([0-8]*)/?s([0-8]*)$')    # e.g. B36/S23
+_SB_NOTATION = re.compile(r'^([0-8]*)/([0-8]*)$')    # e.g. 23/36, survivals first
+
+
+class Rule:
+    """A Life-like rule, where the next state of a cell only depends on its state and the number of alive neighbors.
+
+    The rule is compiled into lookup tables once, so engines never evaluate the conditions of the rule per cell.
+
+    Attributes:
+        births: numbers of alive neighbors which make a dead cell alive
+        survivals: numbers of alive neighbors which keep an alive cell alive
+        table: whether a cell is alive in the next generation, as `table[state][number of alive neighbors]` where the
+            state is 0 for a dead cell and 1 for an alive one
+        neighborhood_table: whether the center of a 3x3 neighborhood is alive in the next generation, indexed by the
+            neighborhood where the cell at (row, column) is bit `row * 3 + column` (512 bytes)
+        is_conway: True for B3/S23, which engines may apply with dedicated expressions faster than a lookup
+    """
+    births = None
+    survivals = None
+    table = None
+    neighborhood_table = None
+    is_conway = False
+
+    def __init__(self, births: Iterable[int], survivals: Iterable[int]):
+        births = frozenset(births)
+        survivals = frozenset(survivals)
+        if not births <= set(range(9)) or not survivals <= set(range(9)):
+            raise ValueError("Numbers of neighbors should be from 0 to 8 (births: {}, survivals: {})".format(
+                sorted(births), sorted(survivals)))
+        if 0 in births:
+            # every dead cell away from alive ones would be born, which the engines never visit
+            raise ValueError("Rules giving birth with no alive neighbor (B0) are not supported")
+
+        self.births = births
+        self.survivals = survivals
+        self.table = (tuple(count in births for count in range(9)), tuple(count in survivals for count in range(9)))
+
+        neighborhood_table = bytearray(512)
+        for neighborhood in range(512):
+            state = (neighborhood >> 4) & 1
+            num_of_alive_neighbors = bin(neighborhood & ~(1 << 4)).count('1')
+            neighborhood_table[neighborhood] = self.table[state][num_of_alive_neighbors]
+        self.neighborhood_table = bytes(neighborhood_table)
+
+        self.is_conway = births == {3} and survivals == {2, 3}
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and (self.births, self.survivals) == (other.births, other.survivals)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.births, self.survivals))
+
+    def __str__(self):
+        return 'B{}/S{}'.format(''.join(map(str, sorted(self.births))), ''.join(map(str, sorted(self.survivals))))
+
+    def __repr__(self):
+        return 'Rule({})'.format(self)
+
+    def __reduce__(self) -> Tuple:
+        # tables are compiled again instead of being pickled, e.g. for worker processes
+        return Rule, (tuple(sorted(self.births)), tuple(sorted(self.survivals)))
+
+
+def parse_rule(notation: str) -> Rule:
+    """Parse a rule in the B/S notation (e.g. `B36/S23`), or in the S/B notation (e.g. `23/36`).
+
+    Args:
+        notation: the rule, in any case
+
+    Returns:
+        the compiled rule
+    """
+    content = notation.strip().lower()
+    match = _BS_NOTATION.match(content)
+    if match is not None:
+        births, survivals = match.group(1), match.group(2)
+    else:
+        match = _SB_NOTATION.match(content)
+        if match is None:
+            raise ValueError("The rule is not in the B/S notation ({})".format(notation))
+        survivals, births = match.group(1), match.group(2)
+
+    return Rule(map(int, births), map(int, survivals))
+
+
+CONWAY = Rule((3,), (2, 3))
@@ -0,0 +1,496 @@
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    from .engines import ENGINES
+    from .game_of_life import FileParser
+    from .life import Life
+    from .rules import parse_rule
+except (ImportError, SystemError):    # run as a script from `src`
+    from engines import ENGINES
+    from game_of_life import FileParser
+    from life import Life
+    from rules import parse_rule
+
+
+class _Session:
+    """A game hosted by the server.
+
+    Attributes:
+        session_id: the id given to clients
+        game: the game, only touched by worker threads while `lock` is held
+        lock: serializes requests to the session, in the order they arrived
+        subscribers: connections receiving the births and deaths of every step
+        last_used_at: the time of the last request to the session, by the clock of the event loop
+        is_closed: True once the session is closed or evicted
+    """
+    def __init__(self, session_id: int, game: Life, now: float):
+        self.session_id = session_id
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.subscribers = set()    # type: Set[_Connection]
+        self.last_used_at = now
+        self.is_closed = False
+
+
+class _Connection:
+    """A client connection, writing one JSON line per message.
+    """
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.subscriptions = set()    # type: Set[int]
+
+    def send(self, line: bytes) -> bool:
+        """Write an encoded message without waiting for it to be sent.
+
+        Returns:
+            False if the client does not read its messages fast enough
+        """
+        if self.writer.transport.is_closing():
+            return False
+        self.writer.write(line)
+        return self.writer.transport.get_write_buffer_size() <= SimulationServer.MAX_PENDING_BYTES
+
+
+def encode_message(message: Dict) -> bytes:
+    """Encode a message as a JSON line.
+    """
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class SimulationServer:
+    """Host many games for clients connected to a Unix socket or to a local TCP port.
+
+    Clients send one JSON object per line, with an `op` and an `id` echoed in the response:
+
+    - `create`: create a session from `board`, a text in the format of `FileParser` (with optional `engine` and
+      `rule`), and return its `session` id
+    - `step`: proceed a session for `generations` (1 by default), and return its `generation` and `population`
+    - `query`: return the generation, the size, the population and the period of a session, with the flat indices of
+      its alive `cells` if `cells` is true
+    - `subscribe`: return alive `cells` of a session, and send the births and deaths of each of its following steps as
+      `delta` events (`from_generation`, `generation`, `births`, `deaths`)
+    - `unsubscribe`, `close`: stop receiving events of a session, or close it
+    - `stats`: return the numbers of sessions, evicted sessions and connections
+
+    A failed request is answered with an `error`. Games are stepped by a pool of worker threads, so the event loop keeps
+    serving other sessions, and requests to the same session are handled one at a time in the order they arrived.
+    Sessions without any request for `idle_seconds` are evicted, and their subscribers receive a `closed` event. A
+    subscriber which does not read its events is unsubscribed instead of buffering them without bound.
+
+    Attributes:
+        engine: the engine of sessions created without one
+        idle_seconds: sessions without any request for this time are evicted
+        max_sessions: the maximum number of sessions hosted at once
+        max_cells: the maximum number of cells of a board
+        sessions: sessions by id
+        num_of_evicted_sessions: number of sessions evicted for being idle
+    """
+    DEFAULT_IDLE_SECONDS = 300.0
+    DEFAULT_MAX_SESSIONS = 10000
+    DEFAULT_MAX_CELLS = 1 << 26
+    MAX_LINE_BYTES = 64 << 20    # the longest request, e.g. the board of `create`
+    MAX_PENDING_BYTES = 16 << 20    # messages not sent to a subscriber yet, over which it is unsubscribed
+    MAX_PENDING_REQUESTS = 64    # requests of a connection handled at once, before reading more of them
+
+    engine = None
+    idle_seconds = None
+    max_sessions = None
+    max_cells = None
+    sessions = None
+    num_of_evicted_sessions = None
+
+    def __init__(self,
+                 engine: str = Life.DEFAULT_ENGINE,
+                 workers: Optional[int] = None,
+                 idle_seconds: float = DEFAULT_IDLE_SECONDS,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 max_cells: int = DEFAULT_MAX_CELLS):
+        self._check_engine(engine)
+        self.engine = engine
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self.max_cells = max_cells
+        self.sessions = {}    # type: Dict[int, _Session]
+        self.num_of_evicted_sessions = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._session_ids = itertools.count(1)
+        self._connections = set()    # type: Set[_Connection]
+        self._server = None
+        self._sweeper = None
+
+    async def start(self, path: Optional[str] = None, host: str = '127.0.0.1', port: int = 0):
+        """Start listening on the Unix socket `path`, or on `host` and `port` if it is not given.
+
+        Args:
+            path: a path of the Unix socket, which is replaced if it exists
+            host: the address to listen on, which should be a local one
+            port: the port to listen on, any free one if 0
+        """
+        if path is not None:
+            if os.path.exists(path):
+                os.remove(path)
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=path, limit=self.MAX_LINE_BYTES)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host=host, port=port, limit=self.MAX_LINE_BYTES)
+        self._sweeper = asyncio.ensure_future(self._evict_idle_sessions())
+
+    @property
+    def address(self):
+        """The path of the Unix socket, or the host and the port listened on.
+        """
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        """Stop listening, disconnect clients and close every session.
+        """
+        self._server.close()
+        self._sweeper.cancel()
+        for connection in list(self._connections):
+            connection.writer.close()
+        await self._server.wait_closed()
+
+        for session in list(self.sessions.values()):
+            await self._remove_session(session, 'closed')
+        self._executor.shutdown()
+
+    @staticmethod
+    def _check_engine(engine: str):
+        if engine != Life.DEFAULT_ENGINE and engine not in ENGINES:
+            raise Exception("The engine is not supported ({}).".format(engine))
+
+    async def _run(self, func, *args):
+        """Run `func` in a worker thread, off the event loop.
+        """
+        return await asyncio.get_event_loop().run_in_executor(self._executor, func, *args)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = _Connection(writer)
+        self._connections.add(connection)
+        pending = asyncio.Semaphore(self.MAX_PENDING_REQUESTS)
+        tasks = set()
+        try:
+            while True:
+                await pending.acquire()
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    # a line over `MAX_LINE_BYTES`, or a connection reset by the client
+                    break
+                if not line:
+                    break
+
+                # requests are handled concurrently, and answered as soon as each of them is done
+                task = asyncio.ensure_future(self._respond(connection, line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                task.add_done_callback(lambda _: pending.release())
+        finally:
+            if tasks:
+                await asyncio.wait(tasks)
+            for session_id in connection.subscriptions:
+                session = self.sessions.get(session_id)
+                if session is not None:
+                    session.subscribers.discard(connection)
+            self._connections.discard(connection)
+            writer.close()
+
+    async def _respond(self, connection: _Connection, line: bytes):
+        request_id = None
+        try:
+            request = json.loads(line.decode('utf-8'))
+            if not isinstance(request, dict):
+                raise Exception("A request should be a JSON object ({}).".format(line.decode('utf-8').rstrip()))
+            request_id = request.get('id')
+            response = await self.handle_request(connection, request)
+        except Exception as e:
+            response = {'error': str(e) or type(e).__name__}
+        response['id'] = request_id
+
+        connection.send(encode_message(response))
+        try:
+            await connection.writer.drain()
+        except ConnectionError:
+            pass
+
+    async def handle_request(self, connection: _Connection, request: Dict) -> Dict:
+        """Handle a request, and return its response without the id.
+
+        Args:
+            connection: the connection of the client, which receives events of sessions it subscribes to
+            request: the decoded request, with its `op` and arguments
+
+        Returns:
+            the response
+        """
+        op = request.get('op')
+        if op == 'create':
+            return await self._create(request)
+        if op == 'stats':
+            return {'sessions': len(self.sessions), 'evicted': self.num_of_evicted_sessions,
+                    'connections': len(self._connections)}
+        if op not in ('step', 'query', 'subscribe', 'unsubscribe', 'close'):
+            raise Exception("The operation is not supported ({}).".format(op))
+
+        session = self.sessions.get(request.get('session'))
+        if session is None:
+            raise Exception("The session does not exist ({}).".format(request.get('session')))
+        session.last_used_at = asyncio.get_event_loop().time()
+
+        if op == 'unsubscribe':
+            session.subscribers.discard(connection)
+            connection.subscriptions.discard(session.session_id)
+            return {}
+        if op == 'close':
+            await self._remove_session(session, 'closed')
+            return {}
+
+        async with session.lock:
+            if session.is_closed:
+                raise Exception("The session is closed ({}).".format(session.session_id))
+
+            if op == 'step':
+                return await self._step(session, request.get('generations', 1))
+            if op == 'query':
+                return await self._run(self._get_state, session.game, bool(request.get('cells')))
+
+            # the cells are taken while the session is locked, so that the first event follows them
+            response = await self._run(self._get_state, session.game, True)
+            session.subscribers.add(connection)
+            connection.subscriptions.add(session.session_id)
+            return response
+
+    async def _create(self, request: Dict) -> Dict:
+        if len(self.sessions) >= self.max_sessions:
+            raise Exception("Too many sessions ({}).".format(len(self.sessions)))
+
+        board = request.get('board')
+        if not isinstance(board, str):
+            raise Exception("The board should be a text in the format of the input file.")
+        engine = request.get('engine') or self.engine
+        self._check_engine(engine)
+        rule = request.get('rule')
+        if rule is not None:
+            rule = parse_rule(rule)
+
+        game = await self._run(self._create_game, board, engine, rule)
+        session = _Session(next(self._session_ids), game, asyncio.get_event_loop().time())
+        self.sessions[session.session_id] = session
+        return {'session': session.session_id, 'generation': game.generation, 'width': game.grid_width,
+                'height': game.grid_height}
+
+    def _create_game(self, board: str, engine: str, rule) -> Life:
+        parser = FileParser()
+        parser.parse_from_stream(io.StringIO(board))
+        if parser.grid_width is None:
+            raise Exception("The board is empty.")
+        if parser.grid_width * parser.grid_height > self.max_cells:
+            raise Exception("The board is too large ({}x{}, at most {} cells).".format(
+                parser.grid_width, parser.grid_height, self.max_cells))
+
+        game = Life(engine=engine, rule=rule or parser.rule)
+        game.init_grid_from_indices(parser.grid_width, parser.grid_height, parser.alive_indices or [])
+        return game
+
+    async def _step(self, session: _Session, generations) -> Dict:
+        if not isinstance(generations, int) or generations < 1:
+            raise Exception("The number of generations should be a positive integer ({}).".format(generations))
+
+        from_generation = session.game.generation
+        population, delta = await self._run(self._proceed, session.game, generations, bool(session.subscribers))
+        session.last_used_at = asyncio.get_event_loop().time()
+
+        if delta is not None:
+            births, deaths = delta
+            self._publish(session, {'event': 'delta', 'session': session.session_id,
+                                    'from_generation': from_generation, 'generation': session.game.generation,
+                                    'births': births, 'deaths': deaths})
+        return {'generation': session.game.generation, 'population': population}
+
+    @staticmethod
+    def _proceed(game: Life, generations: int, with_delta: bool) -> Tuple[int, Optional[Tuple[List[int], List[int]]]]:
+        """Step a game, and return its population with the cells born and died if they are asked for.
+
+        Cells are compared in the worker thread, and not kept between steps: a session with subscribers takes no more
+        memory than others.
+        """
+        previous = set(game.get_alive_indices()) if with_delta else None
+        game.proceed_generations(generations)
+        alive_indices = game.get_alive_indices()
+        if previous is None:
+            return len(alive_indices), None
+
+        current = set(alive_indices)
+        return len(current), (sorted(current - previous), sorted(previous - current))
+
+    @staticmethod
+    def _get_state(game: Life, with_cells: bool) -> Dict:
+        alive_indices = game.get_alive_indices()
+        res = {'generation': game.generation, 'width': game.grid_width, 'height': game.grid_height,
+               'rule': str(game.rule), 'population': len(alive_indices), 'period': game.period}
+        if with_cells:
+            res['cells'] = sorted(alive_indices)
+        return res
+
+    def _publish(self, session: _Session, event: Dict):
+        """Send an event to every subscriber of a session, unsubscribing the ones falling behind.
+        """
+        line = encode_message(event)
+        for connection in list(session.subscribers):
+            if not connection.send(line):
+                session.subscribers.discard(connection)
+                connection.subscriptions.discard(session.session_id)
+                connection.send(encode_message({'event': 'unsubscribed', 'session': session.session_id,
+                                                'reason': 'lagging'}))
+
+    async def _remove_session(self, session: _Session, reason: str):
+        if session.is_closed:
+            return
+        session.is_closed = True
+        del self.sessions[session.session_id]
+
+        self._publish(session, {'event': 'closed', 'session': session.session_id, 'reason': reason})
+        for connection in session.subscribers:
+            connection.subscriptions.discard(session.session_id)
+        session.subscribers.clear()
+
+        async with session.lock:
+            # engines may hold worker processes
+            await self._run(session.game.close)
+
+    async def _evict_idle_sessions(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(min(self.idle_seconds / 2, 10.0))
+            now = loop.time()
+            for session in list(self.sessions.values()):
+                if now - session.last_used_at >= self.idle_seconds and not session.lock.locked():
+                    self.num_of_evicted_sessions += 1
+                    await self._remove_session(session, 'evicted')
+
+
+class SimulationClient:
+    """A client of `SimulationServer` over one connection.
+
+    Requests may be sent concurrently, and responses are matched to them by their id. Events of subscribed sessions
+    are put in `events`.
+
+    Attributes:
+        events: `delta`, `closed` and `unsubscribed` events, in the order they were received
+    """
+    events = None
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.events = asyncio.Queue()
+        self._reader = reader
+        self._writer = writer
+        self._request_ids = itertools.count(1)
+        self._pending = {}    # type: Dict[int, asyncio.Future]
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, path: Optional[str] = None, host: str = '127.0.0.1', port: int = 0) -> 'SimulationClient':
+        """Connect to the Unix socket `path`, or to `host` and `port` if it is not given.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=SimulationServer.MAX_LINE_BYTES)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=SimulationServer.MAX_LINE_BYTES)
+        return cls(reader, writer)
+
+    async def request(self, op: str, **kwargs) -> Dict:
+        """Send a request and wait for its response.
+
+        Args:
+            op: the operation, see `SimulationServer`
+            kwargs: arguments of the operation
+
+        Returns:
+            the response
+
+        Raises:
+            Exception: the error of a failed request
+        """
+        request_id = next(self._request_ids)
+        future = asyncio.Future()
+        self._pending[request_id] = future
+        kwargs.update(id=request_id, op=op)
+        self._writer.write(encode_message(kwargs))
+        await self._writer.drain()
+
+        response = await future
+        if 'error' in response:
+            raise Exception(response['error'])
+        return response
+
+    async def close(self):
+        self._writer.close()
+        await self._receiver
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+
+                message = json.loads(line.decode('utf-8'))
+                if 'event' in message:
+                    self.events.put_nowait(message)
+                else:
+                    future = self._pending.pop(message['id'], None)
+                    if future is not None and not future.done():
+                        future.set_result(message)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("The connection to the server is closed."))
+            self._pending.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host games of life for clients of a local socket.")
+    parser.add_argument('--socket', help="A path of the Unix socket to listen on, instead of a TCP port")
+    parser.add_argument('--host', default='127.0.0.1', help="The address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="The TCP port to listen on (default: 8765)")
+    parser.add_argument('--engine', default=Life.DEFAULT_ENGINE, choices=[Life.DEFAULT_ENGINE] + sorted(ENGINES),
+                        help="The engine of sessions created without one (default: {})".format(Life.DEFAULT_ENGINE))
+    parser.add_argument('--workers', type=int, help="The number of threads stepping games (default: number of CPUs)")
+    parser.add_argument('--idle-seconds', type=float, default=SimulationServer.DEFAULT_IDLE_SECONDS,
+                        help="Evict sessions without any request for this time (default: {:g})".format(
+                            SimulationServer.DEFAULT_IDLE_SECONDS))
+    parser.add_argument('--max-sessions', type=int, default=SimulationServer.DEFAULT_MAX_SESSIONS,
+                        help="The maximum number of sessions (default: {})".format(
+                            SimulationServer.DEFAULT_MAX_SESSIONS))
+    args = parser.parse_args()
+    if args.idle_seconds <= 0:
+        parser.error("--idle-seconds should be positive")
+
+    server = SimulationServer(engine=args.engine, workers=args.workers, idle_seconds=args.idle_seconds,
+                              max_sessions=args.max_sessions)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(server.start(path=args.socket, host=args.host, port=args.port))
+    print("Listening on {}".format(server.address), flush=True)
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.close())
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+import mmap
+import struct
+import sys
+
+from array import array
+from typing import Dict, Optional, Tuple
+
+try:
+    from .engines import import_numpy
+    from .life import Life
+    from .rules import Rule, parse_rule
+except (ImportError, SystemError):    # imported as a top-level module when running `src/game_of_life.py`
+    from engines import import_numpy
+    from life import Life
+    from rules import Rule, parse_rule
+
+
+MAGIC = b'GOLSNAP\0'
+VERSION = 2
+
+# magic, version, encoding, grid_height, grid_width, generation, number of alive cells (all little endian), and the
+# rule in the B/S notation padded with null bytes, which keeps the payload aligned to 64 bit words
+HEADER = struct.Struct('<8sIIQQQQ24s')
+# the header of the version 1, which did not record the rule
+HEADER_V1 = struct.Struct('<8sIIQQQQ')
+
+BITPACKED = 1    # rows of 64 bit words, where column `c` is bit `c % 64` of word `c // 64`
+COORDINATES = 2    # 64 bit flat indices (`row * grid_width + column`) of alive cells
+ENCODINGS = {'bitpacked': BITPACKED, 'coordinates': COORDINATES}
+
+
+def _get_payload_size(encoding: int, width: int, height: int, num_of_alive_cells: int) -> int:
+    """Return the number of bytes following the header.
+    """
+    if encoding == BITPACKED:
+        return height * ((width + 63) // 64) * 8
+    return num_of_alive_cells * 8
+
+
+def write_snapshot(file_name: str, game: Life, encoding: Optional[str] = None):
+    """Write the current generation of `game` to a binary snapshot.
+
+    A snapshot is a fixed size header followed by the alive cells, either as bit-packed rows or as packed coordinates.
+    Both are arrays of 64 bit words right after the 72 byte header, so they can be mapped without copying them.
+
+    Args:
+        file_name: a path of the snapshot
+        game: the game to record
+        encoding: `bitpacked` or `coordinates` (default: whichever is smaller)
+    """
+    header, payload = encode_snapshot(game, encoding)
+    with open(file_name, 'wb') as fp:
+        fp.write(header)
+        fp.write(payload)
+
+
+def encode_snapshot(game: Life, encoding: Optional[str] = None) -> Tuple[bytes, memoryview]:
+    """Return the header and the payload of a snapshot of the current generation of `game`.
+
+    The payload may share memory with the board of the engine, so it should be copied to be kept across generations.
+
+    Args:
+        game: the game to record
+        encoding: `bitpacked` or `coordinates` (default: whichever is smaller)
+
+    Returns:
+        the header, and the payload as a view of bytes
+    """
+    width, height = game.grid_width, game.grid_height
+    alive_indices = game.get_alive_indices()
+
+    if encoding is None:
+        bitpacked_size = _get_payload_size(BITPACKED, width, height, len(alive_indices))
+        encoding = 'bitpacked' if bitpacked_size <= len(alive_indices) * 8 else 'coordinates'
+    if encoding not in ENCODINGS:
+        raise ValueError("Unknown snapshot encoding ({})".format(encoding))
+
+    if ENCODINGS[encoding] == BITPACKED:
+        payload = game.get_bitpacked_rows()
+    else:
+        payload = array('Q', sorted(alive_indices))
+        if sys.byteorder != 'little':
+            payload.byteswap()
+
+    if not isinstance(payload, (array, bytearray)):
+        # numpy arrays, which are written as they are laid out in memory
+        payload = import_numpy().ascontiguousarray(payload, dtype='<u8')
+
+    header = HEADER.pack(MAGIC, VERSION, ENCODINGS[encoding], height, width, game.generation, len(alive_indices),
+                         str(game.rule).encode('ascii'))
+    return header, memoryview(payload).cast('B')
+
+
+def load_snapshot(file_name: str,
+                  engine: str = Life.DEFAULT_ENGINE,
+                  engine_options: Optional[Dict] = None,
+                  rule: Optional[Rule] = None) -> Life:
+    """Create a game from a binary snapshot written by `write_snapshot`.
+
+    The file is memory-mapped, and engines storing bit-packed rows use the mapped rows as their board. The game
+    continues under the rule recorded in the snapshot (Conway's for snapshots of the version 1), unless `rule` is given.
+
+    Args:
+        file_name: a path of the snapshot
+        engine: name of the engine stepping the board
+        engine_options: keyword arguments given to the engine
+        rule: the rule stepping the board, which overrides the rule of the snapshot
+
+    Returns:
+        the game at the generation of the snapshot
+    """
+    with open(file_name, 'rb') as fp:
+        try:
+            mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # an empty file cannot be mapped
+            mapped = b''
+
+    if len(mapped) < HEADER_V1.size:
+        raise Exception("The snapshot is too short ({} bytes).".format(len(mapped)))
+
+    magic, version, encoding, height, width, generation, num_of_alive_cells = HEADER_V1.unpack_from(mapped)
+    if magic != MAGIC:
+        raise Exception("The file is not a snapshot ({}).".format(file_name))
+    if version == 1:
+        header_size = HEADER_V1.size
+        stored_rule = None
+    elif version == VERSION:
+        if len(mapped) < HEADER.size:
+            raise Exception("The snapshot is too short ({} bytes).".format(len(mapped)))
+        header_size = HEADER.size
+        stored_rule = HEADER.unpack_from(mapped)[-1].rstrip(b'\0').decode('ascii', 'replace')
+    else:
+        raise Exception("The snapshot version is not supported ({}).".format(version))
+    if encoding not in ENCODINGS.values():
+        raise Exception("The snapshot encoding is not supported ({}).".format(encoding))
+
+    payload_size = _get_payload_size(encoding, width, height, num_of_alive_cells)
+    if len(mapped) != header_size + payload_size:
+        raise Exception("The snapshot is truncated ({} bytes, expected: {}).".format(
+            len(mapped), header_size + payload_size))
+
+    if rule is None and stored_rule is not None:
+        try:
+            rule = parse_rule(stored_rule)
+        except ValueError:
+            raise Exception("The rule of the snapshot is not supported ({}).".format(stored_rule))
+
+    try:
+        np = import_numpy()
+    except ImportError:
+        np = None
+
+    game = Life(engine=engine, engine_options=engine_options, rule=rule)
+    if encoding == BITPACKED:
+        if np is not None:
+            payload = np.frombuffer(mapped, dtype='<u8', count=payload_size // 8, offset=header_size)
+            payload = payload.reshape(height, -1)
+        else:
+            payload = memoryview(mapped)[header_size:]
+        game.init_grid_from_bitpacked(width, height, payload)
+    else:
+        if np is not None:
+            payload = np.frombuffer(mapped, dtype='<u8', count=num_of_alive_cells, offset=header_size)
+            highest = payload.max() if num_of_alive_cells else 0
+        else:
+            payload = array('Q')
+            payload.frombytes(mapped[header_size:])
+            if sys.byteorder != 'little':
+                payload.byteswap()
+            highest = max(payload, default=0)
+
+        if highest >= width * height:
+            raise Exception("The snapshot has alive cells out of the grid ({}).".format(highest))
+        game.init_grid_from_indices(width, height, payload)
+
+    game.generation = generation
+    return game
@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+from unittest import TestCase
+
+from src.batch import find_input_files, run_batch
+from src.game_of_life import FileParser
+
+
+class TestRunBatch(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+        # a blinker at a different column on each board
+        for i in range(4):
+            with open(os.path.join(self.directory, 'board{}.txt'.format(i)), 'w') as fp:
+                fp.write("40 80\n3\n5 {0}\n5 {1}\n5 {2}\n".format(i, i + 1, i + 2))
+
+    def test_find_input_files(self):
+        """Check a directory takes all of its files and a glob pattern only the matched ones.
+        """
+        self.assertEqual(len(find_input_files(self.directory)), 4)
+        self.assertEqual(find_input_files(os.path.join(self.directory, '*[13].txt')),
+                         [os.path.join(self.directory, 'board1.txt'), os.path.join(self.directory, 'board3.txt')])
+        self.assertEqual(find_input_files(os.path.join(self.directory, '*.rle')), [])
+
+    def test_run_batch(self):
+        """Check every board is proceeded in worker processes and its result is written.
+        """
+        with open(os.path.join(self.directory, 'broken.txt'), 'w') as fp:
+            fp.write("40\n")
+
+        output_folder = os.path.join(self.directory, 'results')
+        summary = run_batch(find_input_files(self.directory), 3, output_folder, jobs=2)
+
+        self.assertEqual((summary['boards'], summary['failures']), (4, 1))
+        self.assertGreater(summary['generations_per_second'], 0)
+        self.assertEqual(sorted(os.listdir(output_folder)), ['board{}.txt'.format(i) for i in range(4)])
+
+        parser = FileParser()
+        parser.parse_from_file(os.path.join(output_folder, 'board2.txt'))
+        # the blinker is vertical after an odd number of generations
+        self.assertEqual(sorted(parser.alive_indices), [4 * 80 + 3, 5 * 80 + 3, 6 * 80 + 3])
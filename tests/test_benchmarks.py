@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from benchmarks.compare import compare
+from benchmarks.corpus import get_alive_indices
+from benchmarks.run import run_case
+
+
+class TestBenchmarks(TestCase):
+    def test_patterns_are_centered(self):
+        """Check a pattern of the corpus is placed at the center of the board.
+        """
+        # the R-pentomino is `.oo / oo. / .o.`
+        self.assertEqual(sorted(get_alive_indices('r-pentomino', 10, 10)), [34, 35, 43, 44, 54])
+
+    def test_run_case(self):
+        """Check a benchmark reports its throughput and peak memory.
+        """
+        result = run_case('step', 'dict', 'acorn', '80x40', generations=3, min_seconds=0, directory='')
+
+        self.assertEqual((result['size'], result['alive_cells'], result['generations']), ('80x40', 7, 3))
+        self.assertGreater(result['generations_per_second'], 0)
+        self.assertAlmostEqual(result['cells_per_second'], result['generations_per_second'] * 80 * 40)
+        self.assertGreater(result['peak_memory_bytes'], 0)
+
+    def test_compare(self):
+        """Check a slower or larger case is reported as a regression.
+        """
+        def create_result(cells_per_second: float, peak_memory_bytes: int):
+            return {'results': [{'benchmark': 'step', 'engine': 'dict', 'case': 'acorn', 'size': '80x40',
+                                 'cells_per_second': cells_per_second, 'peak_memory_bytes': peak_memory_bytes}]}
+
+        base = create_result(100.0, 1000)
+        self.assertFalse(compare(base, create_result(95.0, 1050))[0]['is_regression'])
+        self.assertTrue(compare(base, create_result(80.0, 1000))[0]['is_regression'])
+        self.assertTrue(compare(base, create_result(100.0, 1200))[0]['is_regression'])
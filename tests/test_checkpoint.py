@@ -0,0 +1,121 @@
+import io
+import os
+import random
+import tempfile
+
+from unittest import TestCase
+
+from src.checkpoint import Checkpointer, list_checkpoints, load_latest_checkpoint
+from src.game_of_life import StdoutInterface
+from src.life import Life
+from src.renderer import QuietRenderer
+
+
+# an R-pentomino, which keeps changing for more than a thousand generations
+R_PENTOMINO = [(10, 21), (10, 22), (11, 20), (11, 21), (12, 21)]
+
+
+def create_game(engine: str = Life.DEFAULT_ENGINE) -> Life:
+    game = Life(engine=engine)
+    game.init_grid_from_indices(80, 40, [row * 80 + col for row, col in R_PENTOMINO])
+    return game
+
+
+def create_soup(rule: str) -> Life:
+    rand = random.Random(3)
+    game = Life(rule=rule)
+    game.init_grid_from_indices(80, 40, [index for index in range(80 * 40) if rand.random() < 0.3])
+    return game
+
+
+class FakeClock:
+    """A clock advancing by `tick` seconds every time it is read.
+    """
+    def __init__(self, tick: float):
+        self.now = 0
+        self.tick = tick
+
+    def __call__(self) -> float:
+        self.now += self.tick
+        return self.now
+
+
+class TestCheckpointer(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def run_game(self, game: Life, num_of_generation: int, checkpointer: Checkpointer) -> Life:
+        interface = StdoutInterface(renderer=QuietRenderer(stream=io.StringIO()), checkpointer=checkpointer)
+        interface.cur_game = game
+        interface.process_generation(num_of_generation)
+        checkpointer.close()
+        return game
+
+    def test_every(self):
+        """Check a checkpoint is written every K generations, and only the latest ones are kept.
+        """
+        checkpointer = Checkpointer(self.directory, every=10, keep=2)
+        self.run_game(create_game(), 35, checkpointer)
+
+        # a checkpoint still waiting for the writer is replaced by the next one, but the last one is always written
+        generations = [generation for generation, _ in list_checkpoints(self.directory)]
+        self.assertIn(generations, ([20, 30], [10, 30], [30]))
+        self.assertEqual(checkpointer.num_of_checkpoints + checkpointer.num_of_dropped_checkpoints, 3)
+        self.assertEqual(checkpointer.last_generation, 30)
+        self.assertEqual(len(os.listdir(self.directory)), len(generations))
+
+    def test_seconds(self):
+        """Check a checkpoint is written when the time has passed.
+        """
+        # the clock is read when the checkpointer is created, for every generation and for every checkpoint taken
+        checkpointer = Checkpointer(self.directory, seconds=2.5, clock=FakeClock(1))
+        self.run_game(create_game(), 7, checkpointer)
+
+        self.assertEqual(checkpointer.last_generation, 6)
+
+    def test_resume(self):
+        """Check resuming from the latest valid checkpoint ends at the same state as an uninterrupted run.
+        """
+        expected = create_game()
+        expected.proceed_generations(100)
+
+        self.run_game(create_game(), 60, Checkpointer(self.directory, every=25))
+        # a checkpoint broken by a crash is skipped and removed
+        with open(os.path.join(self.directory, 'checkpoint_000000000055.snap'), 'wb') as fp:
+            fp.write(b'GOLSNAP\0')
+
+        game = load_latest_checkpoint(self.directory)
+        self.assertEqual(game.generation, 50)
+        self.assertEqual(list_checkpoints(self.directory)[-1][0], 50)
+
+        self.run_game(game, 50, Checkpointer(self.directory, every=25))
+        self.assertEqual(sorted(game.get_alive_indices()), sorted(expected.get_alive_indices()))
+
+    def test_resume_rule(self):
+        """Check a game is resumed under the rule it was checkpointed with.
+        """
+        expected = create_soup('B36/S23')
+        expected.proceed_generations(40)
+
+        self.run_game(create_soup('B36/S23'), 20, Checkpointer(self.directory, every=10))
+        game = load_latest_checkpoint(self.directory)
+        self.assertEqual(str(game.rule), 'B36/S23')
+
+        self.run_game(game, 20, Checkpointer(self.directory, every=10))
+        self.assertEqual(sorted(game.get_alive_indices()), sorted(expected.get_alive_indices()))
+
+    def test_jump(self):
+        """Check an engine jumping over generations stops at every checkpoint.
+        """
+        checkpointer = Checkpointer(self.directory, every=16, keep=10)
+        self.run_game(create_game(engine='hashlife'), 50, checkpointer)
+
+        generations = [generation for generation, _ in list_checkpoints(self.directory)]
+        self.assertEqual(generations[-1], 48)
+        self.assertTrue(set(generations) <= {16, 32, 48})
+        self.assertEqual(checkpointer.num_of_checkpoints + checkpointer.num_of_dropped_checkpoints, 3)
+
+    def test_no_checkpoint(self):
+        self.assertIsNone(load_latest_checkpoint(self.directory))
@@ -0,0 +1,121 @@
+import os
+import random
+import tempfile
+
+from unittest import TestCase
+
+from src.deltalog import DeltaLogReader, DeltaLogWriter, record_game
+from src.life import Life
+
+WIDTH, HEIGHT = 80, 40
+
+
+def create_soup(engine: str = Life.DEFAULT_ENGINE, seed: int = 1) -> Life:
+    rand = random.Random(seed)
+    alive_indices = [index for index in range(WIDTH * HEIGHT) if rand.random() < 0.3]
+    game = Life(engine=engine)
+    game.init_grid_from_indices(WIDTH, HEIGHT, alive_indices)
+    return game
+
+
+class TestIterGenerations(TestCase):
+    def test_deltas(self):
+        """Check the yielded births and deaths give every generation of the game, whatever the engine is.
+        """
+        for engine in (Life.DEFAULT_ENGINE, 'sparse'):
+            game = create_soup(engine)
+            expected = create_soup()
+            alive = set(game.get_alive_indices())
+            for generation, births, deaths in game.iter_generations(30):
+                expected.proceed_generation()
+                self.assertEqual(generation, expected.generation)
+                self.assertFalse(births & alive)
+                self.assertTrue(deaths <= alive)
+                alive = (alive - deaths) | births
+                self.assertEqual(alive, set(expected.get_alive_indices()), engine)
+            self.assertEqual(game.generation, 30)
+
+    def test_lazy(self):
+        """Check generations are only stepped as they are asked for.
+        """
+        game = create_soup()
+        iterator = game.iter_generations(10)
+        self.assertEqual(game.generation, 0)
+        next(iterator)
+        self.assertEqual(game.generation, 1)
+        iterator.close()
+        self.assertFalse(game._is_keeping_delta)
+
+    def test_still_life(self):
+        """Check a still life yields empty deltas once it is detected.
+        """
+        game = Life.from_coordinates(WIDTH, HEIGHT, [1, 1, 2, 2], [1, 2, 1, 2])
+        self.assertEqual([(births, deaths) for _, births, deaths in game.iter_generations(4)], [(set(), set())] * 4)
+
+
+class TestDeltaLog(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'run.delta')
+
+    def test_replay(self):
+        """Check every generation of a recorded run is played back without simulating it.
+        """
+        game = create_soup()
+        game.generation = 7
+        expected = [(7, set(game.get_alive_indices()))]
+        with DeltaLogWriter(self.path, game) as writer:
+            for generation, births, deaths in game.iter_generations(50):
+                writer.write(generation, births, deaths)
+                expected.append((generation, set(game.get_alive_indices())))
+
+        with DeltaLogReader(self.path) as reader:
+            self.assertEqual((reader.grid_width, reader.grid_height, reader.generation), (WIDTH, HEIGHT, 7))
+            self.assertEqual([(generation, set(alive)) for generation, alive in reader.iter_alive_indices()],
+                             expected)
+
+            replayed = reader.replay(30, engine='sparse')
+            self.assertEqual((replayed.generation, set(replayed.get_alive_indices())), expected[23])
+            self.assertEqual(reader.replay().generation, 57)
+            with self.assertRaises(ValueError):
+                reader.replay(100)
+
+    def test_skipped_generations(self):
+        game = create_soup()
+        with DeltaLogWriter(self.path, game) as writer:
+            previous = set(game.get_alive_indices())
+            game.proceed_generations(5)
+            current = set(game.get_alive_indices())
+            writer.write(game.generation, current - previous, previous - current)
+            with self.assertRaises(ValueError):
+                writer.write(5, [], [])
+
+        with DeltaLogReader(self.path) as reader:
+            self.assertEqual([generation for generation, _, _ in reader], [5])
+            self.assertEqual(set(reader.replay(5).get_alive_indices()), current)
+
+    def test_incomplete_record(self):
+        """Check a log which is still written is read up to its last complete record.
+        """
+        record_game(self.path, create_soup(), 10)
+        with open(self.path, 'rb') as fp:
+            data = fp.read()
+        with open(self.path, 'wb') as fp:
+            fp.write(data[:-3])
+
+        with DeltaLogReader(self.path) as reader:
+            self.assertEqual([generation for generation, _, _ in reader], list(range(1, 10)))
+
+    def test_compact(self):
+        """Check a record takes a couple of bytes per changed cell, much less than the board.
+        """
+        num_of_changes = sum(len(births) + len(deaths) for _, births, deaths in create_soup().iter_generations(100))
+        record_game(self.path, create_soup(), 100)
+        self.assertLess(os.path.getsize(self.path), 2 * num_of_changes + 2 * WIDTH * HEIGHT // 8)
+
+    def test_not_a_delta_log(self):
+        with open(self.path, 'wb') as fp:
+            fp.write(b'\0' * 64)
+        with self.assertRaisesRegex(Exception, r"^The file is not a delta log"):
+            DeltaLogReader(self.path)
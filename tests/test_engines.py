@@ -0,0 +1,392 @@
+import os
+import random
+import tempfile
+
+from typing import Dict, List, Optional
+from unittest import TestCase, mock, skipIf
+
+from src import blocktable
+from src.hashlife import HashlifeEngine
+from src.life import CellIndex, Life
+from src.rules import CONWAY, parse_rule
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def create_game(engine: str, num_of_rows: int, num_of_cols: int, alive_cells: List[CellIndex],
+                engine_options: Optional[Dict] = None) -> Life:
+    """Create a game whose grid is smaller than the minimum size.
+
+    Args:
+        engine: name of the engine
+        num_of_rows: total number of rows of the game board
+        num_of_cols: total number of columns of the game board
+        alive_cells: list of initial alive cells
+        engine_options: keyword arguments given to the engine
+
+    Returns:
+        the initialized game
+    """
+    game = Life(engine=engine, engine_options=engine_options)
+    # for the test purpose, change the min size
+    game.MIN_GRID_HEIGHT = 2
+    game.MIN_GRID_WIDTH = 2
+    game.init_grid(width=num_of_cols, height=num_of_rows, init_alive_cells=alive_cells)
+    return game
+
+
+class EngineTestMixin:
+    """Checks shared by every engine: each one must match the built-in `dict` engine.
+    """
+    engine = None
+    engine_options = None
+
+    def check_same_as_dict_engine(self, num_of_rows: int, num_of_cols: int, alive_cells: List[CellIndex],
+                                  num_of_generation: int):
+        """Proceed both engines for `num_of_generation` and compare them after every generation.
+
+        Args:
+            num_of_rows: total number of rows of the game board
+            num_of_cols: total number of columns of the game board
+            alive_cells: list of initial alive cells
+            num_of_generation: total number of generation to go
+        """
+        expected = create_game(Life.DEFAULT_ENGINE, num_of_rows, num_of_cols, list(alive_cells))
+        actual = create_game(self.engine, num_of_rows, num_of_cols, list(alive_cells), self.engine_options)
+        self.addCleanup(actual.close)
+
+        for _ in range(num_of_generation):
+            expected.proceed_generation()
+            actual.proceed_generation()
+
+            self.assertEqual(actual.generation, expected.generation)
+            self.assertEqual(set(actual.alive_cells), set(expected.alive_cells))
+            actual_grid = actual.grid
+            for row in range(num_of_rows):
+                for col in range(num_of_cols):
+                    self.assertEqual(bool(actual_grid[row][col]), expected.grid[row][col])
+
+    def test_blinker_on_the_edge(self):
+        """Check a blinker touching the edge of the grid.
+        """
+        self.check_same_as_dict_engine(5, 6, [CellIndex(1, 0), CellIndex(2, 0), CellIndex(3, 0)], 3)
+
+    def test_glider_hitting_the_corner(self):
+        """Check a glider running into the bottom right corner of the grid.
+        """
+        glider = [CellIndex(0, 1), CellIndex(1, 2), CellIndex(2, 0), CellIndex(2, 1), CellIndex(2, 2)]
+        self.check_same_as_dict_engine(8, 9, glider, 30)
+
+    def test_random_board(self):
+        """Check a random soup for several generations.
+        """
+        rand = random.Random(7)
+        num_of_rows, num_of_cols = 23, 70
+        alive_cells = [CellIndex(row, col)
+                       for row in range(num_of_rows) for col in range(num_of_cols) if rand.random() < 0.3]
+        self.check_same_as_dict_engine(num_of_rows, num_of_cols, alive_cells, 20)
+
+    def test_changes(self):
+        """Check the cells born and died reported by the engine match the ones of the built-in `dict` engine.
+        """
+        rand = random.Random(9)
+        num_of_rows, num_of_cols = 23, 70
+        alive_cells = [CellIndex(row, col)
+                       for row in range(num_of_rows) for col in range(num_of_cols) if rand.random() < 0.3]
+        expected = create_game(Life.DEFAULT_ENGINE, num_of_rows, num_of_cols, list(alive_cells))
+        actual = create_game(self.engine, num_of_rows, num_of_cols, list(alive_cells), self.engine_options)
+        self.addCleanup(actual.close)
+
+        self.assertEqual(list(actual.iter_generations(20)), list(expected.iter_generations(20)))
+
+        # nothing changes in a still life
+        block = [CellIndex(1, 1), CellIndex(1, 2), CellIndex(2, 1), CellIndex(2, 2)]
+        actual = create_game(self.engine, 5, 6, block, self.engine_options)
+        self.addCleanup(actual.close)
+        self.assertEqual(list(actual.iter_generations(2)), [(1, set(), set()), (2, set(), set())])
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestNumpyEngine(EngineTestMixin, TestCase):
+    engine = 'numpy'
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestBitboardEngine(EngineTestMixin, TestCase):
+    engine = 'bitboard'
+
+    def test_cells_across_words(self):
+        """Check cells on both sides of a word boundary, and on the last column of the last word.
+        """
+        alive_cells = [CellIndex(1, 62), CellIndex(1, 63), CellIndex(1, 64), CellIndex(1, 65),
+                       CellIndex(4, 127), CellIndex(5, 127), CellIndex(6, 127)]
+        self.check_same_as_dict_engine(8, 128, alive_cells, 4)
+
+    def test_grid_view(self):
+        """Check the packed grid can be read like the list-of-lists grid.
+        """
+        game = create_game(self.engine, 3, 70, [CellIndex(2, 69), CellIndex(0, 0)])
+
+        self.assertEqual(len(game.grid), 3)
+        self.assertTrue(game.grid[2][69])
+        self.assertTrue(game.grid[2][-1])
+        self.assertFalse(game.grid[2][68])
+        self.assertEqual(list(game.grid[0]), [True] + [False] * 69)
+        with self.assertRaises(IndexError):
+            game.grid[0][70]
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestParallelEngine(EngineTestMixin, TestCase):
+    engine = 'parallel'
+    engine_options = {'workers': 3}
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestParallelEngineInProcess(EngineTestMixin, TestCase):
+    engine = 'parallel'
+    engine_options = {'workers': 1}
+
+
+class TestSparseEngine(EngineTestMixin, TestCase):
+    engine = 'sparse'
+
+    def test_huge_board(self):
+        """Check a glider on a board far too large to allocate densely.
+        """
+        size = 1000000
+        glider = [CellIndex(0, 1), CellIndex(1, 2), CellIndex(2, 0), CellIndex(2, 1), CellIndex(2, 2)]
+        game = create_game(self.engine, size, size, glider)
+
+        game.proceed_generations(4)
+
+        # a glider moves by one cell diagonally every 4 generations
+        self.assertEqual(set(game.alive_cells), set(CellIndex(cell.row + 1, cell.column + 1) for cell in glider))
+        self.assertEqual(len(game.grid), size)
+        self.assertTrue(game.grid[3][3])
+        self.assertFalse(game.grid[size - 1][size - 1])
+
+
+class TestIncrementalEngine(EngineTestMixin, TestCase):
+    engine = 'incremental'
+
+    def test_stable_area_is_skipped(self):
+        """Check only the neighborhood of a blinker is re-evaluated next to a block.
+        """
+        block = [CellIndex(1, 1), CellIndex(1, 2), CellIndex(2, 1), CellIndex(2, 2)]
+        blinker = [CellIndex(6, 6), CellIndex(6, 7), CellIndex(6, 8)]
+        game = create_game(self.engine, 10, 10, block + blinker)
+
+        game.proceed_generation()
+        self.assertEqual(game.get_engine_stats()['skipped_cells'], 0)
+
+        game.proceed_generation()
+        stats = game.get_engine_stats()
+        # neighborhoods of the 4 cells of the blinker which changed
+        self.assertEqual(stats['evaluated_cells'], 21)
+        # the block and its 12 neighbors
+        self.assertEqual(stats['skipped_cells'], 16)
+
+
+class TestAdaptiveEngine(EngineTestMixin, TestCase):
+    engine = 'adaptive'
+    engine_options = {'check_every': 1, 'min_generations': 0}
+
+    def test_switches(self):
+        """Check dying dominoes switch to the sparse engine, and a grown population switches back to the dense one.
+        """
+        glider = [CellIndex(0, 1), CellIndex(1, 2), CellIndex(2, 0), CellIndex(2, 1), CellIndex(2, 2)]
+        # every domino dies in the first generation
+        dominoes = [CellIndex(row, column + offset)
+                    for row in range(10, 500, 5) for column in range(10, 500, 5) for offset in (0, 1)]
+        alive_cells = glider + dominoes
+        expected = create_game(Life.DEFAULT_ENGINE, 512, 512, list(alive_cells))
+        game = create_game(self.engine, 512, 512, list(alive_cells), {'check_every': 4, 'min_generations': 8})
+        engine = game._engine
+        if numpy is None:
+            self.assertEqual(engine.backend.name, 'sparse')
+            return
+
+        self.assertEqual(engine.backend.name, 'bitboard')
+        expected.proceed_generations(8)
+        game.proceed_generations(8)
+        self.assertEqual(engine.backend.name, 'sparse')
+        self.assertEqual([(switch['generation'], switch['from'], switch['to'], switch['population'])
+                          for switch in engine.switches], [(4, 'bitboard', 'sparse', 5)])
+        self.assertEqual(set(game.alive_cells), set(expected.alive_cells))
+
+        # as if the population grew until the sparse engine is slower
+        engine._sparse_seconds_per_cell = 1.0
+        game.proceed_generations(8)
+        expected.proceed_generations(8)
+        self.assertEqual(engine.backend.name, 'bitboard')
+        self.assertEqual(game.get_engine_stats(), {'switches': 2, 'dense_generations': 8, 'sparse_generations': 8})
+        self.assertEqual(set(game.alive_cells), set(expected.alive_cells))
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_activity(self):
+        """Check a dense but static board switches to a sparse engine following the activity, but not to one following
+        the population.
+        """
+        blocks = [CellIndex(row + i, column + j)
+                  for row in range(0, 252, 4) for column in range(0, 252, 4) for i in (0, 1) for j in (0, 1)]
+        for sparse, expected in (('sparse', []), ('incremental', [(4, 'bitboard', 'incremental', len(blocks), 0)])):
+            options = {'sparse': sparse, 'check_every': 4, 'min_generations': 0}
+            game = create_game(self.engine, 256, 256, blocks, options)
+            self.addCleanup(game.close)
+            # a still life is not stepped anymore once it is detected
+            game.detect_cycles = False
+            game.proceed_generations(8)
+
+            engine = game._engine
+            self.assertEqual([(switch['generation'], switch['from'], switch['to'], switch['population'],
+                               switch['activity']) for switch in engine.switches], expected)
+            self.assertEqual(set(game.alive_cells), set(blocks))
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_hysteresis(self):
+        """Check an engine switched to is kept for `min_generations` generations, however faster the other one is.
+        """
+        game = create_game(self.engine, 64, 64, [CellIndex(1, 1), CellIndex(1, 2), CellIndex(1, 3)],
+                           {'check_every': 1, 'min_generations': 100})
+        game.detect_cycles = False
+        engine = game._engine
+        self.assertEqual(engine.backend.name, 'sparse')
+        engine._dense_seconds = 0.0
+        game.proceed_generations(1)
+        self.assertEqual(engine.backend.name, 'bitboard')
+
+        engine._sparse_seconds_per_cell = 0.0
+        game.proceed_generations(99)
+        self.assertEqual(engine.backend.name, 'bitboard')
+        game.proceed_generations(1)
+        self.assertEqual([switch['generation'] for switch in engine.switches], [1, 101])
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestBlockTableEngine(EngineTestMixin, TestCase):
+    engine = 'table'
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_dir = directory.name
+        self.engine_options = {'cache_dir': self.cache_dir}
+
+    def test_table(self):
+        """Check entries of the table against the rule, for a block and for a blinker.
+        """
+        table = blocktable.build_block_table(CONWAY)
+        self.assertEqual(len(table), 1 << 16)
+        # a block in the center stays
+        self.assertEqual(table[0b0000011001100000], 0b1111)
+        # a horizontal blinker on the second row becomes vertical in the second column
+        self.assertEqual(table[0b0000000001110000], 0b0101)
+        self.assertEqual(table[0], 0)
+
+    def test_cached_on_disk(self):
+        """Check a table is built once per rule, and loaded from the disk afterwards.
+        """
+        rule = parse_rule('B36/S23')
+        blocktable._tables.pop(rule, None)
+        table = blocktable.get_block_table(rule, self.cache_dir)
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, 'block_B36_S23.bin')))
+
+        blocktable._tables.pop(rule, None)
+        with mock.patch.object(blocktable, 'build_block_table') as build_block_table:
+            self.assertEqual(blocktable.get_block_table(rule, self.cache_dir), table)
+        build_block_table.assert_not_called()
+
+        # a broken file is built again
+        with open(os.path.join(self.cache_dir, 'block_B36_S23.bin'), 'wb') as fp:
+            fp.write(b'broken')
+        blocktable._tables.pop(rule, None)
+        self.assertEqual(blocktable.get_block_table(rule, self.cache_dir), table)
+
+    def test_odd_sizes(self):
+        """Check boards of odd and tiny sizes, where blocks cross the edges of the grid.
+        """
+        rand = random.Random(3)
+        for num_of_rows, num_of_cols in ((2, 2), (3, 2), (7, 5), (11, 13)):
+            alive_cells = [CellIndex(row, col)
+                           for row in range(num_of_rows) for col in range(num_of_cols) if rand.random() < 0.5]
+            self.check_same_as_dict_engine(num_of_rows, num_of_cols, alive_cells, 6)
+
+
+class TestHashlifeEngine(EngineTestMixin, TestCase):
+    engine = 'hashlife'
+
+    def check_jump(self, num_of_rows: int, num_of_cols: int, alive_cells: List[CellIndex], num_of_generation: int,
+                   max_nodes: int = HashlifeEngine.DEFAULT_MAX_NODES):
+        """Jump `num_of_generation` generations at once and compare with stepping through them.
+
+        Args:
+            num_of_rows: total number of rows of the game board
+            num_of_cols: total number of columns of the game board
+            alive_cells: list of initial alive cells
+            num_of_generation: total number of generation to go
+            max_nodes: the node cap of the hashlife engine
+        """
+        expected = create_game(Life.DEFAULT_ENGINE, num_of_rows, num_of_cols, list(alive_cells))
+        expected.proceed_generations(num_of_generation)
+
+        actual = Life(engine=self.engine, engine_options={'max_nodes': max_nodes})
+        actual.MIN_GRID_HEIGHT = 2
+        actual.MIN_GRID_WIDTH = 2
+        actual.init_grid(width=num_of_cols, height=num_of_rows, init_alive_cells=list(alive_cells))
+        self.assertTrue(actual.can_jump)
+        actual.proceed_generations(num_of_generation)
+
+        self.assertEqual(actual.generation, num_of_generation)
+        self.assertEqual(set(actual.alive_cells), set(expected.alive_cells))
+        return actual
+
+    def test_jump_random_board(self):
+        """Check a jump which is not a power of two on a random soup.
+        """
+        rand = random.Random(3)
+        num_of_rows, num_of_cols = 30, 45
+        alive_cells = [CellIndex(row, col)
+                       for row in range(num_of_rows) for col in range(num_of_cols) if rand.random() < 0.35]
+        self.check_jump(num_of_rows, num_of_cols, alive_cells, 157)
+
+    def test_jump_with_garbage_collection(self):
+        """Check results do not change when the node table is collected during the jump.
+        """
+        rand = random.Random(5)
+        num_of_rows, num_of_cols = 20, 20
+        alive_cells = [CellIndex(row, col)
+                       for row in range(num_of_rows) for col in range(num_of_cols) if rand.random() < 0.4]
+        game = self.check_jump(num_of_rows, num_of_cols, alive_cells, 95, max_nodes=50)
+        self.assertGreater(game.get_engine_stats()['garbage_collections'], 0)
+
+    def test_node_table_is_capped_during_a_jump(self):
+        """Check a jump which would fill the node table is split, so the table never grows over `max_nodes`.
+        """
+        rand = random.Random(5)
+        num_of_rows, num_of_cols = 32, 32
+        alive_cells = [CellIndex(row, col)
+                       for row in range(num_of_rows) for col in range(num_of_cols) if rand.random() < 0.4]
+        sizes = []
+        join = HashlifeEngine._join
+
+        def record_size(engine, *quadrants):
+            node = join(engine, *quadrants)
+            sizes.append(len(engine._table))
+            return node
+
+        with mock.patch.object(HashlifeEngine, '_join', record_size):
+            game = self.check_jump(num_of_rows, num_of_cols, alive_cells, 200, max_nodes=8000)
+        self.assertGreater(game.get_engine_stats()['split_jumps'], 0)
+        self.assertLessEqual(max(sizes), 8000)
+
+
+class TestEngineSelection(TestCase):
+    def test_unknown_engine(self):
+        """Check an unknown engine is rejected when the game is constructed.
+        """
+        with self.assertRaises(ValueError):
+            Life(engine='unknown')
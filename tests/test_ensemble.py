@@ -0,0 +1,101 @@
+from unittest import TestCase, skipIf
+
+from src.ensemble import Ensemble
+from src.life import Life
+from src.rules import parse_rule
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def create_game(width: int, height: int, alive_indices, rule) -> Life:
+    """Create a game of the dict engine, whose grid may be smaller than the minimum size.
+    """
+    game = Life(rule=rule)
+    # for the test purpose, change the min size
+    game.MIN_GRID_HEIGHT = 2
+    game.MIN_GRID_WIDTH = 2
+    game.init_grid_from_indices(width, height, alive_indices)
+    return game
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestEnsemble(TestCase):
+    def assert_same_as_life(self, ensemble: Ensemble, num_of_generation: int):
+        """Check every board of the ensemble is stepped like a game of the same board, until it is retired.
+        """
+        games = [create_game(ensemble.width, ensemble.height, ensemble.get_alive_indices(i), ensemble.rule)
+                 for i in range(ensemble.num_of_boards)]
+        for _ in range(num_of_generation):
+            was_active = ensemble.is_active.copy()
+            ensemble.proceed_generation()
+            for i, game in enumerate(games):
+                if was_active[i]:
+                    game.proceed_generation()
+                self.assertEqual(ensemble.get_alive_indices(i), sorted(game.get_alive_indices()),
+                                 "board {} at generation {}".format(i, ensemble.generation))
+                self.assertEqual(ensemble.populations[i], len(game.get_alive_indices()))
+
+    def test_same_as_life(self):
+        for rule in ('B3/S23', 'B36/S23', 'B2/S0'):
+            for max_period in (0, 2):
+                ensemble = Ensemble.random(6, 20, 11, density=0.35, seed=1, rule=rule, max_period=max_period)
+                self.assert_same_as_life(ensemble, 30)
+
+    def test_retirement(self):
+        """Check boards which died out, became still or oscillated are retired with their periods.
+        """
+        ensemble = Ensemble.from_alive_indices(80, 40, [
+            [0],    # dies out after a generation
+            [81, 82, 161, 162],    # a block
+            [161, 162, 163],    # a blinker
+            [1, 82, 160, 161, 162],    # a glider, which stays active until it reaches the edge
+        ])
+        ensemble.proceed_generations(4)
+
+        self.assertEqual(ensemble.is_active.tolist(), [False, False, False, True])
+        self.assertEqual(ensemble.retired_at.tolist(), [2, 1, 2, -1])
+        self.assertEqual(ensemble.periods.tolist(), [1, 1, 2, 0])
+        self.assertEqual(ensemble.num_of_active_boards, 1)
+        self.assertEqual(ensemble.get_alive_indices(1), [81, 82, 161, 162])
+        self.assertEqual(ensemble.populations.tolist()[:3], [0, 4, 3])
+
+        # the blinker is kept as it was when it was retired
+        self.assertEqual(ensemble.get_alive_indices(2), [161, 162, 163])
+        self.assertEqual(ensemble.to_life(2).generation, 2)
+
+    def test_compaction(self):
+        """Check active boards are still stepped correctly once retired boards are dropped, until every board is.
+        """
+        ensemble = Ensemble.random(40, 13, 7, density=0.4, seed=5)
+        self.assert_same_as_life(ensemble, 60)
+        self.assertLess(len(ensemble._board_ids), ensemble.num_of_boards)
+
+        ensemble.proceed_generations(1000)
+        self.assertEqual(ensemble.generation, 1060)
+        self.assertEqual(ensemble.boards.shape, (40, 7, 13))
+
+    def test_boards_are_not_copied(self):
+        ensemble = Ensemble.random(3, 80, 40, seed=2)
+        ensemble.proceed_generation()
+        self.assertTrue(numpy.shares_memory(ensemble.get_board(1), ensemble.boards))
+        self.assertEqual(ensemble.populations.tolist(), [int(board.sum()) for board in ensemble.boards])
+
+    def test_to_life(self):
+        ensemble = Ensemble.random(2, 80, 40, seed=3, rule='B36/S23')
+        ensemble.proceed_generations(5)
+        game = ensemble.to_life(1, engine='numpy')
+        self.assertEqual((game.generation, game.rule), (5, parse_rule('B36/S23')))
+        self.assertEqual(sorted(game.get_alive_indices()), ensemble.get_alive_indices(1))
+
+        game.proceed_generation()
+        ensemble.proceed_generation()
+        self.assertEqual(sorted(game.get_alive_indices()), ensemble.get_alive_indices(1))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Ensemble(numpy.zeros((4, 4)))
+        with self.assertRaises(ValueError):
+            Ensemble(numpy.zeros((1, 4, 4)), max_period=-1)
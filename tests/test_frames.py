@@ -0,0 +1,158 @@
+import io
+import os
+import random
+import struct
+import tempfile
+import zlib
+
+from typing import Dict, List, Set, Tuple
+from unittest import TestCase
+
+from src.frames import FrameWriter
+from src.game_of_life import StdoutInterface
+from src.life import Life
+from src.renderer import QuietRenderer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def read_chunks(path: str) -> List[Tuple[bytes, bytes]]:
+    """Return the type and the data of every chunk of a PNG file, checking their CRC.
+    """
+    with open(path, 'rb') as fp:
+        data = fp.read()
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+
+    chunks = []
+    position = 8
+    while position < len(data):
+        length, = struct.unpack('>I', data[position:position + 4])
+        chunk_type = data[position + 4:position + 8]
+        chunk_data = data[position + 8:position + 8 + length]
+        crc, = struct.unpack('>I', data[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(chunk_type + chunk_data), chunk_type
+        chunks.append((chunk_type, chunk_data))
+        position += 12 + length
+    return chunks
+
+
+def decode_pixels(header: bytes, compressed: bytes) -> Set[Tuple[int, int]]:
+    """Return (row, column) of black pixels of an image of 1 bit per pixel, without filters.
+    """
+    width, height, depth, color_type = struct.unpack('>IIBB', header[:10])
+    assert (depth, color_type) == (1, 3)
+    data = zlib.decompress(compressed)
+    num_of_line_bytes = (width + 7) // 8 + 1
+    assert len(data) == height * num_of_line_bytes
+
+    pixels = set()
+    for row in range(height):
+        line = data[row * num_of_line_bytes:(row + 1) * num_of_line_bytes]
+        assert line[0] == 0
+        for column in range(width):
+            if line[1 + column // 8] & (0x80 >> (column % 8)):
+                pixels.add((row, column))
+    return pixels
+
+
+def scale_cells(alive_indices: List[int], width: int, scale: int) -> Set[Tuple[int, int]]:
+    return {(row * scale + i, column * scale + j)
+            for row, column in (divmod(index, width) for index in alive_indices)
+            for i in range(scale) for j in range(scale)}
+
+
+def create_soup(engine: str = Life.DEFAULT_ENGINE, width: int = 81, height: int = 41) -> Life:
+    rand = random.Random(5)
+    game = Life(engine=engine)
+    game.init_grid_from_indices(width, height, [index for index in range(width * height) if rand.random() < 0.3])
+    return game
+
+
+class TestFrameWriter(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def run_game(self, game: Life, num_of_generation: int, frame_writer: FrameWriter) -> Dict[int, List[int]]:
+        """Step `game` with the frame writer, and return alive cells of every generation.
+        """
+        states = {game.generation: game.get_alive_indices()}
+        frame_writer.update(game)
+        for _ in range(num_of_generation):
+            game.proceed_generation()
+            frame_writer.update(game)
+            states[game.generation] = game.get_alive_indices()
+        frame_writer.close()
+        return states
+
+    def test_images(self):
+        """Check a PNG image is written for every other generation, with a cell per 3x3 pixels.
+        """
+        path = os.path.join(self.directory, 'frames')
+        frame_writer = FrameWriter(path, every=2, scale=3)
+        states = self.run_game(create_soup(), 6, frame_writer)
+
+        self.assertEqual(sorted(os.listdir(path)), ['generation_{:08d}.png'.format(i) for i in (0, 2, 4, 6)])
+        self.assertEqual(frame_writer.num_of_frames, 4)
+        for generation in (0, 2, 4, 6):
+            chunks = dict(read_chunks(os.path.join(path, 'generation_{:08d}.png'.format(generation))))
+            self.assertEqual(struct.unpack('>II', chunks[b'IHDR'][:8]), (81 * 3, 41 * 3))
+            self.assertEqual(chunks[b'PLTE'], bytes((255, 255, 255, 0, 0, 0)))
+            self.assertEqual(decode_pixels(chunks[b'IHDR'], chunks[b'IDAT']), scale_cells(states[generation], 81, 3))
+
+    def test_animation(self):
+        """Check an animated PNG has every frame in order, and its number of frames.
+        """
+        path = os.path.join(self.directory, 'run.apng')
+        states = self.run_game(create_soup('sparse' if numpy is None else 'bitboard'), 5, FrameWriter(path))
+
+        chunks = read_chunks(path)
+        types = [chunk_type for chunk_type, _ in chunks]
+        self.assertEqual(types[:4], [b'IHDR', b'acTL', b'PLTE', b'fcTL'])
+        self.assertEqual(types[-1], b'IEND')
+        self.assertEqual(struct.unpack('>II', dict(chunks)[b'acTL']), (6, 0))
+
+        header = dict(chunks)[b'IHDR']
+        frames = [data for chunk_type, data in chunks if chunk_type == b'IDAT']
+        frames += [data[4:] for chunk_type, data in chunks if chunk_type == b'fdAT']
+        self.assertEqual(len(frames), 6)
+        for generation, compressed in enumerate(frames):
+            self.assertEqual(decode_pixels(header, compressed), scale_cells(states[generation], 81, 1))
+
+        # sequence numbers of frame controls and frame data follow each other
+        sequence_numbers = [struct.unpack('>I', data[:4])[0] for chunk_type, data in chunks
+                            if chunk_type in (b'fcTL', b'fdAT')]
+        self.assertEqual(sequence_numbers, list(range(11)))
+
+    def test_non_interactive_run(self):
+        """Check the non-interactive run writes the initial board, and stops at frames while it jumps.
+        """
+        path = os.path.join(self.directory, 'frames')
+        interface = StdoutInterface(renderer=QuietRenderer(stream=io.StringIO()), frame_writer=FrameWriter(path, every=8))
+        interface.cur_game = create_soup('hashlife', 80, 40)
+        interface.frame_writer.update(interface.cur_game)
+        interface.process_generation(20)
+        interface.frame_writer.close()
+
+        self.assertEqual(sorted(os.listdir(path)), ['generation_{:08d}.png'.format(i) for i in (0, 8, 16)])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            FrameWriter(os.path.join(self.directory, 'frames'), every=0)
+        with self.assertRaises(ValueError):
+            FrameWriter(os.path.join(self.directory, 'frames'), scale=0)
+
+    def test_error(self):
+        """Check an error of the writer thread is raised to the caller.
+        """
+        path = os.path.join(self.directory, 'run.png')
+        frame_writer = FrameWriter(path)
+        frame_writer.take(create_soup())
+        frame_writer.take(create_soup(width=90))
+        with self.assertRaisesRegex(Exception, r"^Frames of an animation should have the same size"):
+            frame_writer.close()
+
@@ -0,0 +1,110 @@
+import io
+import os
+import tempfile
+
+from unittest import TestCase, mock
+
+from src.game_of_life import FileParser
+from src.life import CellIndex
+
+
+class TestParseFromStream(TestCase):
+    def parse(self, contents: str, chunk_size: int = FileParser.CHUNK_SIZE, has_numpy: bool = True) -> FileParser:
+        """Parse `contents` in chunks of `chunk_size` characters.
+
+        Args:
+            contents: contents of an input file
+            chunk_size: number of characters read at once
+            has_numpy: False to parse as if numpy is not installed
+
+        Returns:
+            the parser holding the result
+        """
+        fp = FileParser()
+        fp.CHUNK_SIZE = chunk_size
+        if has_numpy:
+            fp.parse_from_stream(io.StringIO(contents))
+        else:
+            with mock.patch('src.game_of_life.import_numpy', side_effect=ImportError):
+                fp.parse_from_stream(io.StringIO(contents))
+        return fp
+
+    def test_parse(self):
+        """Check the size and alive cells are parsed, whatever the chunk size is.
+        """
+        contents = "5 6\n4\n1 1\n2 1\n2 2\n2 3\n"
+        for chunk_size in (1, 3, 7, FileParser.CHUNK_SIZE):
+            fp = self.parse(contents, chunk_size)
+
+            self.assertEqual((fp.grid_height, fp.grid_width), (5, 6))
+            self.assertEqual(fp.alive_indices, [7, 13, 14, 15])
+            self.assertEqual(fp.alive_cells, [CellIndex(1, 1), CellIndex(2, 1), CellIndex(2, 2), CellIndex(2, 3)])
+
+    def test_parse_without_the_last_new_line(self):
+        """Check the last line is parsed even if the file does not end with a new line.
+        """
+        self.assertEqual(self.parse("5 6\n2\n1 1\n4 5", chunk_size=4).alive_indices, [7, 29])
+
+    def test_rest_of_lines_are_ignored(self):
+        """Check lines after the number of alive cells are ignored, even if they are malformed.
+        """
+        self.assertEqual(self.parse("5 6\n1\n1 1\nnot a cell\n").alive_indices, [7])
+
+    def test_malformed_header(self):
+        """Check malformed header lines are reported.
+        """
+        with self.assertRaisesRegex(Exception, r"^The first data line is not in the correct format \(5\)\.$"):
+            self.parse("5\n1\n1 1\n")
+
+        with self.assertRaisesRegex(Exception, r"^The second data line is not in the correct format \(x\)\.$"):
+            self.parse("5 6\nx\n1 1\n")
+
+    def test_malformed_alive_cell_line(self):
+        """Check the malformed line is reported.
+        """
+        for line in ("1 x", "1", "1 2 3", ""):
+            with self.assertRaisesRegex(
+                    Exception,
+                    r"^The initial alive cell index data line is not in the correct format \({}\)\.$".format(line)):
+                self.parse("5 6\n3\n1 1\n{}\n2 2\n".format(line))
+
+    def test_malformed_lines_of_two_tokens_in_total(self):
+        """Check lines are checked one by one, even when their tokens add up to two per line, with or without numpy.
+        """
+        for lines, malformed in ((["1 2 3", "4"], "1 2 3"), (["1  2", "3 4"], "1  2"), (["1\t2", "3 4"], "1\t2"),
+                                 (["1\t2 3", " 4"], "1\t2 3")):
+            for has_numpy in (True, False):
+                with self.assertRaisesRegex(
+                        Exception,
+                        r"^The initial alive cell index data line is not in the correct format \({}\)\.$".format(
+                            malformed)):
+                    self.parse("5 6\n2\n{}\n".format('\n'.join(lines)), has_numpy=has_numpy)
+
+    def test_whitespace_around_alive_cell_lines(self):
+        """Check whitespace around a line is ignored like in a line by line parsing, with or without numpy.
+        """
+        for has_numpy in (True, False):
+            fp = self.parse("5 6\n3\n 1 1\r\n\t2 3 \n+0 -0\n", has_numpy=has_numpy)
+            self.assertEqual(fp.alive_indices, [7, 15, 0])
+
+    def test_alive_cell_out_of_the_grid(self):
+        """Check alive cells are checked against the size of the grid.
+        """
+        with self.assertRaisesRegex(Exception, r"^The initial alive cell index data line is out of the grid \(5 0\)"):
+            self.parse("5 6\n2\n1 1\n5 0\n")
+
+        with self.assertRaisesRegex(Exception, r"out of the grid \(0 -1\)"):
+            self.parse("5 6\n1\n0 -1\n")
+
+    def test_parse_from_any_path(self):
+        """Check a file outside of the shared folder can be parsed.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'input.txt')
+            with open(path, 'w') as fp:
+                fp.write("5 6\n1\n4 5\n")
+
+            parser = FileParser()
+            parser.parse_from_file(path)
+
+        self.assertEqual(parser.alive_indices, [29])
@@ -0,0 +1,99 @@
+from unittest import TestCase
+
+from src.history import History
+from src.life import Life
+
+
+# an R-pentomino, which keeps changing for more than a thousand generations
+R_PENTOMINO = [(10, 21), (10, 22), (11, 20), (11, 21), (12, 21)]
+
+
+def create_game(engine: str = Life.DEFAULT_ENGINE) -> Life:
+    game = Life(engine=engine)
+    game.init_grid_from_indices(80, 40, [row * 80 + col for row, col in R_PENTOMINO])
+    return game
+
+
+def get_generations(num_of_generation: int):
+    """Return alive cells of every generation of the R-pentomino, stepped without history.
+    """
+    game = create_game()
+    res = [sorted(game.get_alive_indices())]
+    for _ in range(num_of_generation):
+        game.proceed_generation()
+        res.append(sorted(game.get_alive_indices()))
+    return res
+
+
+class TestHistory(TestCase):
+    def test_restore(self):
+        """Check every generation is restored from keyframes and deltas.
+        """
+        expected = get_generations(30)
+        game = create_game()
+        game.enable_history(keyframe_every=8)
+        game.proceed_generations(30)
+
+        history = game.history
+        self.assertEqual((history.oldest_generation, history.newest_generation, len(history)), (0, 30, 31))
+        for generation in range(31):
+            self.assertEqual(history.get_alive_indices(generation), expected[generation])
+        # a keyframe and 8 deltas in each segment
+        self.assertEqual(len(history._segments), 4)
+
+    def test_budget(self):
+        """Check the oldest generations are forgotten over the budget, a whole segment at a time.
+        """
+        game = create_game()
+        game.enable_history(budget_bytes=8 * 1024, keyframe_every=16)
+        game.proceed_generations(80)
+
+        history = game.history
+        self.assertLessEqual(history.num_of_bytes, 8 * 1024)
+        self.assertEqual(history.newest_generation, 80)
+        self.assertGreater(history.oldest_generation, 0)
+        self.assertEqual(history.get_alive_indices(80), sorted(game.get_alive_indices()))
+        with self.assertRaises(ValueError):
+            history.get_alive_indices(0)
+
+    def test_rewind(self):
+        """Check a game goes back to a generation, and steps the same generations again from it.
+        """
+        expected = get_generations(40)
+        for engine in (Life.DEFAULT_ENGINE, 'sparse'):
+            game = create_game(engine=engine)
+            game.enable_history(keyframe_every=16)
+            game.proceed_generations(40)
+
+            game.rewind(25)
+            self.assertEqual(game.generation, 25)
+            self.assertEqual(sorted(game.get_alive_indices()), expected[25])
+            # generations after it are kept until another generation is stepped
+            game.rewind(40)
+            self.assertEqual(sorted(game.get_alive_indices()), expected[40])
+
+            game.rewind(10)
+            game.proceed_generations(5)
+            self.assertEqual(sorted(game.get_alive_indices()), expected[15])
+            self.assertEqual(game.history.newest_generation, 15)
+            game.close()
+
+    def test_jump(self):
+        """Check generations skipped by a jump are not kept, and the history starts again after it.
+        """
+        history = History()
+        history.add_keyframe(0, [1, 2])
+        history.add_delta(1, [3], [1])
+        self.assertTrue(history.needs_keyframe(5))
+
+        history.add_keyframe(5, [7])
+        self.assertEqual((history.oldest_generation, history.newest_generation), (5, 5))
+        with self.assertRaises(ValueError):
+            history.add_delta(7, [], [])
+
+    def test_new_board(self):
+        game = create_game()
+        game.enable_history()
+        game.proceed_generation()
+        game.init_grid_from_indices(80, 40, [0])
+        self.assertEqual(len(game.history), 0)
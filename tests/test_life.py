@@ -1,7 +1,14 @@
+import sys
+
 from typing import List
-from unittest import TestCase
+from unittest import TestCase, mock, skipIf
+
+from src.life import CellIndex, Life, get_fingerprint
 
-from src.life import CellIndex, Life
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 class TestGetNeighbors(TestCase):
     def setUp(self):
@@ -420,4 +427,218 @@ class TestProceedGeneration(TestCase):
         self.check_result(num_of_rows=num_of_rows, 
                           num_of_cols=num_of_cols, 
                           exp_alive_cells=exp_alive_cells,
-                          generation=1)
\ No newline at end of file
+                          generation=1)
+
+class TestGetRandomInitStates(TestCase):
+    def test_same_seed_gives_same_cells(self):
+        """Check the seed makes the random cells reproducible.
+        """
+        self.assertEqual(Life.get_random_init_states(80, 40, density=0.2, seed=1),
+                         Life.get_random_init_states(80, 40, density=0.2, seed=1))
+        self.assertNotEqual(Life.get_random_init_states(80, 40, density=0.2, seed=1),
+                            Life.get_random_init_states(80, 40, density=0.2, seed=2))
+
+    def test_cells_are_distinct_and_inside_of_the_grid(self):
+        """Check every random cell is distinct and inside of the grid.
+        """
+        cells = Life.get_random_init_states(80, 40, density=0.5, seed=3)
+
+        self.assertEqual(len(set(cells)), len(cells))
+        for cell in cells:
+            self.assertTrue(0 <= cell.row < 40 and 0 <= cell.column < 80)
+
+    def test_density(self):
+        """Check the number of alive cells follows the density.
+        """
+        self.assertEqual(Life.get_random_init_states(80, 40, density=0, seed=4), [])
+        self.assertEqual(len(Life.get_random_init_states(80, 40, density=1, seed=4)), 80 * 40)
+
+        number_of_cells = 1000 * 1000
+        count = sum(len(chunk) for chunk in Life.iter_random_alive_indices(1000, 1000, 0.25, seed=5))
+        self.assertAlmostEqual(count / number_of_cells, 0.25, places=2)
+
+    def test_chunks(self):
+        """Check chunks are bounded and increasing.
+        """
+        chunks = list(Life.iter_random_alive_indices(100, 100, 0.3, seed=6, chunk_size=100))
+        indices = [index for chunk in chunks for index in chunk]
+
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertEqual(indices, sorted(set(indices)))
+
+    def test_start_game_with_seed(self):
+        """Check a random game is reproducible from its seed.
+        """
+        games = [Life(), Life()]
+        for game in games:
+            game.start_game(seed=7)
+
+        self.assertEqual(games[0].grid_width, games[1].grid_width)
+        self.assertEqual(games[0].grid_height, games[1].grid_height)
+        self.assertEqual(games[0].alive_cells, games[1].alive_cells)
+
+
+class TestBulkConstructors(TestCase):
+    def setUp(self):
+        # for the test purpose, change the min size
+        self.min_sizes = Life.MIN_GRID_HEIGHT, Life.MIN_GRID_WIDTH
+        Life.MIN_GRID_HEIGHT = 2
+        Life.MIN_GRID_WIDTH = 2
+
+    def tearDown(self):
+        Life.MIN_GRID_HEIGHT, Life.MIN_GRID_WIDTH = self.min_sizes
+
+    def test_from_coordinates(self):
+        """Check a game created from coordinates matches the one created from `CellIndex` objects.
+        """
+        game = Life.from_coordinates(6, 5, [1, 2, 2, 2], [1, 1, 2, 3])
+
+        self.assertEqual((game.grid_width, game.grid_height), (6, 5))
+        self.assertEqual(set(game.alive_cells), {CellIndex(1, 1), CellIndex(2, 1), CellIndex(2, 2), CellIndex(2, 3)})
+        self.assertTrue(game.grid[2][3])
+        self.assertFalse(game.grid[3][2])
+
+        game.proceed_generation()
+        self.assertEqual(set(game.alive_cells), {CellIndex(1, 1), CellIndex(2, 1), CellIndex(2, 2), CellIndex(3, 2)})
+
+    def test_from_array(self):
+        """Check a game created from a list of rows.
+        """
+        game = Life.from_array([
+            [0, 1, 0],
+            [0, 1, 0],
+            [0, 1, 0],
+        ], engine='sparse')
+
+        self.assertEqual((game.grid_width, game.grid_height), (3, 3))
+        self.assertEqual(game.get_alive_indices(), [1, 4, 7])
+
+        game.proceed_generation()
+        self.assertEqual(game.get_alive_indices(), [3, 4, 5])
+
+
+class TestBufferExport(TestCase):
+    def create_game(self, engine: str) -> Life:
+        game = Life.from_coordinates(81, 40, [1, 2, 3, 7, 39], [5, 5, 5, 80, 0], engine=engine)
+        game.proceed_generation()
+        return game
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_array_interface(self):
+        """Check the board is exported as a read-only array of cells, whatever the engine is.
+        """
+        for engine in (Life.DEFAULT_ENGINE, 'sparse', 'numpy', 'bitboard', 'table', 'hashlife'):
+            game = self.create_game(engine)
+            cells = numpy.asarray(game)
+            self.assertEqual((cells.shape, cells.dtype), ((40, 81), numpy.uint8), engine)
+            self.assertEqual(numpy.flatnonzero(cells).tolist(), game.get_alive_indices(), engine)
+            self.assertFalse(cells.flags.writeable, engine)
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_zero_copy(self):
+        """Check the board of the numpy engine is exported without copying it.
+        """
+        game = self.create_game('numpy')
+        self.assertTrue(numpy.shares_memory(numpy.asarray(game), game._engine.board))
+
+    def test_cell_buffer(self):
+        """Check the exported buffer is read-only and has every cell, with or without numpy.
+        """
+        for has_numpy in (True, False) if numpy is not None else (False,):
+            game = self.create_game(Life.DEFAULT_ENGINE)
+            if has_numpy:
+                view = game._get_cell_buffer()
+            else:
+                with mock.patch('src.life.import_numpy', side_effect=ImportError):
+                    view = game._get_cell_buffer()
+
+            self.assertEqual((view.shape, view.format, view.readonly), ((40, 81), 'B', True))
+            self.assertEqual([index for index, cell in enumerate(view.tobytes()) if cell], game.get_alive_indices())
+            with self.assertRaises(TypeError):
+                view[0, 0] = 1
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_board_stays_writable(self):
+        """Check exporting the board of the numpy engine does not make the board itself read-only.
+        """
+        game = self.create_game('numpy')
+        numpy.asarray(game)
+        self.assertTrue(game._engine.board.flags.writeable)
+
+    @skipIf(sys.version_info < (3, 12), "the buffer protocol of Python classes needs Python 3.12")
+    def test_memoryview(self):
+        game = self.create_game(Life.DEFAULT_ENGINE)
+        view = memoryview(game)
+        self.assertEqual((view.shape, view.format, view.readonly), ((40, 81), 'B', True))
+        self.assertEqual([index for index, cell in enumerate(view.tobytes()) if cell], game.get_alive_indices())
+
+
+class TestCycleDetection(TestCase):
+    def create_game(self, alive_cells: List[CellIndex], engine: str = Life.DEFAULT_ENGINE) -> Life:
+        """Create a 12x12 game.
+        """
+        game = Life(engine=engine)
+        # for the test purpose, change the min size
+        game.MIN_GRID_HEIGHT = 2
+        game.MIN_GRID_WIDTH = 2
+        game.init_grid(width=12, height=12, init_alive_cells=alive_cells)
+        return game
+
+    def test_fingerprint_is_incremental(self):
+        """Check the fingerprint of a set is the XOR of fingerprints of its parts, however it is computed.
+        """
+        alive_indices = list(range(0, 5000, 3))
+        self.assertEqual(get_fingerprint(alive_indices),
+                         get_fingerprint(alive_indices[:10]) ^ get_fingerprint(set(alive_indices[10:])))
+        self.assertEqual(get_fingerprint([]), 0)
+
+    def test_still_life(self):
+        """Check a block is detected as a still life once it settles, and is not computed anymore.
+        """
+        # three cells of a block, which becomes a block in the next generation
+        game = self.create_game([CellIndex(1, 1), CellIndex(1, 2), CellIndex(2, 1)])
+        game.proceed_generations(5)
+
+        self.assertEqual((game.period, game.period_start), (1, 1))
+        game.proceed_generations(10 ** 12)
+        self.assertEqual(game.generation, 10 ** 12 + 5)
+        self.assertEqual(set(game.alive_cells), {CellIndex(1, 1), CellIndex(1, 2), CellIndex(2, 1), CellIndex(2, 2)})
+
+    def test_oscillator(self):
+        """Check a blinker jumps to a target generation of either phase.
+        """
+        blinker = [CellIndex(5, 4), CellIndex(5, 5), CellIndex(5, 6)]
+        for engine in (Life.DEFAULT_ENGINE, 'sparse'):
+            game = self.create_game(blinker, engine)
+            self.assertIsNone(game.period)
+
+            game.proceed_generations(10 ** 9 + 1)
+            self.assertEqual((game.period, game.period_start), (2, 0))
+            self.assertEqual(game.generation, 10 ** 9 + 1)
+            self.assertEqual(set(game.alive_cells), {CellIndex(4, 5), CellIndex(5, 5), CellIndex(6, 5)})
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_engine_fingerprints(self):
+        """Check engines hashing their own storage detect the same periods, without listing alive cells every step.
+        """
+        block = [CellIndex(1, 1), CellIndex(1, 2), CellIndex(2, 1)]
+        blinker = [CellIndex(5, 4), CellIndex(5, 5), CellIndex(5, 6)]
+        for engine in ('numpy', 'bitboard', 'table', 'parallel'):
+            for alive_cells, period in ((block, 1), (blinker, 2)):
+                game = self.create_game(alive_cells, engine)
+                with mock.patch.object(type(game._engine), 'get_alive_indices',
+                                       autospec=True, side_effect=type(game._engine).get_alive_indices) as listed:
+                    for _ in range(8):
+                        game.proceed_generation()
+                self.assertEqual(game.period, period, engine)
+                # alive cells are only listed to verify the repetition
+                self.assertLessEqual(listed.call_count, 2, engine)
+                game.close()
+
+    def test_disabled(self):
+        """Check nothing is detected when the detection is disabled.
+        """
+        game = self.create_game([CellIndex(5, 4), CellIndex(5, 5), CellIndex(5, 6)])
+        game.detect_cycles = False
+        game.proceed_generations(10)
+        self.assertIsNone(game.period)
@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import tempfile
+
+from unittest import TestCase, skipIf
+
+from src.game_of_life import StdoutInterface
+from src.life import Life
+from src.metrics import MetricsRecorder, Profiler
+from src.renderer import QuietRenderer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def create_blinker(engine: str = Life.DEFAULT_ENGINE) -> Life:
+    """Create a 5x5 game with a horizontal blinker at the center.
+    """
+    game = Life(engine=engine)
+    # for the test purpose, change the min size
+    game.MIN_GRID_HEIGHT = 2
+    game.MIN_GRID_WIDTH = 2
+    game.init_grid_from_indices(5, 5, [11, 12, 13])
+    return game
+
+
+class TestMetrics(TestCase):
+    def test_record(self):
+        """Check every generation is handed to callbacks with its population, births, deaths and neighbor counts.
+        """
+        records = []
+        recorder = MetricsRecorder(callbacks=[records.append])
+        game = create_blinker()
+        game.enable_metrics(recorder)
+        game.proceed_generations(3)
+
+        self.assertEqual([record['generation'] for record in records], [1, 2, 3])
+        for record in records:
+            self.assertEqual((record['population'], record['births'], record['deaths']), (3, 2, 2))
+            self.assertGreaterEqual(record['seconds'], 0)
+        # every cell of the 3 rows around the blinker has an alive neighbor
+        self.assertEqual(records[0]['neighbor_entries'], 15)
+
+    def test_sample_and_stream(self):
+        """Check only sampled generations are written, as a JSON line each.
+        """
+        out = io.StringIO()
+        recorder = MetricsRecorder(stream=out, sample_every=2)
+        game = create_blinker()
+        game.detect_cycles = False
+        game.enable_metrics(recorder)
+        for _ in range(5):
+            game.proceed_generation()
+        recorder.close()
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual([json.loads(line)['generation'] for line in lines], [2, 4])
+        self.assertEqual(recorder.num_of_records, 2)
+
+    def test_disable(self):
+        """Check a game without metrics runs the methods of its class.
+        """
+        game = create_blinker()
+        self.assertNotIn('proceed_generation', vars(game))
+
+        records = []
+        game.enable_metrics(MetricsRecorder(callbacks=[records.append]))
+        game.proceed_generation()
+        game.disable_metrics()
+        game.proceed_generation()
+
+        self.assertEqual(len(records), 1)
+        self.assertNotIn('proceed_generation', vars(game))
+        self.assertNotIn('_step_with_dict', vars(game))
+        self.assertEqual(sorted(game.get_alive_indices()), [11, 12, 13])
+
+    def test_engine(self):
+        """Check births and deaths are counted for other engines, without neighbor counts.
+        """
+        records = []
+        game = create_blinker(engine='sparse')
+        game.enable_metrics(MetricsRecorder(callbacks=[records.append]))
+        game.proceed_generation()
+
+        self.assertEqual((records[0]['population'], records[0]['births'], records[0]['deaths']), (3, 2, 2))
+        self.assertIsNone(records[0]['neighbor_entries'])
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_engine(self):
+        """Check a still life detected by a dense engine is recorded without births and deaths.
+        """
+        records = []
+        game = Life(engine='numpy')
+        game.MIN_GRID_HEIGHT = 2
+        game.MIN_GRID_WIDTH = 2
+        # a block
+        game.init_grid_from_indices(4, 4, [5, 6, 9, 10])
+        game.enable_metrics(MetricsRecorder(callbacks=[records.append]))
+        for _ in range(4):
+            game.proceed_generation()
+
+        self.assertEqual(game.period, 1)
+        self.assertEqual([(record['population'], record['births'], record['deaths']) for record in records],
+                         [(4, 0, 0)] * 4)
+
+
+class TestProfiler(TestCase):
+    def test_phase(self):
+        """Check a nested phase is only counted in itself, and entering the same phase again is allowed.
+        """
+        profiler = Profiler()
+        with profiler.phase('step'):
+            with profiler.phase('step'):
+                sum(range(1000))
+            with profiler.phase('render'):
+                sum(range(1000))
+
+        self.assertEqual(list(profiler.profiles), ['step', 'render'])
+        self.assertGreater(profiler.seconds['step'], profiler.seconds['render'])
+
+    def test_interface(self):
+        """Check stepping and rendering of a run are profiled separately.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'profile.txt')
+
+        profiler = Profiler()
+        interface = StdoutInterface(renderer=QuietRenderer(stream=io.StringIO()), profiler=profiler)
+        interface._set_game(create_blinker())
+        interface.process_generation(3)
+        interface.print_board()
+        profiler.write(path)
+
+        self.assertEqual(sorted(profiler.profiles), ['render', 'step'])
+        with open(path) as fp:
+            report = fp.read()
+        self.assertIn("==== step:", report)
+        self.assertIn("proceed_generation", report)
+        self.assertTrue(os.path.exists(path + '.render.prof'))
@@ -0,0 +1,168 @@
+import io
+import os
+import random
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.game_of_life import FileParser
+from src.life import Life
+from src.patterns import read_macrocell, read_rle, write_macrocell, write_rle
+from src.rules import CONWAY, parse_rule
+
+
+GOSPER_GLIDER_GUN = """#N Gosper glider gun
+#C comment lines are skipped
+x = 36, y = 9, rule = B3/S23
+24bo$22bobo$12b2o6b2o12b2o$11bo3bo4b2o12b2o$2o8bo5bo3b2o$2o8bo3bob2o4b
+obo$10bo5bo7bo$11bo3bo$12b2o!
+"""
+
+
+class TestRle(TestCase):
+    def test_read(self):
+        """Check runs are decoded to flat indices on a board of the minimum size, whatever the chunk size is.
+        """
+        for chunk_size in (1, 2, 5, 1 << 20):
+            with patch('src.patterns.CHUNK_SIZE', chunk_size):
+                height, width, alive_indices, rule = read_rle(io.StringIO(GOSPER_GLIDER_GUN), 80, 40)
+
+            self.assertEqual((height, width), (40, 80))
+            self.assertEqual(rule, CONWAY)
+            self.assertEqual(len(alive_indices), 36)
+            self.assertEqual(list(alive_indices[:3]), [24, 80 + 22, 80 + 24])
+            self.assertIn(8 * 80 + 13, alive_indices)
+
+    def test_round_trip(self):
+        """Check a written board is read back as it is, including its size.
+        """
+        rand = random.Random(1)
+        alive_indices = sorted(rand.sample(range(150 * 60), 2000))
+
+        out = io.StringIO()
+        write_rle(out, 150, 60, alive_indices)
+        self.assertTrue(all(len(line) <= 70 for line in out.getvalue().splitlines()))
+
+        height, width, res, rule = read_rle(io.StringIO(out.getvalue()))
+        self.assertEqual((height, width), (60, 150))
+        self.assertEqual(list(res), alive_indices)
+        self.assertEqual(rule, CONWAY)
+
+    def test_rule(self):
+        """Check the rule of the header is returned, and written back.
+        """
+        _, _, _, rule = read_rle(io.StringIO("x = 2, y = 2, rule = b36/s23\nbo$o!\n"))
+        self.assertEqual(rule, parse_rule('B36/S23'))
+        self.assertIsNone(read_rle(io.StringIO("x = 2, y = 2\nbo$o!\n"))[3])
+
+        out = io.StringIO()
+        write_rle(out, 2, 2, [1, 2], rule=rule)
+        self.assertEqual(out.getvalue().splitlines()[0], "x = 2, y = 2, rule = B36/S23")
+
+    def test_malformed(self):
+        """Check a missing header, an unsupported rule and cells out of the pattern are reported.
+        """
+        with self.assertRaisesRegex(Exception, r"^The RLE header line is not in the correct format \(bo\$o!\)\.$"):
+            read_rle(io.StringIO("bo$o!\n"))
+
+        with self.assertRaisesRegex(Exception, r"^The rule is not supported \(B03/S23\)\.$"):
+            read_rle(io.StringIO("x = 2, y = 2, rule = B03/S23\nbo$o!\n"))
+
+        with self.assertRaisesRegex(Exception, r"^The rule is not supported \(B3/S23/G4\)\.$"):
+            read_rle(io.StringIO("x = 2, y = 2, rule = B3/S23/G4\nbo$o!\n"))
+
+        with self.assertRaisesRegex(Exception, r"out of the pattern"):
+            read_rle(io.StringIO("x = 2, y = 2\n3o!\n"))
+
+
+class TestMacrocell(TestCase):
+    def test_round_trip(self):
+        """Check alive cells are read back where they were on a board of the same size.
+        """
+        rand = random.Random(2)
+        alive_indices = sorted(rand.sample(range(10 * 100, 100 * 90), 500)) + [99 * 100 + 99]
+
+        out = io.StringIO()
+        write_macrocell(out, 100, 100, alive_indices)
+        height, width, res, rule = read_macrocell(io.StringIO(out.getvalue()), 80, 40)
+
+        self.assertEqual((height, width), (100, 100))
+        self.assertEqual(rule, CONWAY)
+        self.assertEqual(sorted(res), alive_indices)
+
+    def test_board_is_kept(self):
+        """Check a pattern away from the corner of a bounded board is not moved, so it evolves the same way.
+        """
+        glider = [10 * 80 + 11, 11 * 80 + 12, 12 * 80 + 10, 12 * 80 + 11, 12 * 80 + 12]
+        out = io.StringIO()
+        write_macrocell(out, 80, 40, glider)
+        self.assertIn("#C board 40 80 0 0", out.getvalue().splitlines())
+
+        height, width, res, _ = read_macrocell(io.StringIO(out.getvalue()), 80, 40)
+        self.assertEqual((height, width, sorted(res)), (40, 80, glider))
+
+        # a board smaller than the minimum size is enlarged, and cells keep their row and column
+        height, width, res, _ = read_macrocell(io.StringIO(out.getvalue()), 100, 50)
+        self.assertEqual((height, width), (50, 100))
+        self.assertEqual(sorted(res), [index // 80 * 100 + index % 80 for index in glider])
+
+    def test_pattern_without_board(self):
+        """Check the bounding box of alive cells is placed at the top left corner if the board is not recorded.
+        """
+        out = io.StringIO()
+        write_macrocell(out, 80, 40, [10 * 80 + 11, 11 * 80 + 12])
+        content = '\n'.join(line for line in out.getvalue().splitlines() if not line.startswith('#C'))
+
+        height, width, res, _ = read_macrocell(io.StringIO(content))
+        self.assertEqual((height, width, sorted(res)), (2, 2, [0, 3]))
+
+    def test_repeated_squares_are_written_once(self):
+        """Check identical 8x8 squares share one line.
+        """
+        blocks = [(top + i) * 64 + left + j
+                  for top in range(0, 64, 8) for left in range(0, 64, 8) for i in (0, 1) for j in (0, 1)]
+
+        out = io.StringIO()
+        write_macrocell(out, 64, 64, blocks)
+        # a leaf, and one node for each level from 4 to 6
+        self.assertEqual(out.getvalue().splitlines()[3:], ['**$**$', '4 1 1 1 1', '5 2 2 2 2', '6 3 3 3 3'])
+
+        height, width, res, _ = read_macrocell(io.StringIO(out.getvalue()))
+        self.assertEqual((height, width), (64, 64))
+        self.assertEqual(len(res), len(blocks))
+
+    def test_malformed(self):
+        """Check a missing header and a reference to an unknown node are reported.
+        """
+        with self.assertRaisesRegex(Exception, r"^The first line of a Macrocell file is not in the correct format"):
+            read_macrocell(io.StringIO("**$**$\n"))
+
+        with self.assertRaisesRegex(Exception, r"^The Macrocell node line is not in the correct format \(4 1 2 0 0\)"):
+            read_macrocell(io.StringIO("[M2]\n**$**$\n4 1 2 0 0\n"))
+
+        with self.assertRaisesRegex(Exception, r"^Alive cells of the Macrocell file are out of the board \(1x2\)\.$"):
+            read_macrocell(io.StringIO("[M2]\n#C board 1 2 0 0\n**$**$\n"))
+
+
+class TestFileParserPatterns(TestCase):
+    def test_format_by_extension(self):
+        """Check `.rle` and `.mc` files are read and written in their format.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'gun.rle')
+            with open(path, 'w') as fp:
+                fp.write(GOSPER_GLIDER_GUN)
+
+            parser = FileParser()
+            parser.parse_from_file(path)
+            self.assertEqual((parser.grid_height, parser.grid_width), (Life.MIN_GRID_HEIGHT, Life.MIN_GRID_WIDTH))
+            self.assertEqual(len(parser.alive_cells), 36)
+
+            for extension in ('.rle', '.mc'):
+                with patch('src.game_of_life.FILE_FOLDER', directory):
+                    parser.dump_grid_to_file('dump' + extension)
+
+                res = FileParser()
+                res.parse_from_file(os.path.join(directory, 'dump' + extension))
+                self.assertEqual(sorted(res.alive_indices), sorted(parser.alive_indices))
@@ -0,0 +1,92 @@
+import io
+
+from unittest import TestCase
+
+from src.game_of_life import StdoutInterface
+from src.life import CellIndex, Life
+from src.renderer import CLEAR_SCREEN, DiffRenderer, FullRenderer, QuietRenderer, move_cursor
+
+
+def create_blinker() -> Life:
+    """Create a 5x5 game with a blinker at the center.
+    """
+    game = Life()
+    # for the test purpose, change the min size
+    game.MIN_GRID_HEIGHT = 2
+    game.MIN_GRID_WIDTH = 2
+    game.init_grid(width=5, height=5, init_alive_cells=[CellIndex(2, 1), CellIndex(2, 2), CellIndex(2, 3)])
+    game.detect_cycles = False
+    return game
+
+
+class FakeClock:
+    """A clock advancing by `tick` seconds every time it is read.
+    """
+    def __init__(self, tick: float):
+        self.now = 0
+        self.tick = tick
+
+    def __call__(self) -> float:
+        self.now += self.tick
+        return self.now
+
+
+class TestRenderer(TestCase):
+    def test_full(self):
+        """Check every board is printed as a whole.
+        """
+        out = io.StringIO()
+        interface = StdoutInterface(renderer=FullRenderer(stream=out))
+        interface.cur_game = create_blinker()
+        interface.process_generation(2)
+
+        self.assertEqual(out.getvalue().count("Generation:"), 2)
+        self.assertIn("x  x  o  x  x\n" * 3, out.getvalue())
+
+    def test_diff(self):
+        """Check the board is drawn once, and then only the changed cells are drawn.
+        """
+        game = create_blinker()
+        out = io.StringIO()
+        renderer = DiffRenderer(stream=out)
+        renderer.start()
+        renderer.render(game)
+        self.assertTrue(out.getvalue().startswith(CLEAR_SCREEN + "Generation: 0\n"))
+
+        out.seek(0)
+        out.truncate()
+        game.proceed_generation()
+        renderer.render(game)
+
+        frame = out.getvalue()
+        self.assertTrue(frame.startswith(move_cursor(1, 1) + "Generation: 1"))
+        # the board starts from the third line, and each cell takes 3 columns
+        for row, col, cell in ((2, 1, 'x'), (2, 3, 'x'), (1, 2, 'o'), (3, 2, 'o')):
+            self.assertIn(move_cursor(row + 3, col * 3 + 1) + cell, frame)
+        self.assertNotIn(move_cursor(2 + 3, 2 * 3 + 1), frame)
+        self.assertTrue(frame.endswith(move_cursor(9, 1)))
+
+    def test_frames_are_skipped_over_max_fps(self):
+        """Check frames are skipped while the generations keep going, and the last frame is drawn.
+        """
+        out = io.StringIO()
+        # 0.25 second per frame is over 2 frames per second, so every other frame is skipped
+        renderer = FullRenderer(stream=out, max_fps=2, clock=FakeClock(0.25))
+        interface = StdoutInterface(renderer=renderer)
+        interface.cur_game = create_blinker()
+        interface.process_generation(7)
+
+        self.assertEqual(interface.cur_game.generation, 7)
+        self.assertEqual((renderer.num_of_frames, renderer.num_of_skipped_frames), (4, 3))
+        self.assertIn("Generation: 7", out.getvalue())
+
+    def test_quiet(self):
+        """Check only the last board is printed.
+        """
+        out = io.StringIO()
+        interface = StdoutInterface(renderer=QuietRenderer(stream=out))
+        interface.cur_game = create_blinker()
+        interface.process_generation(5)
+
+        self.assertEqual(out.getvalue().count("Generation:"), 1)
+        self.assertIn("Generation: 5", out.getvalue())
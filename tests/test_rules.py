@@ -0,0 +1,139 @@
+import os
+import pickle
+import random
+import tempfile
+
+from unittest import TestCase
+
+from src.engines import ENGINES
+from src.game_of_life import FileParser, dump_game, load_game
+from src.life import Life
+from src.rules import CONWAY, parse_rule
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+HIGHLIFE = parse_rule('B36/S23')
+
+# engines stepping the board with numpy
+NUMPY_ENGINES = ('numpy', 'bitboard', 'parallel', 'table')
+
+
+class TestRule(TestCase):
+    def test_parse(self):
+        """Check both notations give the same rule, whatever the case is.
+        """
+        for notation in ('B36/S23', 'b36/s23', 'B36S23', '23/36', ' B63/S32 '):
+            self.assertEqual(parse_rule(notation), HIGHLIFE)
+        self.assertEqual(str(HIGHLIFE), 'B36/S23')
+        self.assertEqual(parse_rule('B3/S23'), CONWAY)
+        self.assertTrue(parse_rule('23/3').is_conway)
+        self.assertFalse(HIGHLIFE.is_conway)
+        self.assertEqual(str(parse_rule('B2/S')), 'B2/S')
+
+    def test_unsupported(self):
+        """Check rules which are not Life-like, or give birth without alive neighbors, are rejected.
+        """
+        for notation in ('B3/S23/G4', 'B9/S23', 'life', '', 'B0/S8'):
+            with self.assertRaises(ValueError):
+                parse_rule(notation)
+
+    def test_tables(self):
+        """Check both tables follow the births and the survivals of the rule.
+        """
+        births, survivals = HIGHLIFE.table
+        self.assertEqual([count for count in range(9) if births[count]], [3, 6])
+        self.assertEqual([count for count in range(9) if survivals[count]], [2, 3])
+
+        # an alive center (bit 4) with the three cells of the top row (bits 0 to 2)
+        self.assertTrue(HIGHLIFE.neighborhood_table[0b000010111])
+        # a dead center with six alive neighbors
+        self.assertTrue(HIGHLIFE.neighborhood_table[0b111000111])
+        self.assertFalse(CONWAY.neighborhood_table[0b111000111])
+        self.assertEqual(len(HIGHLIFE.neighborhood_table), 512)
+
+    def test_pickle(self):
+        rule = pickle.loads(pickle.dumps(HIGHLIFE))
+        self.assertEqual(rule, HIGHLIFE)
+        self.assertEqual(rule.neighborhood_table, HIGHLIFE.neighborhood_table)
+
+
+class TestRuleEngines(TestCase):
+    def get_engines(self):
+        return [engine for engine in sorted(ENGINES) if numpy is not None or engine not in NUMPY_ENGINES]
+
+    def test_birth_with_six_neighbors(self):
+        """Check a dead cell with six alive neighbors is born in HighLife, and not in Conway's game of life.
+        """
+        # two rows of three cells around the dead center (2, 2)
+        rows, columns = [1, 1, 1, 3, 3, 3], [1, 2, 3, 1, 2, 3]
+        for engine in [Life.DEFAULT_ENGINE] + self.get_engines():
+            for rule, expected in ((HIGHLIFE, True), (CONWAY, False)):
+                game = Life.from_coordinates(Life.MIN_GRID_WIDTH, Life.MIN_GRID_HEIGHT, rows, columns,
+                                             engine=engine, rule=rule)
+                game.proceed_generation()
+                self.assertEqual(2 * Life.MIN_GRID_WIDTH + 2 in set(game.get_alive_indices()), expected,
+                                 "{} {}".format(engine, rule))
+                game.close()
+
+    def test_same_as_dict_engine(self):
+        """Check every engine matches the built-in `dict` engine on random soups of several rules.
+        """
+        rand = random.Random(3)
+        width, height = 90, 45
+        alive_indices = [index for index in range(width * height) if rand.random() < 0.35]
+        for rule in (HIGHLIFE, parse_rule('B2/S0'), parse_rule('B3678/S34678'), parse_rule('B1357/S1357')):
+            expected = Life(rule=rule)
+            expected.init_grid_from_indices(width, height, alive_indices)
+            expected.proceed_generations(12)
+
+            for engine in self.get_engines():
+                game = Life(engine=engine, rule=rule)
+                game.init_grid_from_indices(width, height, alive_indices)
+                game.proceed_generations(12)
+                self.assertEqual(sorted(game.get_alive_indices()), sorted(expected.get_alive_indices()),
+                                 "{} {}".format(engine, rule))
+                game.close()
+
+    def test_rule_of_a_string(self):
+        game = Life(rule='B36/S23')
+        self.assertEqual(game.rule, HIGHLIFE)
+        self.assertIs(Life().rule, CONWAY)
+
+
+class TestRuleFiles(TestCase):
+    def test_header(self):
+        """Check the rule of the first line is read, written back, and overridden by the given rule.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'input.txt')
+            with open(path, 'w') as fp:
+                fp.write("40 80 B36/S23\n2\n1 1\n1 2\n")
+
+            game = load_game(path)
+            self.assertEqual(game.rule, HIGHLIFE)
+            self.assertEqual(load_game(path, rule=CONWAY).rule, CONWAY)
+
+            dump_game(game, os.path.join(directory, 'dump.txt'))
+            with open(os.path.join(directory, 'dump.txt')) as fp:
+                self.assertEqual(fp.readline(), "40 80 B36/S23\n")
+
+            # files of Conway's game of life keep the two values of the first line
+            dump_game(Life.from_coordinates(80, 40, [1], [1]), os.path.join(directory, 'conway.txt'))
+            with open(os.path.join(directory, 'conway.txt')) as fp:
+                self.assertEqual(fp.readline(), "40 80\n")
+
+            dump_game(game, os.path.join(directory, 'dump.rle'), 'rle')
+            self.assertEqual(load_game(os.path.join(directory, 'dump.rle')).rule, HIGHLIFE)
+
+    def test_unsupported(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'input.txt')
+            with open(path, 'w') as fp:
+                fp.write("40 80 B0/S23\n0\n")
+
+            with self.assertRaisesRegex(Exception, r"^The rule is not supported \(B0/S23\)\.$"):
+                FileParser().parse_from_file(path)
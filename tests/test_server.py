@@ -0,0 +1,139 @@
+import asyncio
+
+from unittest import TestCase
+
+from src.life import Life
+from src.server import SimulationClient, SimulationServer
+
+
+# a blinker, and a glider away from it
+BOARD = "40 80\n8\n1 1\n1 2\n1 3\n10 11\n11 12\n12 10\n12 11\n12 12\n"
+
+
+class TestSimulationServer(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def run_with_server(self, run, **kwargs):
+        """Run `run(server, client)` with a server listening on a local port and a client connected to it.
+        """
+        async def main():
+            server = SimulationServer(workers=2, **kwargs)
+            await server.start(port=0)
+            client = await SimulationClient.connect(port=server.address[1])
+            try:
+                await run(server, client)
+            finally:
+                await client.close()
+                await server.close()
+
+        self.loop.run_until_complete(main())
+
+    def test_step_and_query(self):
+        """Check a session steps like a game stepped directly.
+        """
+        expected = Life()
+        expected.init_grid_from_indices(80, 40, [81, 82, 83, 811, 892, 970, 971, 972])
+        expected.proceed_generations(7)
+
+        async def run(server, client):
+            session = (await client.request('create', board=BOARD))['session']
+            self.assertEqual((await client.request('step', session=session, generations=3))['generation'], 3)
+            response = await client.request('step', session=session, generations=4)
+            self.assertEqual((response['generation'], response['population']), (7, 8))
+
+            state = await client.request('query', session=session, cells=True)
+            self.assertEqual((state['width'], state['height'], state['rule']), (80, 40, 'B3/S23'))
+            self.assertEqual(state['cells'], sorted(expected.get_alive_indices()))
+            self.assertNotIn('cells', await client.request('query', session=session))
+
+        self.run_with_server(run)
+
+    def test_deltas(self):
+        """Check the cells of `subscribe` and the births and deaths of every step give the state of the session.
+        """
+        async def run(server, client):
+            session = (await client.request('create', board=BOARD, rule='B36/S23'))['session']
+            alive = set((await client.request('subscribe', session=session))['cells'])
+
+            for generations in (1, 1, 5):
+                response = await client.request('step', session=session, generations=generations)
+                event = await client.events.get()
+                self.assertEqual((event['event'], event['session']), ('delta', session))
+                self.assertEqual(event['generation'] - event['from_generation'], generations)
+                self.assertFalse(set(event['births']) & alive)
+                self.assertTrue(set(event['deaths']) <= alive)
+                alive = (alive - set(event['deaths'])) | set(event['births'])
+                self.assertEqual(len(alive), response['population'])
+
+            state = await client.request('query', session=session, cells=True)
+            self.assertEqual(state['cells'], sorted(alive))
+            self.assertEqual(state['rule'], 'B36/S23')
+
+            await client.request('unsubscribe', session=session)
+            await client.request('step', session=session)
+            self.assertTrue(client.events.empty())
+
+        self.run_with_server(run)
+
+    def test_concurrent_sessions(self):
+        """Check sessions stepped at once by several clients keep their own state.
+        """
+        async def run(server, client):
+            clients = [client, await SimulationClient.connect(port=server.address[1])]
+            sessions = await asyncio.gather(*(
+                clients[i % 2].request('create', board="40 80\n3\n{0} 1\n{0} 2\n{0} 3\n".format(i + 1))
+                for i in range(20)))
+
+            async def step(i, session):
+                for _ in range(5):
+                    await clients[i % 2].request('step', session=session['session'])
+                return await clients[i % 2].request('query', session=session['session'], cells=True)
+
+            states = await asyncio.gather(*(step(i, session) for i, session in enumerate(sessions)))
+            for i, state in enumerate(states):
+                # a blinker is vertical after an odd number of generations
+                self.assertEqual(state['generation'], 5)
+                self.assertEqual(state['cells'], [i * 80 + 2, (i + 1) * 80 + 2, (i + 2) * 80 + 2])
+            self.assertEqual((await client.request('stats'))['sessions'], 20)
+            await clients[1].close()
+
+        self.run_with_server(run)
+
+    def test_idle_sessions_are_evicted(self):
+        async def run(server, client):
+            session = (await client.request('create', board=BOARD))['session']
+            await client.request('subscribe', session=session)
+            await asyncio.sleep(0.3)
+
+            self.assertEqual(await client.events.get(), {'event': 'closed', 'session': session, 'reason': 'evicted'})
+            self.assertEqual(server.num_of_evicted_sessions, 1)
+            with self.assertRaisesRegex(Exception, r"^The session does not exist"):
+                await client.request('step', session=session)
+
+        self.run_with_server(run, idle_seconds=0.1)
+
+    def test_errors(self):
+        """Check failed requests are answered with their error, and the connection is kept.
+        """
+        async def run(server, client):
+            with self.assertRaisesRegex(Exception, r"^The operation is not supported \(run\)\.$"):
+                await client.request('run')
+            with self.assertRaisesRegex(Exception, r"^The first data line is not in the correct format"):
+                await client.request('create', board="forty eighty\n0\n")
+            with self.assertRaisesRegex(Exception, r"^The engine is not supported \(gpu\)\.$"):
+                await client.request('create', board=BOARD, engine='gpu')
+            with self.assertRaisesRegex(Exception, r"^The board is too large"):
+                await client.request('create', board="4000 8000\n0\n")
+
+            session = (await client.request('create', board=BOARD))['session']
+            with self.assertRaisesRegex(Exception, r"^The number of generations should be a positive integer"):
+                await client.request('step', session=session, generations=0)
+            with self.assertRaisesRegex(Exception, r"^Too many sessions"):
+                await client.request('create', board=BOARD)
+
+            await client.request('close', session=session)
+            self.assertEqual((await client.request('stats'))['sessions'], 0)
+
+        self.run_with_server(run, max_sessions=1, max_cells=1 << 20)
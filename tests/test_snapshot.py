@@ -0,0 +1,134 @@
+import os
+import random
+import struct
+import tempfile
+
+from unittest import TestCase, skipIf
+
+from src.life import Life
+from src.rules import CONWAY, parse_rule
+from src.snapshot import HEADER, HEADER_V1, MAGIC, load_snapshot, write_snapshot
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'dump.snap')
+
+        rand = random.Random(11)
+        self.width, self.height = 130, 41
+        self.alive_indices = sorted(rand.sample(range(self.width * self.height), 700))
+
+    def create_game(self, engine: str = Life.DEFAULT_ENGINE, rule: str = 'B3/S23') -> Life:
+        """Create a game on the random board, 3 generations in.
+        """
+        game = Life(engine=engine, rule=rule)
+        self.addCleanup(game.close)
+        game.init_grid_from_indices(self.width, self.height, self.alive_indices)
+        game.proceed_generations(3)
+        return game
+
+    def check_round_trip(self, encoding: str, engine: str = Life.DEFAULT_ENGINE) -> Life:
+        """Write a snapshot with `encoding` and check it loads back to the same generation with `engine`.
+
+        Returns:
+            the loaded game, one generation after the snapshot
+        """
+        expected = self.create_game()
+        write_snapshot(self.path, expected, encoding=encoding)
+
+        actual = load_snapshot(self.path, engine=engine)
+        self.addCleanup(actual.close)
+        self.assertEqual((actual.grid_width, actual.grid_height), (self.width, self.height))
+        self.assertEqual(actual.generation, 3)
+        self.assertEqual(sorted(actual.get_alive_indices()), sorted(expected.get_alive_indices()))
+
+        # the loaded game keeps going as the original one
+        expected.proceed_generation()
+        actual.proceed_generation()
+        self.assertEqual(sorted(actual.get_alive_indices()), sorted(expected.get_alive_indices()))
+        return actual
+
+    def test_bitpacked(self):
+        """Check bit-packed rows are loaded back, whose size only depends on the size of the grid.
+        """
+        self.check_round_trip('bitpacked')
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + self.height * 3 * 8)
+
+    def test_coordinates(self):
+        """Check packed coordinates are loaded back, whose size only depends on the number of alive cells.
+        """
+        self.check_round_trip('coordinates')
+        num_of_alive_cells = len(self.create_game().get_alive_indices())
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + num_of_alive_cells * 8)
+
+    def test_smaller_encoding_is_chosen(self):
+        """Check a sparse board is written as coordinates and a dense one as bit-packed rows.
+        """
+        game = Life()
+        game.init_grid_from_indices(self.width, self.height, [0, 1, 2])
+        write_snapshot(self.path, game)
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 3 * 8)
+
+        write_snapshot(self.path, self.create_game())
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + self.height * 3 * 8)
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_bitboard_engine_maps_the_file(self):
+        """Check the bitboard engine steps from the mapped rows, and writes its rows as they are.
+        """
+        game = self.check_round_trip('bitpacked', engine='bitboard')
+        write_snapshot(self.path, game, encoding='bitpacked')
+        self.assertEqual(sorted(load_snapshot(self.path).get_alive_indices()), game.get_alive_indices())
+
+    def test_not_a_snapshot(self):
+        """Check files which are not snapshots, or are cut in the middle, are rejected.
+        """
+        with open(self.path, 'wb') as fp:
+            fp.write(b'5 6\n1\n1 1\n')
+        with self.assertRaisesRegex(Exception, r"too short"):
+            load_snapshot(self.path)
+
+        with open(self.path, 'wb') as fp:
+            fp.write(b'x' * HEADER.size)
+        with self.assertRaisesRegex(Exception, r"not a snapshot"):
+            load_snapshot(self.path)
+
+        write_snapshot(self.path, self.create_game(), encoding='coordinates')
+        with open(self.path, 'r+b') as fp:
+            fp.truncate(HEADER.size + 8)
+        with self.assertRaisesRegex(Exception, r"truncated"):
+            load_snapshot(self.path)
+
+    def test_rule(self):
+        """Check the rule of the game is recorded, and continued unless another one is given.
+        """
+        highlife = parse_rule('B36/S23')
+        expected = self.create_game(rule='B36/S23')
+        write_snapshot(self.path, expected)
+
+        actual = load_snapshot(self.path)
+        self.assertEqual(actual.rule, highlife)
+        expected.proceed_generations(5)
+        actual.proceed_generations(5)
+        self.assertEqual(sorted(actual.get_alive_indices()), sorted(expected.get_alive_indices()))
+
+        self.assertEqual(load_snapshot(self.path, rule=CONWAY).rule, CONWAY)
+
+    def test_version_1(self):
+        """Check snapshots of the version 1, which did not record the rule, are loaded under Conway's rule.
+        """
+        with open(self.path, 'wb') as fp:
+            fp.write(HEADER_V1.pack(MAGIC, 1, 2, self.height, self.width, 7, 2))
+            fp.write(struct.pack('<QQ', 5, 140))
+
+        game = load_snapshot(self.path)
+        self.assertEqual((game.grid_width, game.grid_height, game.generation), (self.width, self.height, 7))
+        self.assertEqual(sorted(game.get_alive_indices()), [5, 140])
+        self.assertEqual(game.rule, CONWAY)